@@ -1,7 +1,17 @@
 import injector
 
-from auctions.application.queries import AuctionDto, GetActiveAuctions, GetSingleAuction
-from auctions.application.repositories import AuctionsRepository
+from auctions.application.queries import (
+    ActiveAuctionsCriteria,
+    AsyncGetActiveAuctions,
+    AsyncGetSingleAuction,
+    AuctionDto,
+    AuctionsPage,
+    AuctionsSort,
+    GetActiveAuctions,
+    GetSingleAuction,
+    InvalidCursor,
+)
+from auctions.application.repositories import AuctionModifiedConcurrently, AuctionsRepository
 from auctions.application.use_cases import (
     BeginningAuction,
     BeginningAuctionInputDto,
@@ -29,6 +39,7 @@ __all__ = [
     "BidderHasBeenOverbid",
     # repositories
     "AuctionsRepository",
+    "AuctionModifiedConcurrently",
     # use cases
     "BeginningAuction",
     "PlacingBid",
@@ -44,8 +55,14 @@ __all__ = [
     # queries
     "GetActiveAuctions",
     "GetSingleAuction",
+    "AsyncGetActiveAuctions",
+    "AsyncGetSingleAuction",
+    "ActiveAuctionsCriteria",
+    "AuctionsSort",
+    "InvalidCursor",
     # queries dtos
     "AuctionDto",
+    "AuctionsPage",
 ]
 
 
@@ -1,3 +1,23 @@
-__all__ = ["AuctionDto", "GetActiveAuctions", "GetSingleAuction"]
+__all__ = [
+    "ActiveAuctionsCriteria",
+    "AuctionDto",
+    "AuctionsPage",
+    "AuctionsSort",
+    "GetActiveAuctions",
+    "GetSingleAuction",
+    "AsyncGetActiveAuctions",
+    "AsyncGetSingleAuction",
+    "InvalidCursor",
+]
 
-from auctions.application.queries.auctions import AuctionDto, GetActiveAuctions, GetSingleAuction
+from auctions.application.queries.auctions import (
+    ActiveAuctionsCriteria,
+    AsyncGetActiveAuctions,
+    AsyncGetSingleAuction,
+    AuctionDto,
+    AuctionsPage,
+    AuctionsSort,
+    GetActiveAuctions,
+    GetSingleAuction,
+    InvalidCursor,
+)
@@ -1,7 +1,8 @@
 import abc
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List
+from enum import Enum
+from typing import List, Optional
 
 from foundation.value_objects import Money
 
@@ -15,6 +16,43 @@ class AuctionDto:
     ends_at: datetime
 
 
+class AuctionsSort(Enum):
+    ENDING_SOONEST = "ending_soonest"
+    CURRENT_PRICE = "current_price"  # lowest first
+    NEWEST = "newest"
+
+
+@dataclass(frozen=True)
+class ActiveAuctionsCriteria:
+    """Which page of active auctions to get.
+
+    `cursor` is the `next_cursor` of the previous page, which must have been got with the same sort.
+    Prices are bounds of the current price, both inclusive.
+    """
+
+    sort: AuctionsSort = AuctionsSort.ENDING_SOONEST
+    limit: int = 50
+    cursor: Optional[str] = None
+    min_price: Optional[Money] = None
+    max_price: Optional[Money] = None
+
+    MAX_LIMIT = 200
+
+    def __post_init__(self) -> None:
+        if not 0 < self.limit <= self.MAX_LIMIT:
+            raise ValueError(f"Limit must be between 1 and {self.MAX_LIMIT}")
+
+
+@dataclass
+class AuctionsPage:
+    auctions: List[AuctionDto] = field(default_factory=list)
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
 class GetSingleAuction(abc.ABC):
     @abc.abstractmethod
     def query(self, auction_id: int) -> AuctionDto:
@@ -23,5 +61,19 @@ class GetSingleAuction(abc.ABC):
 
 class GetActiveAuctions(abc.ABC):
     @abc.abstractmethod
-    def query(self) -> List[AuctionDto]:
+    def query(self, criteria: ActiveAuctionsCriteria = ActiveAuctionsCriteria()) -> AuctionsPage:
+        """Raises InvalidCursor if the cursor is malformed or comes from a differently sorted page."""
+
+
+class AsyncGetSingleAuction(abc.ABC):
+    """Counterpart of GetSingleAuction for the async read path. Returns None for unknown auctions."""
+
+    @abc.abstractmethod
+    async def query(self, auction_id: int) -> Optional[AuctionDto]:
+        pass
+
+
+class AsyncGetActiveAuctions(abc.ABC):
+    @abc.abstractmethod
+    async def query(self, criteria: ActiveAuctionsCriteria = ActiveAuctionsCriteria()) -> AuctionsPage:
         pass
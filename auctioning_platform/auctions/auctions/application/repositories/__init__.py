@@ -1,3 +1,3 @@
-__all__ = ["AuctionsRepository"]
+__all__ = ["AuctionModifiedConcurrently", "AuctionsRepository"]
 
-from auctions.application.repositories.auctions import AuctionsRepository
+from auctions.application.repositories.auctions import AuctionModifiedConcurrently, AuctionsRepository
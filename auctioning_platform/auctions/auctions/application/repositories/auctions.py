@@ -4,6 +4,10 @@ from auctions.domain.entities import Auction
 from auctions.domain.value_objects import AuctionId
 
 
+class AuctionModifiedConcurrently(Exception):
+    """Raised by `save` when auction has been changed by someone else since it was read."""
+
+
 class AuctionsRepository(abc.ABC):
     @abc.abstractmethod
     def get(self, auction_id: AuctionId) -> Auction:
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 
 from foundation.value_objects import Money
 
-from auctions.application.repositories import AuctionsRepository
+from auctions.application.repositories import AuctionModifiedConcurrently, AuctionsRepository
 from auctions.domain.value_objects import AuctionId, BidderId
 
 
@@ -27,14 +27,26 @@ class PlacingBidOutputBoundary(metaclass=abc.ABCMeta):
 
 
 class PlacingBid:
+    # bids on a hot auction may race, each lost race means re-reading the auction and bidding again.
+    # Attempts run in the caller's transaction, so the re-read sees the winning bid only under
+    # READ COMMITTED isolation, which engines are created with (see db_infrastructure.pool)
+    MAX_ATTEMPTS = 5
+
     def __init__(self, output_boundary: PlacingBidOutputBoundary, auctions_repo: AuctionsRepository) -> None:
         self.output_boundary = output_boundary
         self.auctions_repo = auctions_repo
 
     def execute(self, input_dto: PlacingBidInputDto) -> None:
-        auction = self.auctions_repo.get(input_dto.auction_id)
-        auction.place_bid(bidder_id=input_dto.bidder_id, amount=input_dto.amount)
-        self.auctions_repo.save(auction)
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            auction = self.auctions_repo.get(input_dto.auction_id)
+            auction.place_bid(bidder_id=input_dto.bidder_id, amount=input_dto.amount)
+            try:
+                self.auctions_repo.save(auction)
+            except AuctionModifiedConcurrently:
+                if attempt == self.MAX_ATTEMPTS:
+                    raise
+            else:
+                break
 
         output_dto = PlacingBidOutputDto(input_dto.bidder_id in auction.winners, auction.current_price)
         self.output_boundary.present(output_dto)
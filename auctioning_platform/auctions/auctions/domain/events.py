@@ -1,38 +1,55 @@
 from dataclasses import dataclass
 from typing import Optional
 
+from foundation import event_codec
 from foundation.events import Event
 from foundation.value_objects import Money
 
 from auctions.domain.value_objects import AuctionId, BidderId
 
 
+@event_codec.register(type_id=1)
 @dataclass(frozen=True)
 class BidderHasBeenOverbid(Event):
+    AGGREGATE_TYPE = "auction"
+    AGGREGATE_ID_FIELD = "auction_id"
+
     auction_id: AuctionId
     bidder_id: BidderId
     new_price: Money
     auction_title: str
 
 
+@event_codec.register(type_id=2)
 @dataclass(frozen=True)
 class WinningBidPlaced(Event):
+    AGGREGATE_TYPE = "auction"
+    AGGREGATE_ID_FIELD = "auction_id"
+
     auction_id: AuctionId
     bidder_id: BidderId
     bid_amount: Money
     auction_title: str
 
 
+@event_codec.register(type_id=3)
 @dataclass(frozen=True)
 class AuctionEnded(Event):
+    AGGREGATE_TYPE = "auction"
+    AGGREGATE_ID_FIELD = "auction_id"
+
     auction_id: AuctionId
     winner_id: Optional[BidderId]
     winning_bid: Money
     auction_title: str
 
 
+@event_codec.register(type_id=4)
 @dataclass(frozen=True)
 class AuctionBegan(Event):
+    AGGREGATE_TYPE = "auction"
+    AGGREGATE_ID_FIELD = "auction_id"
+
     auction_id: AuctionId
     starting_price: Money
     auction_title: str
@@ -5,6 +5,7 @@ import pytest
 from foundation.value_objects import Money
 from foundation.value_objects.factories import get_dollars
 
+from auctions.application.repositories import AuctionModifiedConcurrently
 from auctions.application.use_cases import PlacingBid
 from auctions.application.use_cases.placing_bid import PlacingBidInputDto, PlacingBidOutputDto
 from auctions.domain.entities import Auction
@@ -55,3 +56,29 @@ def test_presents_output_dto(
 
     expected_output_dto = PlacingBidOutputDto(is_winner=True, current_price=input_dto.amount)
     placing_bid_output_boundary_mock.present.assert_called_once_with(expected_output_dto)
+
+
+def test_bids_again_on_freshly_loaded_auction_after_losing_race(
+    placing_bid_uc: PlacingBid, auctions_repo_mock: Mock, auction: Auction, input_dto: PlacingBidInputDto
+) -> None:
+    auctions_repo_mock.save.side_effect = [AuctionModifiedConcurrently(), None]
+
+    placing_bid_uc.execute(input_dto)
+
+    assert auctions_repo_mock.get.call_count == 2
+    assert auctions_repo_mock.save.call_count == 2
+
+
+def test_gives_up_after_max_attempts(
+    placing_bid_uc: PlacingBid,
+    auctions_repo_mock: Mock,
+    input_dto: PlacingBidInputDto,
+    placing_bid_output_boundary_mock: Mock,
+) -> None:
+    auctions_repo_mock.save.side_effect = AuctionModifiedConcurrently()
+
+    with pytest.raises(AuctionModifiedConcurrently):
+        placing_bid_uc.execute(input_dto)
+
+    assert auctions_repo_mock.save.call_count == PlacingBid.MAX_ATTEMPTS
+    placing_bid_output_boundary_mock.present.assert_not_called()
@@ -3,10 +3,23 @@ from sqlalchemy.engine import Connection
 
 from foundation.events import EventBus
 
-from auctions import AuctionsRepository, GetActiveAuctions, GetSingleAuction
+from auctions import (
+    AsyncGetActiveAuctions,
+    AsyncGetSingleAuction,
+    AuctionsRepository,
+    GetActiveAuctions,
+    GetSingleAuction,
+)
 from auctions_infrastructure.models import auctions, bids
-from auctions_infrastructure.queries import SqlGetActiveAuctions, SqlGetSingleAuction
+from auctions_infrastructure.queries import (
+    AsyncSqlGetActiveAuctions,
+    AsyncSqlGetSingleAuction,
+    SqlGetActiveAuctions,
+    SqlGetSingleAuction,
+)
 from auctions_infrastructure.repositories import SqlAlchemyAuctionsRepo
+from db_infrastructure.aio import AsyncReadDatabase
+from db_infrastructure.replica import ReadConnection
 
 __all__ = [
     # module
@@ -19,13 +32,21 @@ __all__ = [
 
 class AuctionsInfrastructure(injector.Module):
     @injector.provider
-    def get_active_auctions(self, conn: Connection) -> GetActiveAuctions:
+    def get_active_auctions(self, conn: ReadConnection) -> GetActiveAuctions:
         return SqlGetActiveAuctions(conn)
 
     @injector.provider
-    def get_single_auction(self, conn: Connection) -> GetSingleAuction:
+    def get_single_auction(self, conn: ReadConnection) -> GetSingleAuction:
         return SqlGetSingleAuction(conn)
 
+    @injector.provider
+    def async_get_active_auctions(self, db: AsyncReadDatabase) -> AsyncGetActiveAuctions:
+        return AsyncSqlGetActiveAuctions(db)
+
+    @injector.provider
+    def async_get_single_auction(self, db: AsyncReadDatabase) -> AsyncGetSingleAuction:
+        return AsyncSqlGetSingleAuction(db)
+
     @injector.provider
     def auctions_repo(self, conn: Connection, event_bus: EventBus) -> AuctionsRepository:
         return SqlAlchemyAuctionsRepo(conn, event_bus)
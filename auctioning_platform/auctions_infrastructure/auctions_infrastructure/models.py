@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, Numeric, String, Table
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, Numeric, String, Table
 
 from db_infrastructure import metadata
 
@@ -11,7 +11,13 @@ auctions = Table(
     Column("current_price", Numeric, nullable=False),
     Column("ends_at", DateTime, nullable=False),
     Column("ended", Boolean, nullable=False, default=False),
+    # bumped on every save, guards against concurrent read-modify-write (see SqlAlchemyAuctionsRepo.save)
+    Column("version", Integer, nullable=False, default=1, server_default="1"),
 )
+# keyset pagination of active auctions (see queries.auctions.SORT_KEYS), sorted by id uses the primary key
+Index("ix_auctions_ends_at_id", auctions.c.ends_at, auctions.c.id)
+# ends_at lets the database filter out ended auctions while scanning the index
+Index("ix_auctions_current_price_id", auctions.c.current_price, auctions.c.id, auctions.c.ends_at)
 
 
 bids = Table(
@@ -1,3 +1,8 @@
-__all__ = ["SqlGetActiveAuctions", "SqlGetSingleAuction"]
+__all__ = ["SqlGetActiveAuctions", "SqlGetSingleAuction", "AsyncSqlGetActiveAuctions", "AsyncSqlGetSingleAuction"]
 
-from auctions_infrastructure.queries.auctions import SqlGetActiveAuctions, SqlGetSingleAuction
+from auctions_infrastructure.queries.auctions import (
+    AsyncSqlGetActiveAuctions,
+    AsyncSqlGetSingleAuction,
+    SqlGetActiveAuctions,
+    SqlGetSingleAuction,
+)
@@ -1,33 +1,118 @@
-from typing import List
+import base64
+import binascii
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+import json
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
 
-from sqlalchemy import func
-from sqlalchemy.engine import RowProxy
+from sqlalchemy import Column, func, tuple_
+from sqlalchemy.sql import Select
 
 from foundation.value_objects.factories import get_dollars
 
-from auctions.application.queries import AuctionDto, GetActiveAuctions, GetSingleAuction
+from auctions.application.queries import (
+    ActiveAuctionsCriteria,
+    AsyncGetActiveAuctions,
+    AsyncGetSingleAuction,
+    AuctionDto,
+    AuctionsPage,
+    AuctionsSort,
+    GetActiveAuctions,
+    GetSingleAuction,
+    InvalidCursor,
+)
 from auctions_infrastructure import auctions
-from auctions_infrastructure.queries.base import SqlQuery
+from auctions_infrastructure.queries.base import AsyncSqlQuery, SqlQuery
 
 
 class SqlGetActiveAuctions(GetActiveAuctions, SqlQuery):
-    def query(self) -> List[AuctionDto]:
-        return [
-            _row_to_dto(row) for row in self._conn.execute(auctions.select().where(auctions.c.ends_at > func.now()))
-        ]
+    def query(self, criteria: ActiveAuctionsCriteria = ActiveAuctionsCriteria()) -> AuctionsPage:
+        return _page(self._conn.execute(_active_auctions(criteria)).fetchall(), criteria)
 
 
 class SqlGetSingleAuction(GetSingleAuction, SqlQuery):
     def query(self, auction_id: int) -> AuctionDto:
-        row = self._conn.execute(auctions.select().where(auctions.c.id == auction_id)).first()
+        row = self._conn.execute(_single_auction(auction_id)).first()
         return _row_to_dto(row)
 
 
-def _row_to_dto(auction_proxy: RowProxy) -> AuctionDto:
+class AsyncSqlGetActiveAuctions(AsyncGetActiveAuctions, AsyncSqlQuery):
+    async def query(self, criteria: ActiveAuctionsCriteria = ActiveAuctionsCriteria()) -> AuctionsPage:
+        return _page(await self._db.fetch_all(_active_auctions(criteria)), criteria)
+
+
+class AsyncSqlGetSingleAuction(AsyncGetSingleAuction, AsyncSqlQuery):
+    async def query(self, auction_id: int) -> Optional[AuctionDto]:
+        row = await self._db.fetch_one(_single_auction(auction_id))
+        return _row_to_dto(row) if row is not None else None
+
+
+# keyset pagination - pages are sorted by these columns, the last one is unique, and the next page starts after
+# the last row of the previous one, so getting any page is an index range scan (see ix_auctions_* indexes)
+SORT_KEYS: Dict[AuctionsSort, Tuple[Column, ...]] = {
+    AuctionsSort.ENDING_SOONEST: (auctions.c.ends_at, auctions.c.id),
+    AuctionsSort.CURRENT_PRICE: (auctions.c.current_price, auctions.c.id),
+    AuctionsSort.NEWEST: (auctions.c.id,),
+}
+DESCENDING = {AuctionsSort.NEWEST}
+CURSOR_VALUE_PARSERS: Dict[str, Callable[[str], Any]] = {
+    "ends_at": datetime.fromisoformat,
+    "current_price": Decimal,
+    "id": int,
+}
+
+
+def _active_auctions(criteria: ActiveAuctionsCriteria) -> Select:
+    query = auctions.select().where(auctions.c.ends_at > func.now())
+    if criteria.min_price is not None:
+        query = query.where(auctions.c.current_price >= criteria.min_price.amount)
+    if criteria.max_price is not None:
+        query = query.where(auctions.c.current_price <= criteria.max_price.amount)
+
+    keys = SORT_KEYS[criteria.sort]
+    descending = criteria.sort in DESCENDING
+    if criteria.cursor is not None:
+        after = _decode_cursor(criteria.cursor, criteria.sort)
+        query = query.where(tuple_(*keys) < after if descending else tuple_(*keys) > after)
+    order = [key.desc() if descending else key.asc() for key in keys]
+    # one more row tells whether there is a next page
+    return query.order_by(*order).limit(criteria.limit + 1)
+
+
+def _page(rows: Sequence[Mapping], criteria: ActiveAuctionsCriteria) -> AuctionsPage:
+    has_next = len(rows) > criteria.limit
+    rows = rows[: criteria.limit]
+    next_cursor = _encode_cursor(criteria.sort, rows[-1]) if has_next else None
+    return AuctionsPage([_row_to_dto(row) for row in rows], next_cursor)
+
+
+def _encode_cursor(sort: AuctionsSort, row: Mapping) -> str:
+    values = [row[key.name] for key in SORT_KEYS[sort]]
+    payload = [sort.value] + [value.isoformat() if isinstance(value, datetime) else str(value) for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: AuctionsSort) -> Tuple:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        sort_value, *values = payload
+        keys = SORT_KEYS[sort]
+        if sort_value != sort.value or len(values) != len(keys):
+            raise InvalidCursor(f"Cursor does not belong to pages sorted by {sort.value}")
+        return tuple(CURSOR_VALUE_PARSERS[key.name](value) for key, value in zip(keys, values))
+    except (ValueError, TypeError, InvalidOperation, binascii.Error) as exc:  # InvalidCursor is a ValueError too
+        raise InvalidCursor(str(exc)) from exc
+
+
+def _single_auction(auction_id: int) -> Select:
+    return auctions.select().where(auctions.c.id == auction_id)
+
+
+def _row_to_dto(row: Mapping) -> AuctionDto:
     return AuctionDto(
-        id=auction_proxy.id,
-        title=auction_proxy.title,
-        current_price=get_dollars(auction_proxy.current_price),
-        starting_price=get_dollars(auction_proxy.starting_price),
-        ends_at=auction_proxy.ends_at,
+        id=row["id"],
+        title=row["title"],
+        current_price=get_dollars(row["current_price"]),
+        starting_price=get_dollars(row["starting_price"]),
+        ends_at=row["ends_at"],
     )
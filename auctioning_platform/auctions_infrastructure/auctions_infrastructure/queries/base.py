@@ -1,6 +1,13 @@
 from sqlalchemy.engine import Connection
 
+from db_infrastructure.aio import AsyncDatabase
+
 
 class SqlQuery:
     def __init__(self, connection: Connection) -> None:
         self._conn = connection
+
+
+class AsyncSqlQuery:
+    def __init__(self, db: AsyncDatabase) -> None:
+        self._db = db
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 
 import pytz
 from sqlalchemy.engine import Connection, RowProxy
@@ -6,16 +6,24 @@ from sqlalchemy.engine import Connection, RowProxy
 from foundation.events import EventBus
 from foundation.value_objects.factories import get_dollars
 
-from auctions.application.repositories import AuctionsRepository
+from auctions.application.repositories import AuctionModifiedConcurrently, AuctionsRepository
 from auctions.domain.entities import Auction, Bid
 from auctions.domain.value_objects import AuctionId
 from auctions_infrastructure import auctions, bids
 
 
 class SqlAlchemyAuctionsRepo(AuctionsRepository):
+    """Saves auctions with optimistic concurrency control.
+
+    Version of every auction read with `get` is remembered, `save` updates the row only if the version
+    has not changed in the meantime and raises AuctionModifiedConcurrently otherwise.
+    Auctions that were not read by this repository are saved unconditionally.
+    """
+
     def __init__(self, connection: Connection, event_bus: EventBus) -> None:
         self._conn = connection
         self._event_bus = event_bus
+        self._versions: Dict[AuctionId, int] = {}
 
     def get(self, auction_id: AuctionId) -> Auction:
         row = self._conn.execute(auctions.select().where(auctions.c.id == auction_id)).first()
@@ -23,6 +31,7 @@ class SqlAlchemyAuctionsRepo(AuctionsRepository):
             raise Exception("Not found")
 
         bid_rows = self._conn.execute(bids.select().where(bids.c.auction_id == auction_id)).fetchall()
+        self._versions[auction_id] = row.version
         return self._row_to_entity(row, bid_rows)
 
     def _row_to_entity(self, auction_proxy: RowProxy, bids_proxies: List[RowProxy]) -> Auction:
@@ -44,9 +53,25 @@ class SqlAlchemyAuctionsRepo(AuctionsRepository):
             "ends_at": auction.ends_at,
             "ended": auction._ended,
         }
-        update_result = self._conn.execute(auctions.update(values=raw_auction, whereclause=auctions.c.id == auction.id))
-        if update_result.rowcount != 1:
-            self._conn.execute(auctions.insert(values=dict(raw_auction, id=auction.id)))
+        version = self._versions.get(auction.id)
+        if version is not None:
+            update_result = self._conn.execute(
+                auctions.update(
+                    values=dict(raw_auction, version=version + 1),
+                    whereclause=(auctions.c.id == auction.id) & (auctions.c.version == version),
+                )
+            )
+            if update_result.rowcount != 1:
+                raise AuctionModifiedConcurrently(auction.id)
+            self._versions[auction.id] = version + 1
+        else:
+            update_result = self._conn.execute(
+                auctions.update(
+                    values=dict(raw_auction, version=auctions.c.version + 1), whereclause=auctions.c.id == auction.id
+                )
+            )
+            if update_result.rowcount != 1:
+                self._conn.execute(auctions.insert(values=dict(raw_auction, id=auction.id)))
 
         for bid in auction.bids:
             if bid.id:
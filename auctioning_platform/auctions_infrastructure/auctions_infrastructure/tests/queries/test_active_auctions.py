@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+import pytest
+from sqlalchemy.engine import Connection, Engine
+
+from foundation.value_objects.factories import get_dollars
+
+from auctions import ActiveAuctionsCriteria, AuctionsSort, InvalidCursor
+from auctions_infrastructure import auctions
+from auctions_infrastructure.queries import SqlGetActiveAuctions
+from db_infrastructure import Base
+
+
+@pytest.fixture(scope="session")
+def sqlalchemy_connect_url() -> str:
+    return "sqlite:///:memory:"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_teardown_tables(engine: Engine) -> None:
+    Base.metadata.create_all(engine)
+
+
+@pytest.fixture()
+def query(connection: Connection, ends_at: datetime, past_date: datetime) -> SqlGetActiveAuctions:
+    prices = {1: "30", 2: "10", 3: "20", 4: "10", 5: "50"}
+    connection.execute(
+        auctions.insert(),
+        [
+            {
+                "id": auction_id,
+                "title": f"Auction {auction_id}",
+                "starting_price": Decimal("1"),
+                "current_price": Decimal(price),
+                # the later the id, the sooner it ends
+                "ends_at": ends_at - timedelta(hours=auction_id),
+                "ended": False,
+            }
+            for auction_id, price in prices.items()
+        ]
+        + [
+            {
+                "id": 6,
+                "title": "Expired",
+                "starting_price": Decimal("1"),
+                "current_price": Decimal("1"),
+                "ends_at": past_date,
+                "ended": True,
+            }
+        ],
+    )
+    return SqlGetActiveAuctions(connection)
+
+
+def all_pages(query: SqlGetActiveAuctions, criteria: ActiveAuctionsCriteria) -> List[List[int]]:
+    pages = []
+    while True:
+        page = query.query(criteria)
+        pages.append([auction.id for auction in page.auctions])
+        if page.next_cursor is None:
+            return pages
+        criteria = ActiveAuctionsCriteria(
+            criteria.sort, criteria.limit, page.next_cursor, criteria.min_price, criteria.max_price
+        )
+
+
+@pytest.mark.usefixtures("transaction")
+def test_pages_active_auctions_ending_soonest_first(query: SqlGetActiveAuctions) -> None:
+    assert all_pages(query, ActiveAuctionsCriteria(limit=2)) == [[5, 4], [3, 2], [1]]
+
+
+@pytest.mark.usefixtures("transaction")
+def test_pages_by_current_price_with_ties_broken_by_id(query: SqlGetActiveAuctions) -> None:
+    criteria = ActiveAuctionsCriteria(AuctionsSort.CURRENT_PRICE, limit=2)
+
+    assert all_pages(query, criteria) == [[2, 4], [3, 1], [5]]
+
+
+@pytest.mark.usefixtures("transaction")
+def test_pages_newest_first(query: SqlGetActiveAuctions) -> None:
+    assert all_pages(query, ActiveAuctionsCriteria(AuctionsSort.NEWEST, limit=3)) == [[5, 4, 3], [2, 1]]
+
+
+@pytest.mark.usefixtures("transaction")
+def test_filters_by_current_price(query: SqlGetActiveAuctions) -> None:
+    criteria = ActiveAuctionsCriteria(
+        AuctionsSort.CURRENT_PRICE, limit=1, min_price=get_dollars("10"), max_price=get_dollars("20")
+    )
+
+    assert all_pages(query, criteria) == [[2], [4], [3]]
+
+
+@pytest.mark.usefixtures("transaction")
+def test_rejects_cursor_of_differently_sorted_pages(query: SqlGetActiveAuctions) -> None:
+    cursor = query.query(ActiveAuctionsCriteria(limit=1)).next_cursor
+
+    with pytest.raises(InvalidCursor):
+        query.query(ActiveAuctionsCriteria(AuctionsSort.NEWEST, cursor=cursor))
+    with pytest.raises(InvalidCursor):
+        query.query(ActiveAuctionsCriteria(cursor="not-a-cursor"))
@@ -0,0 +1,47 @@
+import asyncio
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from foundation.value_objects.factories import get_dollars
+
+from auctions_infrastructure import auctions
+from auctions_infrastructure.queries import AsyncSqlGetActiveAuctions, AsyncSqlGetSingleAuction
+from db_infrastructure import Base
+from db_infrastructure.aio import ThreadPoolDatabase
+
+
+@pytest.fixture()
+def file_engine(tmp_path: Path) -> Engine:
+    # queries run in other threads, which would not see an in-memory database
+    engine = create_engine(f"sqlite:///{tmp_path / 'queries.db'}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture()
+def db(file_engine: Engine, ends_at: datetime, past_date: datetime) -> ThreadPoolDatabase:
+    file_engine.execute(
+        auctions.insert(),
+        [
+            {"id": 1, "title": "Active", "starting_price": 1, "current_price": 5, "ends_at": ends_at, "ended": False},
+            {"id": 2, "title": "Expired", "starting_price": 1, "current_price": 1, "ends_at": past_date, "ended": True},
+        ],
+    )
+    return ThreadPoolDatabase(file_engine, max_workers=2)
+
+
+def test_gets_active_auctions(db: ThreadPoolDatabase) -> None:
+    result = asyncio.run(AsyncSqlGetActiveAuctions(db).query()).auctions
+
+    assert [(dto.id, dto.title, dto.current_price) for dto in result] == [(1, "Active", get_dollars("5"))]
+
+
+def test_gets_single_auction_or_none(db: ThreadPoolDatabase) -> None:
+    query = AsyncSqlGetSingleAuction(db)
+
+    assert asyncio.run(query.query(2)).title == "Expired"  # type: ignore
+    assert asyncio.run(query.query(3)) is None
@@ -9,6 +9,7 @@ from sqlalchemy.engine import Connection, Engine, RowProxy
 from foundation.events import Event, EventBus
 from foundation.value_objects.factories import get_dollars
 
+from auctions.application.repositories import AuctionModifiedConcurrently
 from auctions.domain.entities import Auction, Bid
 from auctions_infrastructure import auctions, bids
 from auctions_infrastructure.repositories import SqlAlchemyAuctionsRepo
@@ -162,6 +163,41 @@ def test_AuctionsRepo_UponSavingAuction_PostsPendingEventsViaEventBus(
     event_bus_mock.post.assert_called()
 
 
+@pytest.mark.usefixtures("transaction")
+def test_saving_bumps_version(
+    connection: Connection, another_bidder_id: int, auction_model_with_a_bid: RowProxy, event_bus_mock: Mock
+) -> None:
+    repo = SqlAlchemyAuctionsRepo(connection, event_bus_mock)
+    auction = repo.get(auction_model_with_a_bid.id)
+    auction.place_bid(another_bidder_id, auction.current_price + get_dollars("1.00"))
+
+    repo.save(auction)
+    repo.save(auction)
+
+    version = connection.execute(select([auctions.c.version]).where(auctions.c.id == auction.id)).scalar()
+    assert version == auction_model_with_a_bid.version + 2
+
+
+@pytest.mark.usefixtures("transaction")
+def test_refuses_to_save_auction_changed_since_it_was_read(
+    connection: Connection, another_bidder_id: int, auction_model_with_a_bid: RowProxy, event_bus_mock: Mock
+) -> None:
+    repo = SqlAlchemyAuctionsRepo(connection, event_bus_mock)
+    auction = repo.get(auction_model_with_a_bid.id)
+    concurrent_repo = SqlAlchemyAuctionsRepo(connection, event_bus_mock)
+    concurrent_auction = concurrent_repo.get(auction_model_with_a_bid.id)
+    concurrent_auction.place_bid(another_bidder_id, auction.current_price + get_dollars("2.00"))
+    concurrent_repo.save(concurrent_auction)
+    event_bus_mock.reset_mock()
+
+    auction.place_bid(another_bidder_id, auction.current_price + get_dollars("1.00"))
+    with pytest.raises(AuctionModifiedConcurrently):
+        repo.save(auction)
+
+    assert connection.execute(select([func.count()]).select_from(bids)).scalar() == 2
+    event_bus_mock.post.assert_not_called()
+
+
 class EventBusStub(EventBus):
     def __init__(self) -> None:
         self.events = []
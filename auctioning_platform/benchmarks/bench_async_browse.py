@@ -0,0 +1,104 @@
+"""Measures browse requests/s of a single worker process: the async read path versus Flask in threads.
+
+`wsgi` calls the Flask app from as many threads as there are concurrent clients, like a threaded WSGI server.
+`asgi` calls web_app.asgi from as many coroutines, so GET /auctions/ runs with AsyncGetActiveAuctions.
+No server or sockets are involved, only the apps. With PostgreSQL the async path uses asyncpg (needs
+`pip install asyncpg`), with other databases it still runs queries in a thread pool and the difference
+is mostly the request handling.
+Needs the same environment variables as the app (see example.env_file).
+
+    CONFIG_PATH=example.env_file python benchmarks/bench_async_browse.py [--concurrency 10 100] [--requests 2000]
+"""
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy.engine import Engine
+
+from auctions_infrastructure import auctions
+from main.migrate import create_db_schema
+from web_app.asgi import AsgiApp, _call_wsgi, _wsgi_environ, create_asgi_app
+
+SCOPE: Dict[str, Any] = {
+    "type": "http",
+    "method": "GET",
+    "path": "/auctions/",
+    "query_string": b"",
+    "headers": [],
+    "http_version": "1.1",
+}
+
+
+async def browse(app: AsgiApp) -> None:
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b""}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+
+    await app(SCOPE, receive, send)
+
+
+async def run_asgi(app: AsgiApp, concurrency: int, requests: int) -> float:
+    remaining = iter(range(requests))
+
+    async def client() -> None:
+        for _ in remaining:
+            await browse(app)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def run_wsgi(app: AsgiApp, concurrency: int, requests: int) -> float:
+    flask_app = app._flask_app
+
+    def browse_sync(_: int) -> None:
+        status, _headers, _chunks = _call_wsgi(flask_app, _wsgi_environ(SCOPE, b""))
+        assert status == 200, status
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(browse_sync, range(requests)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[10, 100])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--auctions", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_asgi_app()
+    engine = app._injector.get(Engine)
+    create_db_schema(engine)
+    with engine.begin() as conn:
+        conn.execute(auctions.delete())
+        ends_at = datetime.now() + timedelta(days=7)
+        conn.execute(
+            auctions.insert(),
+            [
+                {"title": f"Auction {i}", "starting_price": 1, "current_price": 1, "ends_at": ends_at, "ended": False}
+                for i in range(args.auctions)
+            ],
+        )
+
+    results: List[str] = []
+    for concurrency in args.concurrency:
+        wsgi_elapsed = run_wsgi(app, concurrency, args.requests)
+        asgi_elapsed = asyncio.run(run_asgi(app, concurrency, args.requests))
+        results.append(
+            f"{concurrency:>5} clients   wsgi {args.requests / wsgi_elapsed:>8,.0f} req/s   "
+            f"asgi {args.requests / asgi_elapsed:>8,.0f} req/s"
+        )
+    print("\n".join(results))
+
+
+if __name__ == "__main__":
+    main()
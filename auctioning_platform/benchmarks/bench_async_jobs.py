@@ -0,0 +1,109 @@
+"""Compares enqueueing one RQ job per async handler with relaying them through the outbox.
+
+Every simulated bid posts WinningBidPlaced and BidderHasBeenOverbid, each handled asynchronously.
+With the outbox, bids do not talk to Redis at all - OutboxRelay publishes one job per bid's transaction.
+Requires a running Redis and the same environment variables as the app (see example.env_file),
+because the worker part bootstraps the application for every job.
+
+    CONFIG_PATH=example.env_file python benchmarks/bench_async_jobs.py [--bids 500]
+"""
+import argparse
+import os
+import time
+from typing import Any, Callable
+
+from redis import Redis
+from rq import Queue, SimpleWorker
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy.engine import Connection, Engine, create_engine
+
+from foundation.events import DEFAULT_QUEUE
+from foundation.value_objects.factories import get_dollars
+
+from auctions import BidderHasBeenOverbid, WinningBidPlaced
+from db_infrastructure import metadata
+from main.async_handler_task import async_handler_generic_task
+from main.outbox import Outbox, OutboxRelay
+
+
+class NoopHandler:
+    def __call__(self, event: Any) -> None:
+        pass
+
+
+def legacy_run_async_handler(queue: Queue, connection: Connection) -> Callable[..., None]:
+    """Copy of the enqueueing done before handlers were batched."""
+
+    def enqueue_after_commit(handler_cls, *args, **kwargs):  # type: ignore
+        sqlalchemy_event.listens_for(connection, "commit")(
+            lambda _conn: queue.enqueue(async_handler_generic_task, handler_cls, *args, **kwargs)
+        )
+
+    return enqueue_after_commit
+
+
+def outbox_run_async_handler(_queue: Queue, connection: Connection) -> Callable[..., None]:
+    return Outbox(connection).add
+
+
+def place_bids(
+    engine: Engine, queue: Queue, bids: int, run_async_handler_factory: Callable[[Queue, Connection], Callable]
+) -> None:
+    price = get_dollars("10.00")
+    for bid in range(bids):
+        connection = engine.connect()
+        run_async_handler = run_async_handler_factory(queue, connection)
+        with connection.begin():
+            run_async_handler(NoopHandler, WinningBidPlaced(1, bid, price, "Socks"))
+            run_async_handler(NoopHandler, BidderHasBeenOverbid(1, bid - 1, price, "Socks"))
+        connection.close()
+
+
+def commands_processed(redis: Redis) -> int:
+    return int(redis.info("stats")["total_commands_processed"])
+
+
+def run(name: str, factory: Callable[[Queue, Connection], Callable], bids: int, redis: Redis, engine: Engine) -> None:
+    queue = Queue(DEFAULT_QUEUE, connection=redis)
+    queue.empty()
+
+    commands_before = commands_processed(redis)
+    start = time.perf_counter()
+    place_bids(engine, queue, bids, factory)
+    bids_time = time.perf_counter() - start
+    bids_commands = commands_processed(redis) - commands_before - 1
+
+    start = time.perf_counter()
+    relay = OutboxRelay(engine, redis)
+    while relay.relay_pending():
+        pass
+    relay_time = time.perf_counter() - start
+    commands = commands_processed(redis) - commands_before - 2
+    jobs = queue.count
+
+    start = time.perf_counter()
+    SimpleWorker([queue], connection=redis).work(burst=True)
+    work_time = time.perf_counter() - start
+
+    print(
+        f"{name:8} jobs/bid={jobs / bids:.1f} redis ops/bid={commands / bids:.1f} "
+        f"(in bid path: {bids_commands / bids:.1f}) bids={bids / bids_time:,.0f}/s "
+        f"relay={relay_time * 1000:,.1f}ms worker={jobs / work_time:,.1f} jobs/s "
+        f"({2 * bids / work_time:,.1f} handlers/s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bids", type=int, default=500)
+    args = parser.parse_args()
+
+    redis = Redis(host=os.environ.get("REDIS_HOST", "localhost"))
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    run("legacy", legacy_run_async_handler, args.bids, redis, engine)
+    run("outbox", outbox_run_async_handler, args.bids, redis, engine)
+
+
+if __name__ == "__main__":
+    main()
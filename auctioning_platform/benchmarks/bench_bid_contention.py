@@ -0,0 +1,140 @@
+"""Places bids on a single hot auction from many threads and checks that no update was lost.
+
+Every thread has its own connection and places bids with PlacingBid, each in its own transaction.
+Bid amounts are handed out in increasing order, but threads race, so some bids arrive after higher ones
+and must be rejected. Accepted bids, in the order they were stored, have to be strictly increasing
+and the last one has to be the auction's current price. `--unversioned` saves auctions without
+the version check, to show what goes wrong without it.
+Uses SQLite file in a temporary directory unless --dsn is given. SQLite allows one writer at a time,
+so use PostgreSQL to see how throughput scales with threads. Note that every attempt loads all bids
+of the auction, so throughput drops as the auction grows.
+
+    python benchmarks/bench_bid_contention.py [--threads 8] [--bids 200] [--unversioned] [--dsn postgresql://...]
+"""
+import argparse
+from datetime import datetime, timedelta
+from decimal import Decimal
+import itertools
+import os
+import tempfile
+import threading
+import time
+from typing import Iterator, List, Type
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine, create_engine
+
+from foundation.events import Event, EventBus
+from foundation.value_objects.factories import get_dollars
+
+from auctions import (
+    AuctionId,
+    AuctionModifiedConcurrently,
+    PlacingBid,
+    PlacingBidInputDto,
+    PlacingBidOutputBoundary,
+    PlacingBidOutputDto,
+)
+from auctions.domain.entities import Auction
+from auctions_infrastructure import auctions, bids
+from auctions_infrastructure.repositories import SqlAlchemyAuctionsRepo
+from db_infrastructure import metadata
+
+AUCTION_ID = AuctionId(1)
+
+
+class NoOpEventBus(EventBus):
+    def post(self, event: Event) -> None:
+        pass
+
+
+class NoOpPresenter(PlacingBidOutputBoundary):
+    def present(self, output_dto: PlacingBidOutputDto) -> None:
+        pass
+
+
+class UnversionedAuctionsRepo(SqlAlchemyAuctionsRepo):
+    """Forgets versions of read auctions, which makes `save` overwrite whatever is stored."""
+
+    def get(self, auction_id: AuctionId) -> Auction:
+        auction = super().get(auction_id)
+        del self._versions[auction_id]
+        return auction
+
+
+def place_bids(
+    engine: Engine, repo_cls: Type[SqlAlchemyAuctionsRepo], amounts: Iterator[int], count: int, gave_up: List[int]
+) -> None:
+    connection = engine.connect()
+    placing_bid = PlacingBid(NoOpPresenter(), repo_cls(connection, NoOpEventBus()))
+    bidder_id = threading.get_ident() % 1_000_000
+    for _ in range(count):
+        dto = PlacingBidInputDto(bidder_id, AUCTION_ID, get_dollars(Decimal(next(amounts)).scaleb(-2)))
+        with connection.begin():
+            try:
+                placing_bid.execute(dto)
+            except AuctionModifiedConcurrently:
+                gave_up.append(dto.amount.minor_units)
+    connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--bids", type=int, default=200, help="bids per thread")
+    parser.add_argument("--unversioned", action="store_true")
+    parser.add_argument("--dsn")
+    args = parser.parse_args()
+
+    if args.dsn:
+        engine = create_engine(args.dsn)
+    else:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'auctions.db')}", connect_args={"timeout": 60}
+        )
+        # in rollback journal mode SQLite deadlocks writers that read first, WAL lets them queue for the write lock
+        engine.execute("PRAGMA journal_mode=WAL")
+    metadata.create_all(engine, tables=[auctions, bids])
+    with engine.begin() as connection:
+        connection.execute(bids.delete())
+        connection.execute(auctions.delete())
+        connection.execute(
+            auctions.insert(),
+            id=AUCTION_ID,
+            title="Vintage mechanical watch",
+            starting_price=Decimal("1.00"),
+            current_price=Decimal("1.00"),
+            ends_at=datetime.utcnow() + timedelta(days=1),
+            ended=False,
+        )
+
+    repo_cls = UnversionedAuctionsRepo if args.unversioned else SqlAlchemyAuctionsRepo
+    amounts = itertools.count(200)  # next() on itertools.count is atomic
+    gave_up: List[int] = []
+    threads = [
+        threading.Thread(target=place_bids, args=(engine, repo_cls, amounts, args.bids, gave_up))
+        for _ in range(args.threads)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    with engine.connect() as connection:
+        stored = [row.amount for row in connection.execute(select([bids.c.amount]).order_by(bids.c.id))]
+        current_price = connection.execute(select([auctions.c.current_price])).scalar()
+    out_of_order = sum(1 for previous, amount in zip(stored, stored[1:]) if amount <= previous)
+
+    total = args.threads * args.bids
+    print(f"{total:,} bids from {args.threads} threads in {elapsed:.2f}s: {total / elapsed:,.0f} bids/s")
+    print(f"accepted {len(stored):,}, gave up after {PlacingBid.MAX_ATTEMPTS} attempts: {len(gave_up):,}")
+    print(f"accepted below an earlier bid: {out_of_order:,}")
+    print(
+        f"current price {get_dollars(current_price)} is {'' if current_price == max(stored) else 'NOT '}the highest bid"
+    )
+
+
+if __name__ == "__main__":
+    main()
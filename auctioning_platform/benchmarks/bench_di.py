@@ -0,0 +1,59 @@
+"""Measures resolving hot types with the injector and with precomputed resolution plans.
+
+All resolutions happen within a single RequestScope, so request scoped connection and outbox are created
+once and the numbers show the cost of dependency injection alone. Handlers are created the way async
+handlers are, with `Injector.create_object` and `main.di.create_object`.
+Needs the same environment variables as the app (see example.env_file); with DI_PROFILE=true
+"current" goes through ProfilingInjector and plans are not used.
+
+    CONFIG_PATH=example.env_file python benchmarks/bench_di.py [--resolutions 20000]
+"""
+import argparse
+import logging
+import time
+from typing import Any, Callable
+
+from auctions import PlacingBidOutputBoundary, PlacingBidOutputDto
+from customer_relationship import WinningBidPlacedHandler
+from main import PLANNED_TYPES, bootstrap_app
+from main.di import PlannedProvider, create_object
+from main.modules import RequestScope
+from payments import PaymentChargedHandler
+
+
+class NullPresenter(PlacingBidOutputBoundary):
+    def present(self, output_dto: PlacingBidOutputDto) -> None:
+        pass
+
+
+def per_second(resolve: Callable[[], Any], resolutions: int) -> float:
+    start = time.perf_counter()
+    for _ in range(resolutions):
+        resolve()
+    return resolutions / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resolutions", type=int, default=20_000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    container = bootstrap_app().injector
+    container.binder.bind(PlacingBidOutputBoundary, to=NullPresenter)
+
+    with container.get(RequestScope):
+        for interface in PLANNED_TYPES:
+            provider = container.binder.get_binding(interface)[0].provider
+            unplanned = provider.wrapped if isinstance(provider, PlannedProvider) else provider
+            injector_rate = per_second(lambda: unplanned.get(container), args.resolutions)
+            planned_rate = per_second(lambda: container.get(interface), args.resolutions)
+            print(f"{interface.__name__:<24} injector {injector_rate:>10,.0f}/s   current {planned_rate:>10,.0f}/s")
+        for handler_cls in (WinningBidPlacedHandler, PaymentChargedHandler):
+            injector_rate = per_second(lambda: container.create_object(handler_cls), args.resolutions)
+            planned_rate = per_second(lambda: create_object(container, handler_cls), args.resolutions)
+            print(f"{handler_cls.__name__:<24} injector {injector_rate:>10,.0f}/s   current {planned_rate:>10,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
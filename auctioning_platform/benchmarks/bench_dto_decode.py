@@ -0,0 +1,55 @@
+"""Measures decoding body of a bid into PlacingBidInputDto, as place_bid view does.
+
+"per request schema" is the previous implementation, generating and instantiating a marshmallow schema on every
+call, kept here for reference. "cached schema" loads with a schema built once, "codec" with the generated loader
+of web_app.serialization.dto, falling back to the schema for malformed bodies.
+
+    python benchmarks/bench_dto_decode.py [--iterations 20000]
+"""
+import argparse
+import time
+from typing import Any, Callable
+
+from marshmallow_dataclass import class_schema
+
+from auctions import PlacingBidInputDto
+from web_app.serialization.dto import BaseSchema, dto_codec
+
+BID = {"bidder_id": 1, "auction_id": 2, "amount": "15.99"}
+MALFORMED_BID = {"bidder_id": 1, "auction_id": 2, "amount": "15.999"}
+
+
+def per_request_schema_load(data: dict) -> Any:
+    return class_schema(PlacingBidInputDto, base_schema=BaseSchema)().load(data)
+
+
+def measure(iterations: int, fn: Callable[[], object]) -> float:
+    """Returns microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        try:
+            fn()
+        except Exception:  # malformed bids raise ValidationError
+            pass
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    codec = dto_codec(PlacingBidInputDto)
+    for name, bid in (("bid", BID), ("malformed bid", MALFORMED_BID)):
+        print(f"{name}:")
+        for variant, load in (
+            ("per request schema", per_request_schema_load),
+            ("cached schema", codec.schema.load),
+            ("codec", codec.load),
+        ):
+            micros = measure(args.iterations, lambda: load(dict(bid)))
+            print(f"  {variant:<20} {micros:8.2f} us/decode")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Measures InjectorEventBus.post throughput.
+
+Compares the per-post injector lookup that the bus used to do with the dispatch table.
+
+    python benchmarks/bench_event_bus.py [--posts 100000]
+"""
+import argparse
+import time
+from typing import Any, Callable, List
+
+from injector import Binder, Injector, UnsatisfiedRequirement
+
+from foundation.events import (
+    DEFAULT_QUEUE,
+    AsyncEventHandlerProvider,
+    AsyncHandler,
+    Event,
+    EventBus,
+    EventHandlerProvider,
+    Handler,
+    InjectorEventBus,
+)
+from foundation.value_objects.factories import get_dollars
+
+from auctions import AuctionEnded, BidderHasBeenOverbid, WinningBidPlaced
+
+
+class LegacyInjectorEventBus(EventBus):
+    """Copy of the bus before the dispatch table was introduced."""
+
+    def __init__(self, injector: Injector, run_async_handler: Callable[..., None]) -> None:
+        self._injector = injector
+        self._run_async_handler = run_async_handler
+
+    def post(self, event: Event) -> None:
+        try:
+            handlers = self._injector.get(Handler[type(event)])  # type: ignore
+        except UnsatisfiedRequirement:
+            pass
+        else:
+            for handler in handlers:
+                handler(event)
+
+        try:
+            async_handlers = self._injector.get(AsyncHandler[type(event)])  # type: ignore
+        except UnsatisfiedRequirement:
+            pass
+        else:
+            for async_handler in async_handlers:
+                self._run_async_handler(async_handler, event)
+
+
+class NoopHandler:
+    def __call__(self, event: Event) -> None:
+        pass
+
+
+def configure(binder: Binder) -> None:
+    binder.multibind(AsyncHandler[WinningBidPlaced], to=AsyncEventHandlerProvider(NoopHandler))
+    binder.multibind(AsyncHandler[BidderHasBeenOverbid], to=AsyncEventHandlerProvider(NoopHandler))
+    binder.multibind(Handler[AuctionEnded], to=EventHandlerProvider(NoopHandler))
+
+
+def run_async_handler(_handler_cls: Any, _event: Event, *, queue: str = DEFAULT_QUEUE) -> None:
+    pass
+
+
+def measure(bus: EventBus, events: List[Event], posts: int) -> float:
+    start = time.perf_counter()
+    for i in range(posts):
+        bus.post(events[i % len(events)])
+    return posts / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=100_000)
+    args = parser.parse_args()
+
+    container = Injector([configure], auto_bind=False)
+    price = get_dollars("10.00")
+    events: List[Event] = [
+        WinningBidPlaced(1, 1, price, "Socks"),
+        BidderHasBeenOverbid(1, 2, price, "Socks"),
+        AuctionEnded(1, 1, price, "Socks"),
+    ]
+
+    legacy = measure(LegacyInjectorEventBus(container, run_async_handler), events, args.posts)
+    current = measure(InjectorEventBus(container, run_async_handler), events, args.posts)
+    print(f"legacy bus:         {legacy:12,.0f} posts/s")
+    print(f"dispatch table bus: {current:12,.0f} posts/s ({current / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compares async handler call payloads encoded with pickle and with foundation.event_codec.
+
+Payloads are what the outbox stores and RQ jobs carry: handler class and the event.
+
+    python benchmarks/bench_event_codec.py [--iterations 50000]
+"""
+import argparse
+import pickle
+import time
+from typing import Callable, List, Tuple
+from uuid import uuid4
+
+from foundation.events import Event
+from foundation.value_objects.factories import get_dollars
+
+from auctions import AuctionEnded, BidderHasBeenOverbid, WinningBidPlaced
+from customer_relationship import BidderHasBeenOverbidHandler, WinningBidPlacedHandler
+from main.async_handler_task import HandlerCall, decode_call, encode_call
+from payments import PaymentCharged, PaymentChargedHandler
+from processes.paying_for_won_item import PayingForWonItemHandler
+
+
+def calls() -> List[Tuple[str, HandlerCall]]:
+    price = get_dollars("1250.99")
+    title = "Vintage mechanical watch"
+    events: List[Tuple[type, Event]] = [
+        (BidderHasBeenOverbidHandler, BidderHasBeenOverbid(1234, 5678, price, title)),
+        (WinningBidPlacedHandler, WinningBidPlaced(1234, 5678, price, title)),
+        (PayingForWonItemHandler, AuctionEnded(1234, 5678, price, title)),
+        (PaymentChargedHandler, PaymentCharged(uuid4(), 5678)),
+    ]
+    return [(type(event).__name__, (handler_cls, (event,), {})) for handler_cls, event in events]
+
+
+def measure(iterations: int, fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    for name, call in calls():
+        pickled, encoded = pickle.dumps(call), encode_call(call)
+        assert decode_call(encoded) == call
+        print(
+            f"{name:21} bytes: pickle={len(pickled):4} codec={len(encoded):4} "
+            f"({len(pickled) / len(encoded):.1f}x smaller) | "
+            f"encode/s: pickle={measure(args.iterations, lambda: pickle.dumps(call)):,.0f} "
+            f"codec={measure(args.iterations, lambda: encode_call(call)):,.0f} | "
+            f"decode/s: pickle={measure(args.iterations, lambda: pickle.loads(pickled)):,.0f} "
+            f"codec={measure(args.iterations, lambda: decode_call(encoded)):,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
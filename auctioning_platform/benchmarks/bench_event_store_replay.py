@@ -0,0 +1,73 @@
+"""Measures appending to and replaying from the event store.
+
+Replay goes through EventStore.replay, so it includes reading in batches, decoding and saving the checkpoint.
+Growth of peak RSS during replay shows memory use does not depend on the number of stored events.
+Uses SQLite file in a temporary directory unless --dsn is given.
+
+    python benchmarks/bench_event_store_replay.py [--events 1000000] [--batch-size 5000]
+"""
+import argparse
+import os
+import resource
+import tempfile
+import time
+
+from sqlalchemy.engine import create_engine
+
+from foundation.events import Event
+from foundation.value_objects.factories import get_dollars
+
+from auctions import BidderHasBeenOverbid, WinningBidPlaced
+from db_infrastructure import metadata
+from db_infrastructure.event_store import EventStore, event_store_checkpoints, events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--dsn")
+    args = parser.parse_args()
+
+    dsn = args.dsn or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'events.db')}"
+    engine = create_engine(dsn)
+    metadata.create_all(engine, tables=[events, event_store_checkpoints])
+    connection = engine.connect()
+    store = EventStore(connection)
+
+    price = get_dollars("10.00")
+    start = time.perf_counter()
+    for offset in range(0, args.events, 10_000):
+        with connection.begin():
+            store.append(
+                WinningBidPlaced(number // 50, number, price, "Socks")
+                if number % 2
+                else BidderHasBeenOverbid(number // 50, number, price, "Socks")
+                for number in range(offset, min(offset + 10_000, args.events))
+            )
+    append_time = time.perf_counter() - start
+    print(f"append: {args.events / append_time:,.0f} events/s")
+
+    replayed = 0
+
+    def count(_event: Event) -> None:
+        nonlocal replayed
+        replayed += 1
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    store.replay("bench", count, batch_size=args.batch_size)
+    replay_time = time.perf_counter() - start
+    rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    print(
+        f"replay: {replayed / replay_time:,.0f} events/s ({replayed:,} events in {replay_time:.1f}s), "
+        f"peak RSS grew by {rss_growth / 1024:.1f} MiB"
+    )
+
+    start = time.perf_counter()
+    auction_events = store.for_aggregate("auction", args.events // 100)
+    print(f"single aggregate: {len(auction_events)} events in {(time.perf_counter() - start) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Measures acquire/release throughput of lock factories the way saga steps use them.
+
+Threads take locks of distinct processes (`pm-lock-<auction>-<winner>`), so contention is low.
+Redis locks use fakeredis unless --redis-host is given, which shows client-side cost only -
+a real server adds a round trip per acquire and release.
+
+    python benchmarks/bench_locks.py [--locks 20000] [--threads 8] [--redis-host localhost]
+"""
+import argparse
+import threading
+import time
+
+from foundation.locks import LockFactory, StripedLockFactory
+
+from main.redis import RedisLock
+
+
+def run(lock_factory: LockFactory, locks: int, threads: int) -> float:
+    """Returns lock acquisitions per second."""
+    per_thread = locks // threads
+
+    def work(thread_number: int) -> None:
+        for number in range(per_thread):
+            with lock_factory(f"pm-lock-{thread_number}-{number}", 30):
+                pass
+
+    workers = [threading.Thread(target=work, args=(thread_number,)) for thread_number in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--locks", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--redis-host")
+    args = parser.parse_args()
+
+    if args.redis_host:
+        from redis import Redis
+
+        redis = Redis(host=args.redis_host)
+    else:
+        import fakeredis
+
+        redis = fakeredis.FakeStrictRedis()
+
+    factories = {
+        "redis": lambda name, timeout: RedisLock(redis, name, timeout, wait_timeout=5, auto_renew=True),
+        "memory": StripedLockFactory(wait_timeout=5),
+    }
+    for name, lock_factory in factories.items():
+        print(f"{name:<8}{run(lock_factory, args.locks, args.threads):>12,.0f} locks/s")
+
+
+if __name__ == "__main__":
+    main()
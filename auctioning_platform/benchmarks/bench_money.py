@@ -0,0 +1,88 @@
+"""Measures cost of Money in loading an auction with many bids and in bidding on it.
+
+Loading goes through SqlAlchemyAuctionsRepo.get on SQLite in memory, "rows to entity" isolates
+building the entity (Money per bid, sorting bids) from already fetched rows. Remaining lines
+show the parts of it that depend on Money only.
+
+    python benchmarks/bench_money.py [--bids 10000] [--repeat 20]
+"""
+import argparse
+from datetime import datetime, timedelta
+from decimal import Decimal
+import time
+from typing import Callable
+from unittest.mock import Mock
+import warnings
+
+from sqlalchemy.engine import create_engine
+
+from foundation.events import EventBus
+from foundation.value_objects.factories import get_dollars
+
+from auctions_infrastructure import auctions, bids
+from auctions_infrastructure.repositories import SqlAlchemyAuctionsRepo
+from db_infrastructure import metadata
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    """Returns the shortest of `repeat` runs, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bids", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore", "Dialect sqlite\\+pysqlite does \\*not\\* support Decimal")
+
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine, tables=[auctions, bids])
+    connection = engine.connect()
+    connection.execute(
+        auctions.insert(),
+        id=1,
+        title="Vintage mechanical watch",
+        starting_price=Decimal("1.00"),
+        current_price=Decimal("1.00"),
+        ends_at=datetime.utcnow() + timedelta(days=1),
+        ended=False,
+    )
+    connection.execute(
+        bids.insert(),
+        [
+            {"auction_id": 1, "bidder_id": number % 100, "amount": Decimal(number).scaleb(-2) + 2}
+            for number in range(args.bids)
+        ],
+    )
+    repo = SqlAlchemyAuctionsRepo(connection, Mock(spec_set=EventBus))
+    auction_row = connection.execute(auctions.select()).first()
+    bid_rows = connection.execute(bids.select()).fetchall()
+
+    load = best_of(args.repeat, lambda: repo.get(1))
+    to_entity = best_of(args.repeat, lambda: repo._row_to_entity(auction_row, bid_rows))
+    print(f"load auction with {args.bids:,} bids: {load:.2f}ms (rows to entity: {to_entity:.2f}ms)")
+
+    raw_amounts = [row.amount for row in bid_rows]
+    construct = best_of(args.repeat, lambda: [get_dollars(raw) for raw in raw_amounts])
+    print(f"Money from {args.bids:,} Decimals: {construct:.2f}ms")
+    auction = repo.get(1)
+    sort = best_of(args.repeat, lambda: sorted(auction.bids, key=lambda bid: bid.amount))
+    print(f"sort {args.bids:,} bids: {sort:.2f}ms")
+    amounts = [auction.current_price + get_dollars(number % 7 + 1) for number in range(args.bids)]
+
+    def bid() -> None:
+        for amount in amounts:
+            auction.place_bid(1, amount)
+            auction.clear_events()
+
+    print(f"place {args.bids:,} bids: {best_of(args.repeat, bid):.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compares aggregating bid amounts as Money per row and as MoneyVector.
+
+Bids are stored in SQLite in memory. "per row" fetches Decimals, creates Money for every bid and folds them
+with `+`, MoneyVector selects integer minor units and aggregates them in NumPy.
+
+    python benchmarks/bench_money_vector.py [--bids 1000000]
+"""
+import argparse
+from datetime import datetime, timedelta
+from decimal import Decimal
+import functools
+import operator
+import time
+import warnings
+
+from sqlalchemy import select
+from sqlalchemy.engine import create_engine
+
+from foundation.value_objects.currency import USD
+from foundation.value_objects.factories import get_dollars
+from foundation.value_objects.money_vector import MoneyVector
+
+from auctions_infrastructure import auctions, bids
+from db_infrastructure import metadata, minor_units
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bids", type=int, default=1_000_000)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore", r"Dialect sqlite\+pysqlite does \*not\* support Decimal")
+
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine, tables=[auctions, bids])
+    connection = engine.connect()
+    connection.execute(
+        auctions.insert(),
+        id=1,
+        title="Vintage mechanical watch",
+        starting_price=Decimal("1.00"),
+        current_price=Decimal("1.00"),
+        ends_at=datetime.utcnow() + timedelta(days=1),
+        ended=False,
+    )
+    for offset in range(0, args.bids, 100_000):
+        connection.execute(
+            bids.insert(),
+            [
+                {"auction_id": 1, "bidder_id": number % 1000, "amount": Decimal(number % 100_000).scaleb(-2) + 1}
+                for number in range(offset, min(offset + 100_000, args.bids))
+            ],
+        )
+
+    start = time.perf_counter()
+    amounts = [get_dollars(row.amount) for row in connection.execute(select([bids.c.amount]))]
+    fetched = time.perf_counter()
+    total, highest = functools.reduce(operator.add, amounts), max(amounts)
+    per_row = (fetched - start, time.perf_counter() - fetched)
+
+    start = time.perf_counter()
+    vector = MoneyVector.from_rows(USD, connection.execute(select([minor_units(bids.c.amount, USD)])))
+    fetched = time.perf_counter()
+    assert (vector.sum(), vector.max()) == (total, highest)
+    vector.mean(), vector.argmax(), vector[vector > get_dollars("500")].sum()
+    vectorized = (fetched - start, time.perf_counter() - fetched)
+
+    print(f"{args.bids:,} bids{'fetch':>12}{'aggregate':>12}")
+    for name, (fetch, aggregate) in [("per row", per_row), ("MoneyVector", vectorized)]:
+        print(f"{name:<14}{fetch * 1000:>10.1f}ms{aggregate * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Measures AuctionEnded handling latency while overbid notifications saturate workers.
+
+Events are posted through InjectorEventBus configured with the real CustomerRelationship, Payments
+and Processes modules, so jobs land in queues declared where handlers are bound.
+Handlers are simulated with `time.sleep`, so no DB or SMTP is needed.
+A producer posts BidderHasBeenOverbid faster than the worker can send emails and AuctionEnded
+every now and then. The worker dequeues the same way RQ Worker does - from the first non-empty
+queue in the given order.
+
+`single` sends everything to the default queue, as it was before lanes were introduced.
+Requires a running Redis.
+
+    REDIS_HOST=localhost python benchmarks/bench_priority_lanes.py [--seconds 5] [--handler-ms 5]
+"""
+import argparse
+from datetime import datetime
+import os
+import statistics
+import threading
+import time
+from typing import Any, Dict, List, Type
+
+from injector import Injector
+from redis import Redis
+from rq import Queue
+
+from foundation.events import ASYNC_HANDLERS_QUEUES, DEFAULT_QUEUE, Event, InjectorEventBus
+from foundation.value_objects.factories import get_dollars
+
+from auctions import AuctionEnded, BidderHasBeenOverbid
+from customer_relationship import CustomerRelationship
+from payments import Payments
+from processes import Processes
+
+
+def produce(bus: InjectorEventBus, seconds: float, overbids_per_second: int, auctions_ended_per_second: int) -> int:
+    price = get_dollars("10.00")
+    start = time.perf_counter()
+    posted = auctions_ended = 0
+    while True:
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return auctions_ended
+        if elapsed >= auctions_ended / auctions_ended_per_second:
+            bus.post(AuctionEnded(posted, 1, price, "Socks"))
+            auctions_ended += 1
+        bus.post(BidderHasBeenOverbid(posted, 2, price, "Socks"))
+        posted += 1
+        time.sleep(max(0.0, posted / overbids_per_second - (time.perf_counter() - start)))
+
+
+def work(queues: List[Queue], redis: Redis, stop: threading.Event, latencies: Dict[str, List[float]]) -> None:
+    while not stop.is_set():
+        result = Queue.dequeue_any(queues, None, connection=redis)
+        if result is None:
+            time.sleep(0.001)
+            continue
+        job, _queue = result
+        latency = (datetime.utcnow() - job.enqueued_at).total_seconds()
+        latencies.setdefault(job.description, []).append(latency)
+        job.perform()
+
+
+def run(name: str, use_lanes: bool, redis: Redis, args: argparse.Namespace) -> None:
+    queues = [Queue(f"bench-lanes-{queue_name}", connection=redis) for queue_name in ASYNC_HANDLERS_QUEUES]
+    by_name = dict(zip(ASYNC_HANDLERS_QUEUES, queues))
+    for queue in queues:
+        queue.empty()
+    latencies: Dict[str, List[float]] = {}
+
+    def run_async_handler(handler_cls: Type, event: Event, *, queue: str = DEFAULT_QUEUE) -> None:
+        target = by_name[queue if use_lanes else DEFAULT_QUEUE]
+        target.enqueue(time.sleep, args.handler_ms / 1000, description=handler_cls.__name__)
+
+    container = Injector([CustomerRelationship(), Payments(), Processes()], auto_bind=False)
+    bus = InjectorEventBus(container, run_async_handler)
+
+    stop = threading.Event()
+    worker = threading.Thread(target=work, args=(queues, redis, stop, latencies), daemon=True)
+    worker.start()
+    auctions_ended = produce(bus, args.seconds, args.overbids_per_second, args.auctions_ended_per_second)
+    stop.set()
+    worker.join()
+
+    # AuctionEnded that did not make it before the producer stopped are reported as not handled
+    auction_ended = [latency * 1000 for latency in latencies.get("PayingForWonItemHandler", [])]
+    half = len(auction_ended) // 2
+    backlog = sum(queue.count for queue in queues)
+    print(
+        f"{name:6} AuctionEnded handled={len(auction_ended)}/{auctions_ended} "
+        f"latency ms: p50={statistics.median(auction_ended):,.1f} max={max(auction_ended):,.1f} "
+        f"first half mean={statistics.mean(auction_ended[:half]):,.1f} "
+        f"second half mean={statistics.mean(auction_ended[half:]):,.1f} "
+        f"backlog left={backlog} jobs"
+    )
+    for queue in queues:
+        queue.empty()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--handler-ms", type=float, default=5)
+    parser.add_argument("--overbids-per-second", type=int, default=400)
+    parser.add_argument("--auctions-ended-per-second", type=int, default=5)
+    args: Any = parser.parse_args()
+
+    redis = Redis(host=os.environ.get("REDIS_HOST", "localhost"))
+    run("single", False, redis, args)
+    run("lanes", True, redis, args)
+
+
+if __name__ == "__main__":
+    main()
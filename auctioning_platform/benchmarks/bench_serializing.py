@@ -0,0 +1,107 @@
+"""Measures per-object cost of serializing saga data with foundation.serializing.
+
+"before" is the previous implementation, walking `dataclasses.fields` on every call, kept here for reference.
+
+    python benchmarks/bench_serializing.py [--iterations 100000]
+"""
+import argparse
+import dataclasses
+from datetime import datetime
+from enum import Enum
+import json
+import time
+from typing import Callable
+from uuid import uuid4
+
+from foundation import serializing
+from foundation.value_objects.factories import get_dollars
+
+from processes.paying_for_won_item import PayingForWonItemData
+from processes.paying_for_won_item.saga import State
+
+
+def _legacy_deserialize_dt(raw_dt: str) -> datetime:
+    try:
+        return datetime.strptime(raw_dt, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except ValueError:
+        return datetime.strptime(raw_dt, "%Y-%m-%dT%H:%M:%S.%f")
+
+
+LEGACY_DESERIALIZERS = {**serializing.deserializers, datetime: _legacy_deserialize_dt}
+LEGACY_SERIALIZERS = {**serializing.serializers, datetime: lambda dt: dt.strftime("%Y-%m-%dT%H:%M:%S.%f%z")}
+
+
+def legacy_from_json(json_repr: dict, dataclass: type) -> object:
+    data = {}
+    for field in dataclasses.fields(dataclass):
+        field_type, _ = serializing._extract_type_if_optional(field.type)
+        if field_type not in LEGACY_DESERIALIZERS:
+            if issubclass(field_type, Enum):
+                LEGACY_DESERIALIZERS[field_type] = field_type
+            else:
+                raise Exception(f"Type {field_type} not supported")
+        if json_repr[field.name]:
+            data[field.name] = LEGACY_DESERIALIZERS[field_type](json_repr[field.name])
+        else:
+            data[field.name] = None
+    return dataclass(**data)
+
+
+def legacy_to_json(dataclass_instance: object) -> str:
+    data = {}
+    for field in dataclasses.fields(type(dataclass_instance)):
+        field_type, _ = serializing._extract_type_if_optional(field.type)
+        if field_type not in LEGACY_SERIALIZERS:
+            if issubclass(field_type, Enum):
+                LEGACY_SERIALIZERS[field_type] = lambda field: field.value
+            else:
+                raise Exception(f"Type {field_type} not supported")
+        if getattr(dataclass_instance, field.name):
+            data[field.name] = LEGACY_SERIALIZERS[field_type](getattr(dataclass_instance, field.name))
+        else:
+            data[field.name] = None
+    return json.dumps(data)
+
+
+def measure(iterations: int, fn: Callable[[], object]) -> float:
+    """Returns microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    data = PayingForWonItemData(
+        uuid4(), State.PAYMENT_STARTED, datetime.now(), get_dollars("1250.99"), "Vintage mechanical watch", 1234, 5678
+    )
+    json_repr = json.loads(serializing.to_json(data))
+    assert legacy_from_json(json_repr, PayingForWonItemData) == serializing.from_json(json_repr, PayingForWonItemData)
+    assert legacy_to_json(data) == serializing.to_json(data)
+
+    print(f"{'':<14}{'before':>10}{'after':>10}")
+    for name, before, after in [
+        ("to_json", lambda: legacy_to_json(data), lambda: serializing.to_json(data)),
+        (
+            "from_json",
+            lambda: legacy_from_json(json_repr, PayingForWonItemData),
+            lambda: serializing.from_json(json_repr, PayingForWonItemData),
+        ),
+    ]:
+        before_us, after_us = measure(args.iterations, before), measure(args.iterations, after)
+        print(f"{name:<14}{before_us:>8.2f}us{after_us:>8.2f}us  ({before_us / after_us:.1f}x)")
+
+    instances = [data] * args.iterations
+    start = time.perf_counter()
+    reprs = [json.loads(serialized) for serialized in serializing.to_json_many(instances)]
+    for _ in serializing.from_json_iter(reprs, PayingForWonItemData):
+        pass
+    print(f"batch roundtrip: {(time.perf_counter() - start) / args.iterations * 1_000_000:.2f}us per object")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measures cold start of the application in fresh interpreters.
+
+Reports median time of importing `main`, of `bootstrap_app()` and of importing modules that are
+loaded only when a provider needs them, so processes not using them never pay for it.
+With --top, lists the slowest imports as well (from `python -X importtime`). With --budget, exits with
+an error if median of `import main` and `bootstrap_app()` together exceeds it - it took ~0.6s when
+measured on a developer machine, over 1s when everything was imported eagerly.
+Needs the same environment variables as the app (see example.env_file). Schema is not created on start,
+so the database does not need to exist.
+
+    CONFIG_PATH=example.env_file python benchmarks/bench_startup.py [--runs 10] [--top 15] [--budget 1.0]
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+STARTUP_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+app = main.bootstrap_app()
+bootstrapped = time.perf_counter()
+import faker, flask_security, requests, smtplib
+deferred = time.perf_counter()
+print(json.dumps({
+    "import main": imported - start,
+    "bootstrap_app()": bootstrapped - imported,
+    "deferred imports": deferred - bootstrapped,
+}))
+"""
+
+
+def run_once() -> Dict[str, float]:
+    output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], check=True, capture_output=True, text=True)
+    return json.loads(output.stdout)  # type: ignore
+
+
+def slowest_imports(top: int) -> List[str]:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"], check=True, capture_output=True, text=True
+    ).stderr
+    # `main` and what it imports directly, nested imports are included in their importers' times
+    pattern = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|( {1,3})(\S+)$")
+    imports = [(int(match[1]), match[3]) for match in map(pattern.match, stderr.splitlines()) if match]
+    return [f"{micros / 1000:8.1f}ms {name}" for micros, name in sorted(imports, reverse=True)[:top]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=0)
+    parser.add_argument("--budget", type=float, default=None, help="seconds for import main and bootstrap_app()")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    for phase in runs[0]:
+        print(f"{phase:<28}{statistics.median(run[phase] for run in runs) * 1000:>8.1f}ms")
+    if args.top:
+        print("slowest imports:")
+        print("\n".join(slowest_imports(args.top)))
+    if args.budget is not None:
+        startup = statistics.median(run["import main"] + run["bootstrap_app()"] for run in runs)
+        if startup > args.budget:
+            sys.exit(f"cold start took {startup:.3f}s, over the budget of {args.budget:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Measures requests/s and latency of GET /auctions/ at increasing numbers of concurrent clients.
+
+Every server runs in a subprocess: `threaded` is werkzeug's server with a thread per connection,
+`gevent` is gevent's WSGIServer with a greenlet per connection (needs `pip install gevent`). Both rely
+on RequestScope keeping request's instances in a context variable. Clients are asyncio connections
+in this process, one request per connection. Under gevent database drivers must cooperate too:
+SQLite and psycopg2 block the whole process unless patched (e.g. with psycogreen).
+Needs the same environment variables as the app (see example.env_file).
+
+    CONFIG_PATH=example.env_file python benchmarks/bench_web_concurrency.py \
+        [--servers threaded gevent] [--concurrency 10 100 1000] [--requests 2000]
+"""
+import argparse
+import asyncio
+import logging
+import socket
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+SERVERS = ("threaded", "gevent")
+
+
+def serve(server: str, port: int) -> None:
+    if server == "gevent":
+        from gevent import monkey
+
+        monkey.patch_all()
+
+    from sqlalchemy.engine import Engine
+
+    from main.migrate import create_db_schema
+    from web_app.app import create_app
+
+    app = create_app({"DEBUG": False})
+    create_db_schema(app.injector.get(Engine))
+
+    if server == "gevent":
+        from gevent.pywsgi import WSGIServer
+
+        WSGIServer(("127.0.0.1", port), app, log=None).serve_forever()
+    else:
+        from werkzeug.serving import make_server
+
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        make_server("127.0.0.1", port, app, threaded=True).serve_forever()
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Server did not start listening on {port}")
+
+
+async def fetch(port: int, latencies: List[float]) -> bool:
+    start = time.perf_counter()
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /auctions/ HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        writer.close()
+    except OSError:
+        return False
+    latencies.append(time.perf_counter() - start)
+    return status_line.split(b" ")[1:2] == [b"200"]
+
+
+async def load(port: int, concurrency: int, requests: int) -> Tuple[float, List[float], int]:
+    latencies: List[float] = []
+    remaining = iter(range(requests))
+    errors = 0
+
+    async def client() -> None:
+        nonlocal errors
+        for _ in remaining:
+            if not await fetch(port, latencies):
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - start, sorted(latencies), errors
+
+
+def run(server: str, port: int, concurrency_levels: List[int], requests: int) -> None:
+    process = subprocess.Popen([sys.executable, __file__, "--serve", server, "--port", str(port)])
+    try:
+        wait_for_port(port)
+        asyncio.run(load(port, 10, 100))  # warm up
+        for concurrency in concurrency_levels:
+            elapsed, latencies, errors = asyncio.run(load(port, concurrency, requests))
+            p50, p99 = (latencies[int(len(latencies) * q)] * 1000 if latencies else float("nan") for q in (0.5, 0.99))
+            print(
+                f"{server:<9}{concurrency:>6} clients {requests / elapsed:>9,.0f} req/s   "
+                f"p50 {p50:>8.1f}ms   p99 {p99:>8.1f}ms   errors {errors}"
+            )
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--servers", nargs="+", choices=SERVERS, default=list(SERVERS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[10, 100, 1000])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=5087)
+    parser.add_argument("--serve", choices=SERVERS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    for server in args.servers:
+        run(server, args.port, args.concurrency, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Measures jobs/s of a worker running no-op async handlers.
+
+`cold` bootstraps the application for every job, as async_handlers_batch_task did before,
+`warm` reuses application context bootstrapped once per process, as `python -m main.worker` does.
+Both run jobs in the worker process (RQ's SimpleWorker) against fakeredis unless --redis-host is given,
+so the difference is the bootstrap alone - a forking worker pays for a fork per job on top of it.
+Needs the same environment variables as the app (see example.env_file).
+
+    CONFIG_PATH=example.env_file python benchmarks/bench_worker_jobs.py [--jobs 2000] [--cold-jobs 50]
+"""
+import argparse
+import time
+from typing import Any
+
+from redis import Redis
+from rq import Queue, SimpleWorker
+
+from main import async_handler_task
+from main.async_handler_task import app_context, async_handlers_batch_task, encode_call
+
+
+class NoopHandler:
+    def __call__(self, *args: Any) -> None:
+        pass
+
+
+class ColdWorker(SimpleWorker):
+    def execute_job(self, job: Any, queue: Queue) -> None:
+        async_handler_task._app_context = None
+        super().execute_job(job, queue)
+
+
+def run(name: str, worker_cls: type, jobs: int, redis: Redis) -> None:
+    queue = Queue("bench-worker-jobs", connection=redis)
+    queue.empty()
+    for _ in range(jobs):
+        queue.enqueue(async_handlers_batch_task, [encode_call((NoopHandler, (), {}))])
+
+    start = time.perf_counter()
+    worker_cls([queue], connection=redis).work(burst=True, logging_level="WARNING")
+    elapsed = time.perf_counter() - start
+    print(f"{name:<6}{jobs / elapsed:>10,.1f} jobs/s ({elapsed / jobs * 1000:.2f}ms per job)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--cold-jobs", type=int, default=50)
+    parser.add_argument("--redis-host")
+    args = parser.parse_args()
+
+    if args.redis_host:
+        redis = Redis(host=args.redis_host)
+    else:
+        import fakeredis
+
+        redis = fakeredis.FakeStrictRedis()
+
+    app_context()  # schema creation and imports are not counted in either case
+    run("cold", ColdWorker, args.cold_jobs, redis)
+    app_context()
+    run("warm", SimpleWorker, args.jobs, redis)
+
+
+if __name__ == "__main__":
+    main()
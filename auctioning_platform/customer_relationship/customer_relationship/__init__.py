@@ -1,10 +1,11 @@
 import injector
 from sqlalchemy.engine import Connection
 
-from foundation.events import AsyncEventHandlerProvider, AsyncHandler
+from foundation.events import LOW_PRIORITY_QUEUE, AsyncEventHandlerProvider, AsyncHandler
 
 from auctions import BidderHasBeenOverbid, WinningBidPlaced
 from customer_relationship.config import CustomerRelationshipConfig
+from customer_relationship.email_sender import EmailSender
 from customer_relationship.facade import CustomerRelationshipFacade
 from customer_relationship.models import customers
 
@@ -20,13 +21,26 @@ __all__ = [
 
 
 class CustomerRelationship(injector.Module):
+    @injector.singleton
     @injector.provider
-    def facade(self, config: CustomerRelationshipConfig, connection: Connection) -> CustomerRelationshipFacade:
-        return CustomerRelationshipFacade(config, connection)
+    def email_sender(self, config: CustomerRelationshipConfig) -> EmailSender:
+        return EmailSender(config)
+
+    @injector.provider
+    def facade(
+        self, config: CustomerRelationshipConfig, connection: Connection, sender: EmailSender
+    ) -> CustomerRelationshipFacade:
+        return CustomerRelationshipFacade(config, connection, sender)
 
     def configure(self, binder: injector.Binder) -> None:
-        binder.multibind(AsyncHandler[BidderHasBeenOverbid], to=AsyncEventHandlerProvider(BidderHasBeenOverbidHandler))
-        binder.multibind(AsyncHandler[WinningBidPlaced], to=AsyncEventHandlerProvider(WinningBidPlacedHandler))
+        binder.multibind(
+            AsyncHandler[BidderHasBeenOverbid],
+            to=AsyncEventHandlerProvider(BidderHasBeenOverbidHandler, queue=LOW_PRIORITY_QUEUE),
+        )
+        binder.multibind(
+            AsyncHandler[WinningBidPlaced],
+            to=AsyncEventHandlerProvider(WinningBidPlacedHandler, queue=LOW_PRIORITY_QUEUE),
+        )
 
 
 class BidderHasBeenOverbidHandler:
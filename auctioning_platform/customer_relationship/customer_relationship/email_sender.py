@@ -1,7 +1,3 @@
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-import smtplib
-
 from customer_relationship.config import CustomerRelationshipConfig
 from customer_relationship.emails import Email
 
@@ -11,6 +7,11 @@ class EmailSender:
         self._config = config
 
     def send(self, recipient: str, email: Email) -> None:
+        # imported on first use - only workers sending emails need them
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+        import smtplib
+
         with smtplib.SMTP(self._config.email_host, self._config.email_port) as server:
             server.login(self._config.email_username, self._config.email_password)
             msg = MIMEMultipart("alternative")
@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from sqlalchemy.engine import Connection
 
@@ -11,8 +11,10 @@ from customer_relationship.models import customers
 
 
 class CustomerRelationshipFacade:
-    def __init__(self, config: CustomerRelationshipConfig, connection: Connection) -> None:
-        self._sender = EmailSender(config)
+    def __init__(
+        self, config: CustomerRelationshipConfig, connection: Connection, sender: Optional[EmailSender] = None
+    ) -> None:
+        self._sender = sender or EmailSender(config)
         self._connection = connection
 
     def create_customer(self, customer_id: int, email: str) -> None:
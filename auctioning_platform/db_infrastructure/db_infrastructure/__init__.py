@@ -1,11 +1,14 @@
-from typing import Any, Optional
+from typing import Any, Optional, Type
 import uuid
 
-from sqlalchemy import MetaData
+from sqlalchemy import BigInteger, MetaData, cast, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.sql import ColumnElement
 from sqlalchemy.types import CHAR, TypeDecorator
 
+from foundation.value_objects import Currency
+
 metadata = MetaData()
 Base = declarative_base(metadata=metadata)
 
@@ -46,3 +49,8 @@ class GUID(TypeDecorator):
             if not isinstance(value, uuid.UUID):
                 value = uuid.UUID(value)
             return value  # type: ignore
+
+
+def minor_units(column: ColumnElement, currency: Type[Currency]) -> ColumnElement:
+    """Selects decimal money column as integer minor units of the currency, e.g. to build MoneyVector."""
+    return cast(func.round(column * 10**currency.decimal_precision), BigInteger)
@@ -0,0 +1,71 @@
+"""Side effects which must only happen once the connection's transaction has been committed.
+
+E.g. telling other processes about a change - if they were told before the commit, they could read data from
+before it, and if the transaction rolled back, about a change which never happened.
+
+SQLAlchemy's commit event fires before the database commits, so items added within a transaction are only
+set aside by it and flushed when the request scoped buffer closes. They are dropped if the commit fails
+or the transaction is rolled back, and so are items of a transaction still open at close. Outside of
+a transaction statements are committed as they are executed, so items added there are flushed as well.
+"""
+import abc
+from typing import Generic, List, TypeVar
+
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy.engine import Connection, ExceptionContext
+
+__all__ = ["AfterCommit"]
+
+T = TypeVar("T")
+
+
+class AfterCommit(Generic[T], abc.ABC):
+    """Request scoped buffer of items, passed to `_flush` on close if their transactions committed."""
+
+    def __init__(self, connection: Connection) -> None:
+        self._connection = connection
+        self._pending: List[T] = []  # of the current transaction
+        self._committing: List[T] = []  # commit started, not failed so far
+        self._committed: List[T] = []
+        sqlalchemy_event.listen(connection, "begin", self._on_begin)
+        sqlalchemy_event.listen(connection, "commit", self._on_commit)
+        sqlalchemy_event.listen(connection, "rollback", self._on_rollback)
+        sqlalchemy_event.listen(connection, "handle_error", self._on_error)
+
+    def add(self, item: T) -> None:
+        self._pending.append(item)
+
+    def close(self) -> None:
+        sqlalchemy_event.remove(self._connection, "begin", self._on_begin)
+        sqlalchemy_event.remove(self._connection, "commit", self._on_commit)
+        sqlalchemy_event.remove(self._connection, "rollback", self._on_rollback)
+        sqlalchemy_event.remove(self._connection, "handle_error", self._on_error)
+        items = self._committed + self._committing
+        if not self._connection.closed and not self._connection.in_transaction():
+            items += self._pending
+        self._pending, self._committing, self._committed = [], [], []
+        if items:
+            self._flush(items)
+
+    @abc.abstractmethod
+    def _flush(self, items: List[T]) -> None:
+        pass
+
+    def _on_begin(self, _conn: Connection) -> None:
+        # the previous commit, if any, succeeded
+        self._committed += self._committing
+        self._committing = []
+
+    def _on_commit(self, _conn: Connection) -> None:
+        self._committed += self._committing  # as with begin, e.g. when committing statement by statement
+        self._committing = self._pending
+        self._pending = []
+
+    def _on_rollback(self, _conn: Connection) -> None:
+        # a rollback right after the commit event means the commit failed
+        self._pending = []
+        self._committing = []
+
+    def _on_error(self, context: ExceptionContext) -> None:
+        if context.statement is None:  # failed commit, not a failed statement
+            self._committing = []
@@ -0,0 +1,124 @@
+"""Executing read-only queries from asyncio code, for the async read path of the web app.
+
+SQLAlchemy 1.3 has no asyncio support, so queries are built with SQLAlchemy Core as usual and only
+executed differently. AsyncpgDatabase compiles them for PostgreSQL and runs them with asyncpg on its own
+pool. ThreadPoolDatabase runs them on engine's connections in a thread pool - for drivers without asyncio
+support, like SQLite in tests and development.
+
+Rows support access by column name only. asyncpg rows skip SQLAlchemy's result processing, so columns
+of TypeDecorator types (e.g. GUID) come as the driver returns them.
+"""
+import abc
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, List, Mapping, NewType, Optional, Tuple, TypeVar
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import ClauseElement
+
+from db_infrastructure.pool import PoolConfig
+
+__all__ = ["AsyncDatabase", "AsyncReadDatabase", "AsyncpgDatabase", "ThreadPoolDatabase", "create_async_database"]
+
+T = TypeVar("T")
+Row = Mapping[str, Any]
+
+
+class AsyncDatabase(abc.ABC):
+    @abc.abstractmethod
+    async def fetch_all(self, query: ClauseElement) -> List[Row]:
+        pass
+
+    @abc.abstractmethod
+    async def fetch_one(self, query: ClauseElement) -> Optional[Row]:
+        pass
+
+    @abc.abstractmethod
+    async def close(self) -> None:
+        pass
+
+
+# the replica's database, or the primary's when there is no replica (see db_infrastructure.replica)
+AsyncReadDatabase = NewType("AsyncReadDatabase", AsyncDatabase)
+
+
+class ThreadPoolDatabase(AsyncDatabase):
+    def __init__(self, engine: Engine, max_workers: int) -> None:
+        self._engine = engine
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="async-db")
+
+    async def fetch_all(self, query: ClauseElement) -> List[Row]:
+        return await self._run(lambda conn: conn.execute(query).fetchall())
+
+    async def fetch_one(self, query: ClauseElement) -> Optional[Row]:
+        return await self._run(lambda conn: conn.execute(query).first())
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _run(self, fetch: Callable[[Connection], T]) -> Awaitable[T]:
+        def run() -> T:
+            with self._engine.connect() as conn:
+                return fetch(conn)
+
+        return asyncio.get_running_loop().run_in_executor(self._executor, run)
+
+
+class AsyncpgDatabase(AsyncDatabase):
+    """Runs queries with asyncpg. The pool is created on first use, in the event loop that uses it.
+
+    asyncpg prepares statements, which PgBouncer in transaction pooling mode does not support,
+    so the statement cache is turned off behind PgBouncer.
+    """
+
+    def __init__(self, dsn: str, config: PoolConfig) -> None:
+        scheme, _, rest = dsn.partition("://")
+        self._dsn = f"{scheme.split('+')[0]}://{rest}"  # drops SQLAlchemy's driver, e.g. postgresql+psycopg2
+        self._config = config
+        self._dialect = postgresql.dialect(paramstyle="pyformat")
+        self._pool: Optional[asyncio.Future] = None
+
+    async def fetch_all(self, query: ClauseElement) -> List[Row]:
+        sql, args = self._compile(query)
+        async with (await self._get_pool()).acquire() as conn:
+            return await conn.fetch(sql, *args)  # type: ignore
+
+    async def fetch_one(self, query: ClauseElement) -> Optional[Row]:
+        sql, args = self._compile(query)
+        async with (await self._get_pool()).acquire() as conn:
+            return await conn.fetchrow(sql, *args)  # type: ignore
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await (await self._pool).close()
+            self._pool = None
+
+    def _get_pool(self) -> Awaitable[Any]:
+        if self._pool is None:
+            import asyncpg
+
+            self._pool = asyncio.ensure_future(
+                asyncpg.create_pool(
+                    self._dsn,
+                    min_size=1,
+                    max_size=self._config.size + self._config.max_overflow,
+                    statement_cache_size=0 if self._config.pgbouncer else 100,
+                )
+            )
+        return self._pool
+
+    def _compile(self, query: ClauseElement) -> Tuple[str, List[Any]]:
+        compiled = query.compile(dialect=self._dialect)
+        params = sorted(compiled.params.items())
+        placeholders = {name: f"${position}" for position, (name, _value) in enumerate(params, start=1)}
+        processors = compiled._bind_processors
+        args = [processors[name](value) if name in processors else value for name, value in params]
+        return compiled.string % placeholders, args
+
+
+def create_async_database(dsn: str, engine: Engine, config: PoolConfig) -> AsyncDatabase:
+    """asyncpg for PostgreSQL, otherwise `engine` in a thread pool as big as the engine's pool."""
+    if engine.dialect.name == "postgresql":
+        return AsyncpgDatabase(dsn, config)
+    return ThreadPoolDatabase(engine, config.size + config.max_overflow)
@@ -0,0 +1,201 @@
+from datetime import datetime, timedelta
+import logging
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+import injector
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, LargeBinary, SmallInteger, String, Table, select
+from sqlalchemy.engine import Connection
+
+from foundation import event_codec
+from foundation.events import Event
+
+from db_infrastructure import metadata
+
+logger = logging.getLogger(__name__)
+
+
+events = Table(
+    "events",
+    metadata,
+    Column("sequence", BigInteger().with_variant(Integer, "sqlite"), primary_key=True),
+    Column("aggregate_type", String(64), nullable=False),
+    Column("aggregate_id", String(64), nullable=False),
+    Column("type_id", SmallInteger, nullable=False),
+    Column("payload", LargeBinary, nullable=False),
+    Column("recorded_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+Index("ix_events_aggregate", events.c.aggregate_type, events.c.aggregate_id, events.c.sequence)
+
+event_store_checkpoints = Table(
+    "event_store_checkpoints",
+    metadata,
+    Column("name", String(128), primary_key=True),
+    Column("position", BigInteger, nullable=False),
+)
+
+
+class StoredEvent(NamedTuple):
+    sequence: int
+    event: Event
+    recorded_at: datetime
+
+
+class EventStore:
+    """Append-only store of domain events.
+
+    Every event gets a global sequence number. Events are also indexed by aggregate they concern,
+    declared by event classes with AGGREGATE_TYPE and AGGREGATE_ID_FIELD attributes, e.g. AuctionEnded
+    of auction 1 has aggregate type "auction" and aggregate id "1".
+    Events are persisted using foundation.event_codec, so only registered ones can be appended.
+
+    Reads are done in batches, using keyset pagination over the sequence, so replays
+    do not hold long-running transactions and never load the whole store into memory.
+    Sequence numbers are assigned on insert, so a transaction committed later may still add events
+    with numbers lower than the ones already read. Reads therefore stop before the first gap
+    in the sequence, until the gap is filled or events after it are older than `gap_timeout`
+    - then the gap is taken for a rolled back transaction. The timeout has to exceed the longest
+    transaction appending events, plus clock skew between application servers.
+    """
+
+    def __init__(self, connection: Connection, gap_timeout: timedelta = timedelta(seconds=30)) -> None:
+        self._connection = connection
+        self._gap_timeout = gap_timeout
+
+    def append(self, new_events: Iterable[Event]) -> None:
+        now = datetime.utcnow()
+        rows = []
+        for event in new_events:
+            aggregate_type, aggregate_id = _aggregate_of(event)
+            rows.append(
+                {
+                    "aggregate_type": aggregate_type,
+                    "aggregate_id": aggregate_id,
+                    "type_id": event_codec.type_id(type(event)),
+                    "payload": event_codec.encode(event),
+                    "recorded_at": now,
+                }
+            )
+        if rows:
+            self._connection.execute(events.insert(), rows)
+
+    def stream(
+        self, after: int = 0, batch_size: int = 1000, event_types: Optional[Sequence[Type[Event]]] = None
+    ) -> Iterator[StoredEvent]:
+        for batch in self.batches(after, batch_size, event_types):
+            yield from batch
+
+    def batches(
+        self, after: int = 0, batch_size: int = 1000, event_types: Optional[Sequence[Type[Event]]] = None
+    ) -> Iterator[List[StoredEvent]]:
+        """Yields events with sequence greater than `after`, `batch_size` at once, in order they were appended."""
+        position = after
+        while True:
+            batch, read_up_to = self._read_batch(position, batch_size, event_types)
+            if read_up_to == position:
+                return
+            if batch:
+                yield batch
+            position = read_up_to
+
+    def for_aggregate(self, aggregate_type: str, aggregate_id: object) -> List[StoredEvent]:
+        query = (
+            select([events.c.sequence, events.c.payload, events.c.recorded_at])
+            .where((events.c.aggregate_type == aggregate_type) & (events.c.aggregate_id == str(aggregate_id)))
+            .order_by(events.c.sequence)
+        )
+        return [
+            StoredEvent(row.sequence, event_codec.decode(row.payload), row.recorded_at)
+            for row in self._connection.execute(query)
+        ]
+
+    def replay(
+        self,
+        checkpoint: str,
+        handler: Callable[[Event], None],
+        batch_size: int = 1000,
+        event_types: Optional[Sequence[Type[Event]]] = None,
+    ) -> int:
+        """Passes events stored after the `checkpoint` through handler, e.g. to build a new projection.
+
+        Position is saved after every batch, in a transaction together with whatever handler did,
+        so an interrupted replay resumes from the last completed batch. Returns number of replayed events.
+        """
+        replayed = 0
+        position = self.position(checkpoint)
+        while True:
+            with self._connection.begin():
+                batch, read_up_to = self._read_batch(position, batch_size, event_types)
+                if read_up_to == position:
+                    return replayed
+                for stored_event in batch:
+                    handler(stored_event.event)
+                position = read_up_to
+                self._save_position(checkpoint, position)
+            replayed += len(batch)
+
+    def _read_batch(
+        self, after: int, batch_size: int, event_types: Optional[Sequence[Type[Event]]]
+    ) -> Tuple[List[StoredEvent], int]:
+        """Reads events of given types among next `batch_size` ones and returns them with the position read up to."""
+        read_up_to = self._safe_position(after, batch_size)
+        query = select([events.c.sequence, events.c.payload, events.c.recorded_at]).where(
+            (events.c.sequence > after) & (events.c.sequence <= read_up_to)
+        )
+        if event_types is not None:
+            query = query.where(events.c.type_id.in_([event_codec.type_id(event_type) for event_type in event_types]))
+        rows = self._connection.execute(query.order_by(events.c.sequence)).fetchall()
+        return [StoredEvent(row.sequence, event_codec.decode(row.payload), row.recorded_at) for row in rows], read_up_to
+
+    def _safe_position(self, after: int, batch_size: int) -> int:
+        """Sequence of the last of next `batch_size` events which no transaction in progress can precede."""
+        query = (
+            select([events.c.sequence, events.c.recorded_at])
+            .where(events.c.sequence > after)
+            .order_by(events.c.sequence)
+            .limit(batch_size)
+        )
+        settled_before = datetime.utcnow() - self._gap_timeout
+        position = after
+        for row in self._connection.execute(query):
+            if row.sequence != position + 1 and row.recorded_at > settled_before:
+                break
+            position = row.sequence
+        return position
+
+    def position(self, checkpoint: str) -> int:
+        query = select([event_store_checkpoints.c.position]).where(event_store_checkpoints.c.name == checkpoint)
+        return self._connection.execute(query).scalar() or 0
+
+    def _save_position(self, checkpoint: str, position: int) -> None:
+        result = self._connection.execute(
+            event_store_checkpoints.update(values={"position": position}).where(
+                event_store_checkpoints.c.name == checkpoint
+            )
+        )
+        if result.rowcount != 1:
+            self._connection.execute(event_store_checkpoints.insert(values={"name": checkpoint, "position": position}))
+
+
+def _aggregate_of(event: Event) -> Tuple[str, str]:
+    event_cls = type(event)
+    try:
+        return event_cls.AGGREGATE_TYPE, str(getattr(event, event_cls.AGGREGATE_ID_FIELD))  # type: ignore
+    except AttributeError:
+        raise TypeError(f"{event_cls.__qualname__} does not declare AGGREGATE_TYPE and AGGREGATE_ID_FIELD")
+
+
+class StoreEventHandler:
+    """Appends every registered event posted to the bus, in the transaction that produced it.
+
+    Meant to be bound as Handler[Event], which makes it receive events of all types.
+    """
+
+    @injector.inject
+    def __init__(self, event_store: EventStore) -> None:
+        self._event_store = event_store
+
+    def __call__(self, event: Event) -> None:
+        if not event_codec.is_registered(type(event)):
+            logger.debug("Not storing %s - it is not registered in event_codec", type(event).__name__)
+            return
+        self._event_store.append([event])
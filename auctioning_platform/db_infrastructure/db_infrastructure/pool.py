@@ -0,0 +1,112 @@
+"""Engine creation with configurable connection pool and pool instrumentation.
+
+Engines of servers that support it use READ COMMITTED isolation. Use cases retrying a lost race
+within the caller's transaction (e.g. PlacingBid) rely on it - under REPEATABLE READ or SERIALIZABLE
+a retry would read the same snapshot again. SQLite serializes writers, so it needs no setting.
+"""
+from dataclasses import dataclass
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Connection, Engine, create_engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import NullPool, QueuePool
+
+from foundation.metrics import Metrics
+
+__all__ = ["PoolConfig", "create_pooled_engine", "instrument_pool", "checkout"]
+
+POOLS = ("default", "queue", "null")
+ISOLATION_LEVEL = "READ COMMITTED"
+READ_COMMITTED_BACKENDS = ("postgresql", "mysql")
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection pool settings of a single process.
+
+    `pool` is "queue" (QueuePool sized with `size`, `max_overflow` and `timeout`), "null" (NullPool,
+    a new DBAPI connection for every checkout) or "default" - whatever the dialect picks, e.g. NullPool
+    for SQLite files. Sizes apply to the queue pool only.
+
+    `pgbouncer` is meant for DSNs pointing at PgBouncer in transaction pooling mode. PgBouncer does
+    the pooling then, so NullPool is used and pre-ping is skipped, and the connection must not rely
+    on any server-side state surviving the transaction. psycopg2 creates no server-side prepared
+    statements, so nothing else has to be turned off for it.
+    """
+
+    pool: str = "default"
+    size: int = 5
+    max_overflow: int = 10
+    timeout: float = 30.0
+    recycle: int = -1
+    pre_ping: bool = False
+    pgbouncer: bool = False
+
+    def __post_init__(self) -> None:
+        if self.pool not in POOLS:
+            raise ValueError(f"Unknown pool: {self.pool}, expected one of {', '.join(POOLS)}")
+
+    def engine_kwargs(self) -> Dict[str, Any]:
+        if self.pgbouncer or self.pool == "null":
+            return {"poolclass": NullPool, "pool_recycle": self.recycle, "pool_pre_ping": False}
+
+        kwargs: Dict[str, Any] = {"pool_recycle": self.recycle, "pool_pre_ping": self.pre_ping}
+        if self.pool == "queue":
+            kwargs.update(
+                poolclass=QueuePool, pool_size=self.size, max_overflow=self.max_overflow, pool_timeout=self.timeout
+            )
+        return kwargs
+
+
+def create_pooled_engine(
+    dsn: str, config: PoolConfig, metrics: Optional[Metrics] = None, name: str = "primary"
+) -> Engine:
+    kwargs = config.engine_kwargs()
+    if make_url(dsn).get_backend_name() in READ_COMMITTED_BACKENDS:
+        kwargs["isolation_level"] = ISOLATION_LEVEL
+    engine = create_engine(dsn, **kwargs)
+    if metrics is not None:
+        instrument_pool(engine, metrics, name)
+    return engine
+
+
+def instrument_pool(engine: Engine, metrics: Metrics, name: str = "primary") -> None:
+    """Counts pool's checkouts, checkins, new DBAPI connections and connections opened above pool's size.
+
+    Connections checked out at the moment are `db_pool_checkouts_total - db_pool_checkins_total`,
+    which adds up correctly across processes. Samples are labelled with engine's `name`.
+    """
+    pool = engine.pool
+    labels = {"engine": name}
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(*_args: Any) -> None:
+        metrics.inc("db_pool_checkouts_total", labels)
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(*_args: Any) -> None:
+        metrics.inc("db_pool_checkins_total", labels)
+
+    @event.listens_for(pool, "connect")
+    def on_connect(*_args: Any) -> None:
+        metrics.inc("db_pool_connections_total", labels)
+        # QueuePool counts the new connection in before opening it, so positive overflow means it is above size
+        if isinstance(pool, QueuePool) and pool.overflow() > 0:
+            metrics.inc("db_pool_overflows_total", labels)
+
+
+def checkout(engine: Engine, metrics: Optional[Metrics] = None, name: str = "primary") -> Connection:
+    """Connects to the database, recording how long it took to get a connection from the pool."""
+    if metrics is None:
+        return engine.connect()
+
+    start = time.perf_counter()
+    try:
+        connection = engine.connect()
+    except exc.TimeoutError:
+        metrics.inc("db_pool_timeouts_total", {"engine": name})
+        raise
+    metrics.observe("db_pool_wait_seconds", {"engine": name}, time.perf_counter() - start)
+    return connection
@@ -0,0 +1,56 @@
+"""Routing of read-only queries to a replica.
+
+Query objects and read models depend on ReadConnection instead of Connection. It is bound to a connection
+of the replica's engine, unless current request's ReadPreference asks for the primary - e.g. because
+the user wrote something recently and the replica may not have caught up yet. Without a replica,
+ReadConnection is simply the request's Connection.
+"""
+import abc
+from typing import Hashable, NewType, Optional
+
+from sqlalchemy.engine import Connection, Engine
+
+__all__ = ["ReadConnection", "ReplicaEngine", "ReadPreference", "RecentWrites"]
+
+ReadConnection = NewType("ReadConnection", Connection)
+ReplicaEngine = NewType("ReplicaEngine", Engine)
+
+
+class RecentWrites(abc.ABC):
+    """Remembers sessions that wrote within the last few seconds - longer than the replica lags behind."""
+
+    @abc.abstractmethod
+    def mark(self, session: Hashable) -> None:
+        pass
+
+    @abc.abstractmethod
+    def wrote_recently(self, session: Hashable) -> bool:
+        pass
+
+
+class ReadPreference:
+    """Request scoped switch between the primary and the replica.
+
+    Reads go to the primary unless `use_replica` is set, so processes that do not know whom they work for
+    (e.g. workers handling events just written) never read stale data. Web app sets it for safe requests
+    and identifies the `session`, so a session which has written recently keeps reading from the primary.
+    `recent_writes` is None when there is no replica.
+    """
+
+    def __init__(self, recent_writes: Optional[RecentWrites]) -> None:
+        self._recent_writes = recent_writes
+        self.use_replica = False
+        self.session: Optional[Hashable] = None
+
+    @property
+    def replica_allowed(self) -> bool:
+        if self._recent_writes is None or not self.use_replica:
+            return False
+        return self.session is None or not self._recent_writes.wrote_recently(self.session)
+
+    def wrote(self) -> None:
+        if self._recent_writes is not None and self.session is not None:
+            self._recent_writes.mark(self.session)
+
+    def close(self) -> None:  # called when RequestScope exits
+        pass
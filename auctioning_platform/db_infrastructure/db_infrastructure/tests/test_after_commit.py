@@ -0,0 +1,88 @@
+from typing import Iterator, List
+
+import pytest
+from sqlalchemy import create_engine, event as sqlalchemy_event, exc
+from sqlalchemy.engine import Connection
+
+from db_infrastructure.after_commit import AfterCommit
+
+
+class Collected(AfterCommit[str]):
+    def __init__(self, connection: Connection) -> None:
+        super().__init__(connection)
+        self.flushed: List[str] = []
+
+    def _flush(self, items: List[str]) -> None:
+        self.flushed += items
+
+
+@pytest.fixture()
+def connection() -> Iterator[Connection]:
+    engine = create_engine("sqlite://")
+
+    @sqlalchemy_event.listens_for(engine, "connect")
+    def enable_foreign_keys(dbapi_connection, _record) -> None:  # type: ignore
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    connection = engine.connect()
+    connection.execute("CREATE TABLE parent (id INTEGER PRIMARY KEY)")
+    connection.execute("CREATE TABLE child (parent_id INTEGER REFERENCES parent(id) DEFERRABLE INITIALLY DEFERRED)")
+    yield connection
+    connection.close()
+
+
+def test_flushes_items_of_committed_transactions_on_close(connection: Connection) -> None:
+    collected = Collected(connection)
+    with connection.begin():
+        collected.add("first")
+    with connection.begin():
+        collected.add("second")
+
+    assert collected.flushed == []
+    collected.close()
+    assert collected.flushed == ["first", "second"]
+
+
+def test_drops_items_of_rolled_back_transaction(connection: Connection) -> None:
+    collected = Collected(connection)
+    with connection.begin():
+        collected.add("committed")
+    transaction = connection.begin()
+    collected.add("rolled back")
+    transaction.rollback()
+
+    collected.close()
+
+    assert collected.flushed == ["committed"]
+
+
+def test_drops_items_of_transaction_left_open(connection: Connection) -> None:
+    collected = Collected(connection)
+    connection.begin()
+    collected.add("never committed")
+
+    collected.close()
+
+    assert collected.flushed == []
+
+
+def test_drops_items_of_failed_commit(connection: Connection) -> None:
+    collected = Collected(connection)
+    with pytest.raises(exc.IntegrityError):
+        with connection.begin():
+            connection.execute("INSERT INTO child VALUES (1)")  # violates the deferred constraint on commit
+            collected.add("failed")
+
+    collected.close()
+
+    assert collected.flushed == []
+
+
+def test_flushes_items_added_outside_of_transaction(connection: Connection) -> None:
+    collected = Collected(connection)
+    connection.execute("INSERT INTO parent VALUES (1)")
+    collected.add("autocommitted")
+
+    collected.close()
+
+    assert collected.flushed == ["autocommitted"]
@@ -0,0 +1,190 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+from sqlalchemy.engine import Connection, Engine
+
+from foundation import event_codec
+from foundation.events import Event
+
+from db_infrastructure import metadata
+from db_infrastructure.event_store import EventStore, StoreEventHandler, event_store_checkpoints, events
+
+
+@event_codec.register(type_id=2001)
+@dataclass(frozen=True)
+class ItemListed(Event):
+    AGGREGATE_TYPE = "item"
+    AGGREGATE_ID_FIELD = "item_id"
+
+    title: str  # aggregate is not identified by the first field
+    item_id: int
+
+
+@event_codec.register(type_id=2002)
+@dataclass(frozen=True)
+class ItemSold(Event):
+    AGGREGATE_TYPE = "item"
+    AGGREGATE_ID_FIELD = "item_id"
+
+    item_id: int
+
+
+@dataclass(frozen=True)
+class NotRegistered(Event):
+    item_id: int
+
+
+@event_codec.register(type_id=2003)
+@dataclass(frozen=True)
+class WithoutAggregate(Event):
+    item_id: int
+
+
+@pytest.fixture(scope="session")
+def sqlalchemy_connect_url() -> str:
+    return "sqlite:///:memory:"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_teardown_tables(engine: Engine) -> None:
+    metadata.create_all(engine)
+
+
+@pytest.fixture(autouse=True)
+def clear_store(connection: Connection) -> None:
+    connection.execute(events.delete())
+    connection.execute(event_store_checkpoints.delete())
+
+
+@pytest.fixture()
+def store(connection: Connection) -> EventStore:
+    return EventStore(connection)
+
+
+def test_streams_appended_events_in_order(store: EventStore) -> None:
+    store.append([ItemListed("Socks", 1), ItemListed("Hat", 2)])
+    store.append([ItemSold(1)])
+
+    stored = list(store.stream())
+
+    assert [stored_event.event for stored_event in stored] == [
+        ItemListed("Socks", 1),
+        ItemListed("Hat", 2),
+        ItemSold(1),
+    ]
+    assert [stored_event.sequence for stored_event in stored] == sorted(
+        {stored_event.sequence for stored_event in stored}
+    )
+
+
+def test_reads_in_batches_after_given_position(store: EventStore) -> None:
+    store.append([ItemSold(item_id) for item_id in range(5)])
+    first = next(store.stream())
+
+    batches = list(store.batches(after=first.sequence, batch_size=2))
+
+    assert [[stored_event.event.item_id for stored_event in batch] for batch in batches] == [[1, 2], [3, 4]]
+
+
+def test_filters_by_event_types(store: EventStore) -> None:
+    store.append([ItemListed("Socks", 1), ItemSold(1), ItemListed("Hat", 2)])
+
+    assert [stored_event.event for stored_event in store.stream(batch_size=1, event_types=[ItemSold])] == [ItemSold(1)]
+
+
+def test_returns_events_of_single_aggregate(store: EventStore) -> None:
+    store.append([ItemListed("Socks", 1), ItemListed("Hat", 2), ItemSold(1)])
+
+    stored = store.for_aggregate("item", 1)
+
+    assert [stored_event.event for stored_event in stored] == [ItemListed("Socks", 1), ItemSold(1)]
+
+
+def test_rejects_event_not_declaring_its_aggregate(store: EventStore) -> None:
+    with pytest.raises(TypeError):
+        store.append([WithoutAggregate(1)])
+
+
+def insert(connection: Connection, sequence: int, event: Event, recorded_at: datetime) -> None:
+    """Inserts event with given sequence, as if a concurrent transaction appended it."""
+    connection.execute(
+        events.insert(),
+        {
+            "sequence": sequence,
+            "aggregate_type": "item",
+            "aggregate_id": "1",
+            "type_id": event_codec.type_id(type(event)),
+            "payload": event_codec.encode(event),
+            "recorded_at": recorded_at,
+        },
+    )
+
+
+def test_replay_stops_before_gap_until_it_is_filled(connection: Connection, store: EventStore) -> None:
+    store.append([ItemSold(0), ItemSold(1)])
+    first = next(store.stream()).sequence
+    insert(connection, first + 3, ItemSold(3), datetime.utcnow())  # committed before the event preceding it
+    replayed: List[Event] = []
+
+    assert store.replay("projection", replayed.append) == 2
+    assert store.position("projection") == first + 1
+
+    insert(connection, first + 2, ItemSold(2), datetime.utcnow())
+
+    assert store.replay("projection", replayed.append) == 2
+    assert replayed == [ItemSold(0), ItemSold(1), ItemSold(2), ItemSold(3)]
+
+
+def test_reads_past_gap_older_than_timeout(connection: Connection) -> None:
+    store = EventStore(connection, gap_timeout=timedelta(seconds=30))
+    insert(connection, 2, ItemSold(2), datetime.utcnow() - timedelta(seconds=31))  # event 1 was rolled back
+    insert(connection, 4, ItemSold(4), datetime.utcnow())
+
+    assert [stored_event.event for stored_event in store.stream()] == [ItemSold(2)]
+
+
+def test_moves_checkpoint_past_events_of_other_types(store: EventStore) -> None:
+    store.append([ItemListed("Socks", 1), ItemListed("Hat", 2)])
+    last = list(store.stream())[-1].sequence
+
+    assert store.replay("projection", lambda event: None, event_types=[ItemSold]) == 0
+
+    assert store.position("projection") == last
+
+
+def test_replay_resumes_from_checkpoint(store: EventStore) -> None:
+    store.append([ItemSold(item_id) for item_id in range(3)])
+    replayed: List[Event] = []
+    assert store.replay("projection", replayed.append, batch_size=2) == 3
+
+    store.append([ItemSold(3)])
+
+    assert store.replay("projection", replayed.append, batch_size=2) == 1
+    assert replayed == [ItemSold(0), ItemSold(1), ItemSold(2), ItemSold(3)]
+
+
+def test_replay_keeps_position_of_last_completed_batch_when_handler_fails(store: EventStore) -> None:
+    store.append([ItemSold(item_id) for item_id in range(5)])
+    replayed: List[Event] = []
+
+    def failing_handler(event: Event) -> None:
+        if event == ItemSold(3):
+            raise ValueError
+        replayed.append(event)
+
+    with pytest.raises(ValueError):
+        store.replay("projection", failing_handler, batch_size=2)
+    store.replay("projection", replayed.append, batch_size=2)
+
+    assert replayed == [ItemSold(0), ItemSold(1), ItemSold(2), ItemSold(2), ItemSold(3), ItemSold(4)]
+
+
+def test_handler_stores_only_registered_events(store: EventStore) -> None:
+    handler = StoreEventHandler(store)
+
+    handler(ItemSold(1))
+    handler(NotRegistered(2))
+
+    assert [stored_event.event for stored_event in store.stream()] == [ItemSold(1)]
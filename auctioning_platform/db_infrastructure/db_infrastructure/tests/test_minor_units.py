@@ -0,0 +1,29 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Numeric, Table, select
+from sqlalchemy.engine import Connection
+
+from foundation.value_objects import Money
+from foundation.value_objects.currency import USD
+from foundation.value_objects.money_vector import MoneyVector
+
+from db_infrastructure import minor_units
+
+prices = Table("prices", MetaData(), Column("id", Integer, primary_key=True), Column("amount", Numeric(10, 2)))
+
+
+@pytest.fixture(scope="session")
+def sqlalchemy_connect_url() -> str:
+    return "sqlite:///:memory:"
+
+
+def test_selects_decimal_column_as_minor_units(connection: Connection) -> None:
+    prices.create(connection)
+    connection.execute(prices.insert(), [{"amount": Decimal("10.99")}, {"amount": Decimal("0.07")}])
+
+    rows = connection.execute(select([minor_units(prices.c.amount, USD)]).order_by(prices.c.id))
+
+    vector = MoneyVector.from_rows(USD, rows)
+    assert vector.minor_units.tolist() == [1099, 7]
+    assert vector.sum() == Money(USD, "11.06")
@@ -0,0 +1,50 @@
+from typing import Hashable, Set
+
+from db_infrastructure.replica import ReadPreference, RecentWrites
+
+
+class InMemoryRecentWrites(RecentWrites):
+    def __init__(self) -> None:
+        self.sessions: Set[Hashable] = set()
+
+    def mark(self, session: Hashable) -> None:
+        self.sessions.add(session)
+
+    def wrote_recently(self, session: Hashable) -> bool:
+        return session in self.sessions
+
+
+def test_reads_from_primary_unless_replica_is_allowed_explicitly() -> None:
+    assert not ReadPreference(InMemoryRecentWrites()).replica_allowed
+
+
+def test_reads_from_primary_without_replica() -> None:
+    preference = ReadPreference(None)
+    preference.use_replica = True
+
+    assert not preference.replica_allowed
+
+
+def test_session_which_wrote_recently_reads_from_primary() -> None:
+    recent_writes = InMemoryRecentWrites()
+    writing = ReadPreference(recent_writes)
+    writing.session = "user:1"
+    writing.wrote()
+
+    reading, other_reading = ReadPreference(recent_writes), ReadPreference(recent_writes)
+    reading.use_replica = other_reading.use_replica = True
+    reading.session, other_reading.session = "user:1", "user:2"
+
+    assert not reading.replica_allowed
+    assert other_reading.replica_allowed
+
+
+def test_anonymous_session_reads_from_replica_and_its_writes_are_not_marked() -> None:
+    recent_writes = InMemoryRecentWrites()
+    preference = ReadPreference(recent_writes)
+    preference.use_replica = True
+
+    preference.wrote()
+
+    assert preference.replica_allowed
+    assert not recent_writes.sessions
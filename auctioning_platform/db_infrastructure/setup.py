@@ -4,5 +4,5 @@ setup(
     name="db_infrastructure",
     version="0.0.0",
     packages=find_packages(),
-    install_requires=["sqlalchemy", "pytest-sqlalchemy"],
+    install_requires=["sqlalchemy", "pytest-sqlalchemy", "injector", "foundation"],
 )
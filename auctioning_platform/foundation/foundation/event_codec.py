@@ -0,0 +1,210 @@
+"""Compact, versioned binary encoding of events.
+
+Every event class that crosses process boundaries is registered with a small integer type id:
+
+    @event_codec.register(type_id=3)
+    @dataclass(frozen=True)
+    class AuctionEnded(Event):
+        ...
+
+Encoded event is a format byte followed by a MessagePack array (packed with `msgpack`) of type id,
+schema version and field values in declaration order. Field values are converted using `packers`
+and `unpackers` type tables; types missing there fall back to JSON-friendly tables from `foundation.serializing`.
+
+Payloads do not reference Python classes, so workers are not coupled to exact class layouts.
+Appending fields with default values is backward and forward compatible - missing trailing values
+are filled with defaults, unknown ones are ignored. Any other change of layout requires bumping
+`version`, older payloads are then rejected instead of being silently misread.
+"""
+import dataclasses
+from datetime import datetime
+from enum import Enum
+import functools
+import typing
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar
+from uuid import UUID
+
+import msgpack
+
+from foundation import serializing
+from foundation.events import Event
+from foundation.value_objects import Currency, Money
+
+EventT = TypeVar("EventT", bound=Type[Event])
+
+FORMAT_VERSION = 1
+_FORMAT_BYTE = bytes((FORMAT_VERSION,))
+
+
+class UnknownEventType(Exception):
+    pass
+
+
+class UnsupportedEventVersion(Exception):
+    pass
+
+
+def _pack_money(money: Money) -> List[Any]:
+    return [money.currency.iso_code, money.minor_units]
+
+
+def _unpack_money(raw: List[Any]) -> Money:
+    iso_code, minor_units = raw
+    if type(minor_units) is not int or minor_units < 0:
+        raise ValueError(f"{minor_units!r} is not a valid amount!")
+    return Money._from_minor_units(_currency(iso_code), minor_units)
+
+
+@functools.lru_cache(maxsize=None)
+def _currency(iso_code: str) -> Type[Currency]:
+    stack = list(Currency.__subclasses__())
+    while stack:
+        currency = stack.pop()
+        if currency.iso_code == iso_code:
+            return currency
+        stack.extend(currency.__subclasses__())
+    raise ValueError(f"Unknown currency {iso_code}")
+
+
+packers: Dict[type, Callable[[Any], Any]] = {
+    int: int,
+    str: str,
+    bool: bool,
+    float: float,
+    bytes: bytes,
+    Money: _pack_money,
+    UUID: lambda uuid: uuid.bytes,
+    datetime: serializing.serializers[datetime],
+}
+
+unpackers: Dict[type, Callable[[Any], Any]] = {
+    int: int,
+    str: str,
+    bool: bool,
+    float: float,
+    bytes: bytes,
+    Money: _unpack_money,
+    UUID: lambda raw: UUID(bytes=raw),
+    datetime: serializing.deserializers[datetime],
+}
+
+
+_FieldSpec = Tuple[str, Callable[[Any], Any], Callable[[Any], Any]]
+
+
+@dataclasses.dataclass
+class _Schema:
+    event_cls: Type[Event]
+    type_id: int
+    version: int
+    fields: Optional[List[_FieldSpec]] = None
+    defaults_from: int = 0
+
+
+_schemas_by_cls: Dict[type, _Schema] = {}
+_schemas_by_id: Dict[int, _Schema] = {}
+
+
+def register(type_id: int, version: int = 1) -> Callable[[EventT], EventT]:
+    """Class decorator assigning a type id to an event dataclass. Ids must be unique and never reused."""
+
+    def decorator(event_cls: EventT) -> EventT:
+        if not dataclasses.is_dataclass(event_cls) or not issubclass(event_cls, Event):
+            raise TypeError(f"{event_cls} is not an Event dataclass")
+        registered = _schemas_by_id.get(type_id)
+        if registered is not None and registered.event_cls.__qualname__ != event_cls.__qualname__:
+            raise ValueError(f"Type id {type_id} already taken by {registered.event_cls.__qualname__}")
+        schema = _Schema(event_cls, type_id, version)
+        _schemas_by_cls[event_cls] = _schemas_by_id[type_id] = schema
+        return event_cls
+
+    return decorator
+
+
+def is_registered(event_cls: type) -> bool:
+    return event_cls in _schemas_by_cls
+
+
+def type_id(event_cls: type) -> int:
+    try:
+        return _schemas_by_cls[event_cls].type_id
+    except KeyError:
+        raise UnknownEventType(f"{event_cls.__qualname__} is not registered")
+
+
+def encode(event: Event) -> bytes:
+    try:
+        schema = _schemas_by_cls[type(event)]
+    except KeyError:
+        raise UnknownEventType(f"{type(event).__qualname__} is not registered")
+
+    values: List[Any] = [schema.type_id, schema.version]
+    for name, pack, _unpack in _fields(schema):
+        value = getattr(event, name)
+        values.append(None if value is None else pack(value))
+
+    return _FORMAT_BYTE + msgpack.packb(values, use_bin_type=True)
+
+
+def decode(payload: bytes) -> Event:
+    if payload[:1] != _FORMAT_BYTE:
+        raise ValueError(f"Unsupported format {payload[:1]!r}")
+    try:
+        values = msgpack.unpackb(memoryview(payload)[1:], raw=False)
+    except (msgpack.UnpackException, ValueError) as exc:
+        raise ValueError(f"Malformed payload: {exc}")
+    if not isinstance(values, list) or len(values) < 2:
+        raise ValueError("Malformed payload: expected an array of type id, version and fields")
+    type_id, version, *raw_fields = values
+    try:
+        schema = _schemas_by_id[type_id]
+    except KeyError:
+        raise UnknownEventType(f"Type id {type_id} is not registered")
+    if version != schema.version:
+        raise UnsupportedEventVersion(f"{schema.event_cls.__qualname__} v{version}, expected v{schema.version}")
+
+    fields = _fields(schema)
+    if len(raw_fields) < schema.defaults_from:
+        raise ValueError(f"Too few fields for {schema.event_cls.__qualname__}")
+    kwargs = {name: None if raw is None else unpack(raw) for (name, _pack, unpack), raw in zip(fields, raw_fields)}
+    return schema.event_cls(**kwargs)  # type: ignore
+
+
+def _fields(schema: _Schema) -> List[_FieldSpec]:
+    if schema.fields is None:
+        hints = typing.get_type_hints(schema.event_cls)
+        fields = []
+        for field in dataclasses.fields(schema.event_cls):
+            field_type = _strip_optional(hints[field.name])
+            fields.append((field.name, _packer(field_type), _unpacker(field_type)))
+            if field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING:  # type: ignore
+                schema.defaults_from = len(fields)
+        schema.fields = fields
+    return schema.fields
+
+
+def _strip_optional(type_hint: Any) -> type:
+    args = getattr(type_hint, "__args__", None)
+    if args and type(None) in args:
+        return next(arg for arg in args if arg is not type(None))  # noqa: E721
+    return type_hint  # type: ignore
+
+
+def _packer(field_type: type) -> Callable[[Any], Any]:
+    if field_type in packers:
+        return packers[field_type]
+    elif isinstance(field_type, type) and issubclass(field_type, Enum):
+        return lambda member: member.value
+    elif field_type in serializing.serializers:
+        return serializing.serializers[field_type]
+    raise TypeError(f"Type {field_type} not supported")
+
+
+def _unpacker(field_type: type) -> Callable[[Any], Any]:
+    if field_type in unpackers:
+        return unpackers[field_type]
+    elif isinstance(field_type, type) and issubclass(field_type, Enum):
+        return field_type
+    elif field_type in serializing.deserializers:
+        return serializing.deserializers[field_type]
+    raise TypeError(f"Type {field_type} not supported")
@@ -1,10 +1,20 @@
 import abc
-from typing import Callable, Generic, List, Type, TypeVar
+import time
+from typing import Callable, Dict, Generic, List, NamedTuple, Optional, Tuple, Type, TypeVar
 
 from injector import Injector, Provider, UnsatisfiedRequirement
+from typing_extensions import Protocol
+
+from foundation.metrics import Metrics
 
 T = TypeVar("T")
 
+HIGH_PRIORITY_QUEUE = "high"
+DEFAULT_QUEUE = "default"
+LOW_PRIORITY_QUEUE = "low"
+# Workers take jobs from these queues in this order
+ASYNC_HANDLERS_QUEUES = (HIGH_PRIORITY_QUEUE, DEFAULT_QUEUE, LOW_PRIORITY_QUEUE)
+
 
 class Event:
     pass
@@ -54,18 +64,27 @@ class EventHandlerProvider(Provider):
         return [injector.create_object(self._cls)]
 
 
+class QueuedHandler(NamedTuple):
+    handler_cls: type
+    queue: str
+
+
 class AsyncEventHandlerProvider(Provider):
     """An async counterpart of EventHandlerProvider.
 
     In async, one does not need to actually construct the instance.
-    It is enough to obtain class itself.
+    It is enough to obtain class itself, together with the queue it goes to.
+
+    `queue` names the lane handler's jobs go to, e.g. HIGH_PRIORITY_QUEUE
+    for handlers that must not wait behind bulk notifications.
     """
 
-    def __init__(self, cls: Type[T]) -> None:
+    def __init__(self, cls: Type[T], queue: str = DEFAULT_QUEUE) -> None:
         self._cls = cls
+        self.queue = queue
 
-    def get(self, _injector: Injector) -> List[Type[T]]:
-        return [self._cls]
+    def get(self, _injector: Injector) -> List[QueuedHandler]:
+        return [QueuedHandler(self._cls, self.queue)]
 
 
 class EventBus(abc.ABC):
@@ -74,7 +93,60 @@ class EventBus(abc.ABC):
         raise NotImplementedError
 
 
-RunAsyncHandler = Callable[[AsyncHandler[T], T], None]
+class RunAsyncHandler(Protocol):
+    def __call__(self, handler_cls: Type, event: Event, *, queue: str = DEFAULT_QUEUE) -> None:
+        ...
+
+
+class EventDispatchTable:
+    """Caches which keys (e.g. Handler[AuctionEnded]) have to be resolved for handlers of a given event type.
+
+    Lookup is MRO-aware, so handlers bound to a base event (e.g. Handler[Event])
+    are also called for its subclasses. Entries are built once per event type. Only the lookup is cached -
+    handlers are still resolved with `Injector.get` on every post, so their scopes are respected and replaced
+    or extended bindings are picked up.
+
+    Keys bound after an entry was built (e.g. handlers of an event that had none, bound by a module
+    installed later) are picked up once the table is rebuilt. Given `bindings_version`, a callable
+    returning a number which changes whenever bindings change, the table rebuilds itself.
+    Otherwise `invalidate` has to be called.
+    """
+
+    def __init__(self, injector: Injector, bindings_version: Optional[Callable[[], int]] = None) -> None:
+        self._injector = injector
+        self._bindings_version = bindings_version
+        self._version = bindings_version() if bindings_version is not None else None
+        self._table: Dict[type, Tuple[Tuple[type, ...], Tuple[type, ...]]] = {}
+
+    def get(self, event_cls: type) -> Tuple[Tuple[type, ...], Tuple[type, ...]]:
+        if self._bindings_version is not None:
+            version = self._bindings_version()
+            if version != self._version:
+                self._table = {}
+                self._version = version
+        try:
+            return self._table[event_cls]
+        except KeyError:
+            entry = self._table[event_cls] = (
+                self._keys_for(Handler, event_cls),
+                self._keys_for(AsyncHandler, event_cls),
+            )
+            return entry
+
+    def invalidate(self) -> None:
+        self._table = {}
+
+    def _keys_for(self, generic: Type, event_cls: type) -> Tuple[type, ...]:
+        keys = []
+        for cls in event_cls.__mro__:
+            if not issubclass(cls, Event):
+                continue
+            try:
+                self._injector.binder.get_binding(generic[cls])
+            except UnsatisfiedRequirement:
+                continue
+            keys.append(generic[cls])
+        return tuple(keys)
 
 
 class InjectorEventBus(EventBus):
@@ -83,27 +155,57 @@ class InjectorEventBus(EventBus):
     It requires Injector to be created with auto_bind=False.
     Otherwise UnsatisfiedRequirement is not raised. Instead,
     TypeError is thrown due to usage of `Handler` and `AsyncHandler` generics.
+
+    Handlers are looked up through EventDispatchTable. Pass a shared instance
+    to avoid rebuilding it every time the bus is constructed.
+
+    Async handlers are passed to `run_async_handler` together with the queue
+    they were bound to (see AsyncEventHandlerProvider). Handler classes bound
+    without a queue go to DEFAULT_QUEUE.
+
+    When `metrics` are given, posted events are counted per type
+    and synchronous handlers are timed.
     """
 
-    def __init__(self, injector: Injector, run_async_handler: RunAsyncHandler) -> None:
+    def __init__(
+        self,
+        injector: Injector,
+        run_async_handler: RunAsyncHandler,
+        dispatch_table: Optional[EventDispatchTable] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
         self._injector = injector
         self._run_async_handler = run_async_handler
+        self._dispatch_table = dispatch_table or EventDispatchTable(injector)
+        self._metrics = metrics
 
     def post(self, event: Event) -> None:
+        handlers_keys, async_handlers_keys = self._dispatch_table.get(type(event))
+        if self._metrics is not None:
+            self._metrics.inc("events_posted_total", {"event": type(event).__name__})
+
+        for key in handlers_keys:
+            for handler in self._injector.get(key):
+                if self._metrics is None:
+                    handler(event)
+                else:
+                    self._run_measured(handler, event)
+
+        for key in async_handlers_keys:
+            for async_handler in self._injector.get(key):
+                if isinstance(async_handler, QueuedHandler):
+                    self._run_async_handler(async_handler.handler_cls, event, queue=async_handler.queue)
+                else:
+                    self._run_async_handler(async_handler, event, queue=DEFAULT_QUEUE)
+
+    def _run_measured(self, handler: Callable[[Event], None], event: Event) -> None:
+        assert self._metrics is not None
+        labels = {"handler": type(handler).__name__}
+        start = time.perf_counter()
         try:
-            handlers = self._injector.get(Handler[type(event)])  # type: ignore
-        except UnsatisfiedRequirement:
-            pass
-        else:
-            assert isinstance(handlers, list)
-            for handler in handlers:
-                handler(event)
-
-        try:
-            async_handlers = self._injector.get(AsyncHandler[type(event)])  # type: ignore
-        except UnsatisfiedRequirement:
-            pass
-        else:
-            assert isinstance(async_handlers, list)
-            for async_handler in async_handlers:
-                self._run_async_handler(async_handler, event)
+            handler(event)
+        except Exception:
+            self._metrics.inc("handler_failures_total", labels)
+            raise
+        finally:
+            self._metrics.observe("handler_duration_seconds", labels, time.perf_counter() - start)
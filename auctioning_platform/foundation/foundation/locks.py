@@ -1,3 +1,4 @@
+import threading
 from types import TracebackType
 from typing import Callable, Optional, Type
 
@@ -19,3 +20,41 @@ class Lock(Protocol):
 
 
 LockFactory = Callable[[str, int], Lock]
+
+
+class StripedLockFactory:
+    """LockFactory for deployments running in a single process, e.g. one box or load tests.
+
+    Names are hashed onto a fixed pool of `threading.Lock`s, so memory does not grow with the number
+    of names, at the cost of rare false contention between names sharing a stripe.
+    Like distributed locks, these are not reentrant - taking two locks at once may wait on the same stripe.
+    `timeout` given for a lock is ignored, as it can not outlive the process holding it.
+    Acquiring waits for up to `wait_timeout` seconds before raising AlreadyLocked.
+    """
+
+    def __init__(self, stripes: int = 1024, wait_timeout: float = 0.0) -> None:
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        self._wait_timeout = wait_timeout
+
+    def __call__(self, name: str, timeout: int = 30) -> Lock:
+        return _StripedLock(self._stripes[hash(name) % len(self._stripes)], self._wait_timeout)
+
+
+class _StripedLock:
+    def __init__(self, lock: threading.Lock, wait_timeout: float) -> None:
+        self._lock = lock
+        self._wait_timeout = wait_timeout
+
+    def __enter__(self) -> None:
+        if self._wait_timeout > 0:
+            acquired = self._lock.acquire(timeout=self._wait_timeout)
+        else:
+            acquired = self._lock.acquire(blocking=False)
+        if not acquired:
+            raise AlreadyLocked
+
+    def __exit__(
+        self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]
+    ) -> Literal[False]:
+        self._lock.release()
+        return False
@@ -0,0 +1,102 @@
+import threading
+from typing import Dict, Iterable, Mapping, Sequence, Tuple
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Metrics:
+    """Minimal in-process registry of counters and histograms.
+
+    Samples are kept flattened, as they appear in Prometheus text format
+    (e.g. `handler_duration_seconds_bucket{handler="Foo",le="0.1"}`), so they can be merged
+    with samples coming from other processes by simply adding values.
+
+    Disabled instance is meant to be replaced with None by its users,
+    so that disabled metrics cost nothing but an `is None` check.
+    """
+
+    def __init__(self, enabled: bool = True, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.enabled = enabled
+        self._buckets = tuple(sorted(buckets))
+        self._bucket_labels = tuple(_format_value(bucket) for bucket in self._buckets) + ("+Inf",)
+        self._samples: Dict[str, float] = {}
+        self._types: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, labels: Mapping[str, str], amount: float = 1.0) -> None:
+        key = _sample_key(name, labels)
+        with self._lock:
+            self._types[name] = COUNTER
+            self._samples[key] = self._samples.get(key, 0.0) + amount
+
+    def observe(self, name: str, labels: Mapping[str, str], value: float) -> None:
+        bucket_keys = [
+            _sample_key(f"{name}_bucket", dict(labels, le=le))
+            for bucket, le in zip(self._buckets + (float("inf"),), self._bucket_labels)
+            if value <= bucket
+        ]
+        sum_key = _sample_key(f"{name}_sum", labels)
+        count_key = _sample_key(f"{name}_count", labels)
+        with self._lock:
+            self._types[name] = HISTOGRAM
+            for key in bucket_keys:
+                self._samples[key] = self._samples.get(key, 0.0) + 1
+            self._samples[sum_key] = self._samples.get(sum_key, 0.0) + value
+            self._samples[count_key] = self._samples.get(count_key, 0.0) + 1
+
+    def collect(self, reset: bool = False) -> Tuple[Dict[str, float], Dict[str, str]]:
+        """Returns copies of samples and metrics' types, optionally clearing samples."""
+        with self._lock:
+            samples, types = dict(self._samples), dict(self._types)
+            if reset:
+                self._samples.clear()
+        return samples, types
+
+    def render(self) -> str:
+        return render(*self.collect())
+
+
+def render(samples: Mapping[str, float], types: Mapping[str, str]) -> str:
+    """Formats flattened samples using Prometheus text exposition format."""
+    by_metric: Dict[str, list] = {}
+    for key, value in samples.items():
+        by_metric.setdefault(_metric_name(key, types), []).append((key, value))
+
+    lines = []
+    for name in sorted(by_metric):
+        if name in types:
+            lines.append(f"# TYPE {name} {types[name]}")
+        lines.extend(f"{key} {_format_value(value)}" for key, value in sorted(by_metric[name]))
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _metric_name(key: str, types: Mapping[str, str]) -> str:
+    name = key.split("{", 1)[0]
+    for suffix in ("_bucket", "_sum", "_count"):
+        if name.endswith(suffix) and types.get(name[: -len(suffix)]) == HISTOGRAM:
+            return name[: -len(suffix)]
+    return name
+
+
+def _sample_key(name: str, labels: Mapping[str, str]) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{label}="{_escape(value)}"' for label, value in _sorted(labels.items())) + "}"
+
+
+def _sorted(items: Iterable[Tuple[str, str]]) -> Iterable[Tuple[str, str]]:
+    # `le` goes last, as Prometheus client libraries do
+    return sorted(items, key=lambda item: (item[0] == "le", item[0]))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
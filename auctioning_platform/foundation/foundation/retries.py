@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+import random
+from typing import Tuple, Type
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Describes how failed async handlers are retried.
+
+    Handlers declare it as `RETRY_POLICY` class attribute, DEFAULT_RETRY_POLICY is used otherwise.
+    Delays grow exponentially and are fully jittered, so handlers failing at the same time
+    (e.g. when SMTP server is down) do not retry in lockstep.
+    """
+
+    max_attempts: int = 5
+    base_delay: float = 2.0
+    max_delay: float = 600.0
+    retry_on: Tuple[Type[Exception], ...] = (Exception,)
+
+    def should_retry(self, attempt: int, exception: Exception) -> bool:
+        return attempt < self.max_attempts and isinstance(exception, self.retry_on)
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before attempt number `attempt + 1`."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+NO_RETRIES = RetryPolicy(max_attempts=1)
@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+import pickle
+from typing import Optional
+from uuid import UUID
+
+import pytest
+
+from foundation import event_codec
+from foundation.event_codec import UnknownEventType, UnsupportedEventVersion
+from foundation.events import Event
+from foundation.value_objects import Money
+from foundation.value_objects.factories import get_dollars
+
+
+class Color(Enum):
+    RED = "red"
+
+
+@event_codec.register(type_id=1001)
+@dataclass(frozen=True)
+class ItemSold(Event):
+    item_id: int
+    buyer_id: Optional[int]
+    price: Money
+    title: str
+    payment_uuid: UUID
+    sold_at: datetime
+    color: Color
+
+
+@event_codec.register(type_id=1002, version=2)
+@dataclass(frozen=True)
+class ItemRenamed(Event):
+    item_id: int
+    title: str = "untitled"
+
+
+@dataclass(frozen=True)
+class NotRegistered(Event):
+    pass
+
+
+@pytest.fixture()
+def item_sold() -> ItemSold:
+    return ItemSold(
+        item_id=1,
+        buyer_id=None,
+        price=get_dollars("10.99"),
+        title="Socks",
+        payment_uuid=UUID("d2b4c65d-5b40-4e56-8a6e-a6c1e4d2a0b0"),
+        sold_at=datetime(2020, 5, 1, 12, 30, 0, 123),
+        color=Color.RED,
+    )
+
+
+def test_decodes_what_was_encoded(item_sold: ItemSold) -> None:
+    assert event_codec.decode(event_codec.encode(item_sold)) == item_sold
+
+
+def test_is_much_smaller_than_pickle(item_sold: ItemSold) -> None:
+    assert len(event_codec.encode(item_sold)) * 3 < len(pickle.dumps(item_sold))
+
+
+@pytest.mark.parametrize(
+    "value", [0, 127, 128, 255, 65535, 65536, 2 ** 32, 2 ** 63, -1, -32, -33, -129, -(2 ** 31) - 1, -(2 ** 63)]
+)
+def test_round_trips_integers(value: int) -> None:
+    assert event_codec.decode(event_codec.encode(ItemRenamed(value, "x"))) == ItemRenamed(value, "x")
+
+
+@pytest.mark.parametrize("length", [0, 31, 32, 255, 256, 65536])
+def test_round_trips_strings(length: int) -> None:
+    event = ItemRenamed(1, "ą" * length)
+
+    assert event_codec.decode(event_codec.encode(event)) == event
+
+
+@event_codec.register(type_id=1003)
+@dataclass(frozen=True)
+class BlobStored(Event):
+    blob: bytes
+    ratio: Optional[float]
+    urgent: bool
+
+
+@pytest.mark.parametrize("size", [0, 255, 256, 65536])
+def test_round_trips_other_field_types(size: int) -> None:
+    event = BlobStored(b"\x00" * size, None, True)
+    other = BlobStored(b"\xff", 0.1, False)
+
+    assert event_codec.decode(event_codec.encode(event)) == event
+    assert event_codec.decode(event_codec.encode(other)) == other
+
+
+@pytest.mark.parametrize("payload", [b"\x01", b"\x01\x94\xcd\x03", b"\x01\xc1", b"\x01\x01", b"\x01\x91\x01"])
+def test_rejects_malformed_payloads(payload: bytes) -> None:
+    with pytest.raises(ValueError):
+        event_codec.decode(payload)
+
+
+def test_uses_messagepack_format() -> None:
+    assert (
+        event_codec.encode(ItemRenamed(1, "ab")) == b"\x01" + bytes([0x94, 0xCD, 0x03, 0xEA, 0x02, 0x01, 0xA2]) + b"ab"
+    )
+
+
+def test_fills_missing_trailing_fields_with_defaults_and_ignores_unknown_ones() -> None:
+    older = b"\x01" + bytes([0x93, 0xCD, 0x03, 0xEA, 0x02, 0x01])
+    newer = b"\x01" + bytes([0x95, 0xCD, 0x03, 0xEA, 0x02, 0x01, 0xA1]) + b"a" + bytes([0x05])
+
+    assert event_codec.decode(older) == ItemRenamed(1)
+    assert event_codec.decode(newer) == ItemRenamed(1, "a")
+
+
+def test_rejects_other_schema_version() -> None:
+    with pytest.raises(UnsupportedEventVersion):
+        event_codec.decode(b"\x01" + bytes([0x93, 0xCD, 0x03, 0xEA, 0x01, 0x01]))
+
+
+def test_rejects_unregistered_events() -> None:
+    with pytest.raises(UnknownEventType):
+        event_codec.encode(NotRegistered())
+
+    with pytest.raises(UnknownEventType):
+        event_codec.decode(b"\x01" + bytes([0x92, 0xCD, 0x03, 0xFF, 0x01]))
+
+
+def test_does_not_allow_taking_registered_type_id() -> None:
+    with pytest.raises(ValueError):
+        event_codec.register(type_id=1001)(NotRegistered)
@@ -0,0 +1,218 @@
+from dataclasses import dataclass
+from typing import List
+from unittest.mock import Mock, call
+
+import injector
+import pytest
+
+from foundation.events import (
+    DEFAULT_QUEUE,
+    HIGH_PRIORITY_QUEUE,
+    AsyncEventHandlerProvider,
+    AsyncHandler,
+    Event,
+    EventDispatchTable,
+    EventHandlerProvider,
+    Handler,
+    InjectorEventBus,
+)
+from foundation.metrics import Metrics
+
+
+@dataclass(frozen=True)
+class SomethingHappened(Event):
+    value: int
+
+
+@dataclass(frozen=True)
+class SomethingSpecificHappened(SomethingHappened):
+    pass
+
+
+@dataclass(frozen=True)
+class NothingHappened(Event):
+    pass
+
+
+calls: List[Event] = []
+
+
+class RecordingHandler:
+    def __call__(self, event: Event) -> None:
+        calls.append(event)
+
+
+class AsyncRecordingHandler:
+    pass
+
+
+@pytest.fixture(autouse=True)
+def clear_calls() -> None:
+    calls.clear()
+
+
+@pytest.fixture()
+def container() -> injector.Injector:
+    def configure(binder: injector.Binder) -> None:
+        binder.multibind(Handler[SomethingHappened], to=EventHandlerProvider(RecordingHandler))
+        binder.multibind(AsyncHandler[SomethingHappened], to=AsyncEventHandlerProvider(AsyncRecordingHandler))
+
+    return injector.Injector([configure], auto_bind=False)
+
+
+@pytest.fixture()
+def run_async_handler() -> Mock:
+    return Mock()
+
+
+@pytest.fixture()
+def event_bus(container: injector.Injector, run_async_handler: Mock) -> InjectorEventBus:
+    return InjectorEventBus(container, run_async_handler)
+
+
+def test_calls_handlers_bound_to_event(event_bus: InjectorEventBus, run_async_handler: Mock) -> None:
+    event = SomethingHappened(1)
+
+    event_bus.post(event)
+
+    assert calls == [event]
+    run_async_handler.assert_called_once_with(AsyncRecordingHandler, event, queue=DEFAULT_QUEUE)
+
+
+def test_calls_handlers_bound_to_base_event(event_bus: InjectorEventBus, run_async_handler: Mock) -> None:
+    event = SomethingSpecificHappened(2)
+
+    event_bus.post(event)
+
+    assert calls == [event]
+    run_async_handler.assert_called_once_with(AsyncRecordingHandler, event, queue=DEFAULT_QUEUE)
+
+
+def test_does_nothing_for_event_without_handlers(event_bus: InjectorEventBus, run_async_handler: Mock) -> None:
+    event_bus.post(NothingHappened())
+
+    assert calls == []
+    run_async_handler.assert_not_called()
+
+
+def test_picks_up_bindings_of_event_without_handlers_once_invalidated(container: injector.Injector) -> None:
+    dispatch_table = EventDispatchTable(container)
+    event_bus = InjectorEventBus(container, Mock(), dispatch_table)
+    event_bus.post(NothingHappened())
+
+    container.binder.multibind(Handler[NothingHappened], to=EventHandlerProvider(RecordingHandler))
+    dispatch_table.invalidate()
+    event_bus.post(NothingHappened())
+
+    assert calls == [NothingHappened()]
+
+
+def test_picks_up_bindings_once_bindings_version_changes(container: injector.Injector) -> None:
+    version = [0]
+    dispatch_table = EventDispatchTable(container, lambda: version[0])
+    event_bus = InjectorEventBus(container, Mock(), dispatch_table)
+    event_bus.post(NothingHappened())
+
+    container.binder.multibind(Handler[NothingHappened], to=EventHandlerProvider(RecordingHandler))
+    version[0] += 1
+    event_bus.post(NothingHappened())
+
+    assert calls == [NothingHappened()]
+
+
+class OtherRecordingHandler:
+    def __call__(self, event: Event) -> None:
+        calls.append(SomethingSpecificHappened(event.value))  # type: ignore
+
+
+def test_picks_up_rebound_handler(container: injector.Injector, event_bus: InjectorEventBus) -> None:
+    event_bus.post(SomethingHappened(1))
+
+    container.binder.bind(Handler[SomethingHappened], to=EventHandlerProvider(OtherRecordingHandler))
+    event_bus.post(SomethingHappened(2))
+
+    assert calls == [SomethingHappened(1), SomethingSpecificHappened(2)]
+
+
+class InstanceRecordingHandler:
+    def __call__(self, event: Event) -> None:
+        calls.append(self)  # type: ignore
+
+
+def test_resolves_handlers_in_their_scope(container: injector.Injector, event_bus: InjectorEventBus) -> None:
+    container.binder.bind(
+        Handler[NothingHappened], to=EventHandlerProvider(InstanceRecordingHandler), scope=injector.singleton
+    )
+    event_bus.post(NothingHappened())
+    event_bus.post(NothingHappened())
+
+    first, second = calls
+    assert isinstance(first, InstanceRecordingHandler)
+    assert first is second
+
+
+def test_picks_up_handlers_appended_to_existing_multibinding(
+    container: injector.Injector, event_bus: InjectorEventBus
+) -> None:
+    event_bus.post(SomethingHappened(1))
+
+    container.binder.multibind(Handler[SomethingHappened], to=EventHandlerProvider(RecordingHandler))
+    event_bus.post(SomethingHappened(2))
+
+    assert calls == [SomethingHappened(1), SomethingHappened(2), SomethingHappened(2)]
+
+
+def test_dispatch_table_can_be_shared_between_buses(container: injector.Injector) -> None:
+    dispatch_table = EventDispatchTable(container)
+    first_run_async, second_run_async = Mock(), Mock()
+
+    InjectorEventBus(container, first_run_async, dispatch_table).post(SomethingHappened(1))
+    InjectorEventBus(container, second_run_async, dispatch_table).post(SomethingHappened(2))
+
+    first_run_async.assert_called_once_with(AsyncRecordingHandler, SomethingHappened(1), queue=DEFAULT_QUEUE)
+    second_run_async.assert_called_once_with(AsyncRecordingHandler, SomethingHappened(2), queue=DEFAULT_QUEUE)
+
+
+class FailingHandler:
+    def __call__(self, event: Event) -> None:
+        raise ValueError
+
+
+def test_records_metrics_when_given(container: injector.Injector, run_async_handler: Mock) -> None:
+    container.binder.multibind(Handler[NothingHappened], to=EventHandlerProvider(FailingHandler))
+    metrics = Metrics()
+    event_bus = InjectorEventBus(container, run_async_handler, metrics=metrics)
+
+    event_bus.post(SomethingHappened(1))
+    with pytest.raises(ValueError):
+        event_bus.post(NothingHappened())
+
+    samples, _types = metrics.collect()
+    assert samples['events_posted_total{event="SomethingHappened"}'] == 1
+    assert samples['events_posted_total{event="NothingHappened"}'] == 1
+    assert samples['handler_duration_seconds_count{handler="RecordingHandler"}'] == 1
+    assert samples['handler_failures_total{handler="FailingHandler"}'] == 1
+
+
+def test_passes_queue_handler_was_bound_to(container: injector.Injector, run_async_handler: Mock) -> None:
+    container.binder.multibind(
+        AsyncHandler[SomethingHappened], to=AsyncEventHandlerProvider(RecordingHandler, queue=HIGH_PRIORITY_QUEUE)
+    )
+    event = SomethingHappened(1)
+
+    InjectorEventBus(container, run_async_handler).post(event)
+
+    assert run_async_handler.call_args_list == [
+        call(AsyncRecordingHandler, event, queue=DEFAULT_QUEUE),
+        call(RecordingHandler, event, queue=HIGH_PRIORITY_QUEUE),
+    ]
+
+
+def test_passes_handler_bound_without_queue_to_default_one(
+    container: injector.Injector, run_async_handler: Mock
+) -> None:
+    container.binder.multibind(AsyncHandler[NothingHappened], to=injector.InstanceProvider([AsyncRecordingHandler]))
+
+    InjectorEventBus(container, run_async_handler).post(NothingHappened())
+
+    run_async_handler.assert_called_once_with(AsyncRecordingHandler, NothingHappened(), queue=DEFAULT_QUEUE)
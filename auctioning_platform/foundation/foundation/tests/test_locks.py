@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+from foundation.locks import AlreadyLocked, StripedLockFactory
+
+
+def test_raises_already_locked_when_lock_is_taken() -> None:
+    lock_factory = StripedLockFactory()
+
+    with lock_factory("pm-lock-1-2", 30):
+        with pytest.raises(AlreadyLocked):
+            with lock_factory("pm-lock-1-2", 30):
+                pass
+
+
+def test_can_be_taken_again_after_release() -> None:
+    lock_factory = StripedLockFactory()
+
+    with lock_factory("pm-lock-1-2", 30):
+        pass
+
+    with lock_factory("pm-lock-1-2", 30):
+        pass
+
+
+def test_releases_when_body_fails() -> None:
+    lock_factory = StripedLockFactory()
+
+    with pytest.raises(ValueError):
+        with lock_factory("pm-lock-1-2", 30):
+            raise ValueError
+
+    with lock_factory("pm-lock-1-2", 30):
+        pass
+
+
+def test_waits_for_lock_up_to_wait_timeout() -> None:
+    lock_factory = StripedLockFactory(wait_timeout=0.05)
+    acquired, released = threading.Event(), threading.Event()
+
+    def hold_until_released() -> None:
+        with lock_factory("pm-lock-1-2", 30):
+            acquired.set()
+            released.wait()
+            time.sleep(0.01)
+
+    holder = threading.Thread(target=hold_until_released)
+    holder.start()
+    acquired.wait()
+    start = time.monotonic()
+    with pytest.raises(AlreadyLocked):
+        with lock_factory("pm-lock-1-2", 30):
+            pass
+    assert time.monotonic() - start >= 0.05
+
+    released.set()
+    with lock_factory("pm-lock-1-2", 30):
+        pass
+    holder.join()
+
+
+def test_serializes_concurrent_holders() -> None:
+    lock_factory = StripedLockFactory(wait_timeout=5)
+    counter = 0
+
+    def increment() -> None:
+        nonlocal counter
+        with lock_factory("counter", 30):
+            value = counter
+            time.sleep(0.001)
+            counter = value + 1
+
+    threads = [threading.Thread(target=increment) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter == 20
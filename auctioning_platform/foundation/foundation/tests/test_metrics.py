@@ -0,0 +1,62 @@
+from foundation.metrics import Metrics, render
+
+
+def test_renders_counters_with_labels() -> None:
+    metrics = Metrics()
+
+    metrics.inc("events_posted_total", {"event": "AuctionEnded"})
+    metrics.inc("events_posted_total", {"event": "AuctionEnded"})
+    metrics.inc("events_posted_total", {"event": "AuctionBegan"}, 3)
+
+    assert metrics.render() == (
+        "# TYPE events_posted_total counter\n"
+        'events_posted_total{event="AuctionBegan"} 3\n'
+        'events_posted_total{event="AuctionEnded"} 2\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    metrics = Metrics(buckets=(0.1, 1.0))
+
+    metrics.observe("handler_duration_seconds", {"handler": "Foo"}, 0.05)
+    metrics.observe("handler_duration_seconds", {"handler": "Foo"}, 0.5)
+    metrics.observe("handler_duration_seconds", {"handler": "Foo"}, 5)
+
+    samples, _types = metrics.collect()
+    assert samples == {
+        'handler_duration_seconds_bucket{handler="Foo",le="0.1"}': 1,
+        'handler_duration_seconds_bucket{handler="Foo",le="1"}': 2,
+        'handler_duration_seconds_bucket{handler="Foo",le="+Inf"}': 3,
+        'handler_duration_seconds_sum{handler="Foo"}': 5.55,
+        'handler_duration_seconds_count{handler="Foo"}': 3,
+    }
+    assert metrics.render().startswith("# TYPE handler_duration_seconds histogram\n")
+
+
+def test_collect_with_reset_clears_samples_but_keeps_types() -> None:
+    metrics = Metrics()
+    metrics.inc("failures_total", {})
+
+    samples, types = metrics.collect(reset=True)
+
+    assert samples == {"failures_total": 1}
+    assert metrics.collect() == ({}, {"failures_total": "counter"})
+
+
+def test_samples_from_many_processes_can_be_added_up() -> None:
+    first, second = Metrics(), Metrics()
+    first.inc("events_posted_total", {"event": "AuctionEnded"})
+    second.inc("events_posted_total", {"event": "AuctionEnded"})
+
+    (first_samples, types), (second_samples, _) = first.collect(), second.collect()
+    merged = {key: first_samples[key] + second_samples[key] for key in first_samples}
+
+    assert render(merged, types) == '# TYPE events_posted_total counter\nevents_posted_total{event="AuctionEnded"} 2\n'
+
+
+def test_escapes_label_values() -> None:
+    metrics = Metrics()
+
+    metrics.inc("odd_total", {"name": 'a"b'})
+
+    assert 'odd_total{name="a\\"b"} 1' in metrics.render()
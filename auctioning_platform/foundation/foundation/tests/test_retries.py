@@ -0,0 +1,31 @@
+import pytest
+
+from foundation.locks import AlreadyLocked
+from foundation.retries import NO_RETRIES, RetryPolicy
+
+
+def test_retries_until_max_attempts() -> None:
+    policy = RetryPolicy(max_attempts=3)
+
+    assert [policy.should_retry(attempt, ValueError()) for attempt in (1, 2, 3)] == [True, True, False]
+
+
+def test_does_not_retry_exceptions_other_than_given() -> None:
+    policy = RetryPolicy(retry_on=(AlreadyLocked,))
+
+    assert policy.should_retry(1, AlreadyLocked())
+    assert not policy.should_retry(1, ValueError())
+
+
+def test_no_retries_policy_gives_up_after_first_attempt() -> None:
+    assert not NO_RETRIES.should_retry(1, ValueError())
+
+
+@pytest.mark.parametrize("attempt, upper_bound", [(1, 1.0), (2, 2.0), (3, 4.0), (10, 30.0)])
+def test_delay_grows_exponentially_with_jitter_up_to_max_delay(attempt: int, upper_bound: float) -> None:
+    policy = RetryPolicy(base_delay=1.0, max_delay=30.0)
+
+    delays = [policy.delay(attempt) for _ in range(200)]
+
+    assert all(0 <= delay <= upper_bound for delay in delays)
+    assert len(set(delays)) > 1
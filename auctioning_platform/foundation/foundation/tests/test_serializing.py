@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+import json
+from typing import Any, Optional
+from uuid import UUID
+
+import pytest
+
+from foundation import serializing
+from foundation.value_objects import Money
+from foundation.value_objects.factories import get_dollars
+
+
+class Color(Enum):
+    RED = "red"
+
+
+@dataclass
+class Item:
+    item_id: UUID
+    color: Optional[Color] = None
+    listed_at: Optional[datetime] = None
+    price: Optional[Money] = None
+    title: Optional[str] = None
+    quantity: Optional[int] = None
+
+
+@dataclass
+class Unsupported:
+    value: Optional[bytes]
+
+
+ITEM_ID = UUID("331831f1-3d7c-48c2-9433-955c1cf8deb6")
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        Item(ITEM_ID),
+        Item(ITEM_ID, Color.RED, datetime(2019, 5, 24, 15, 20, 0, 12), get_dollars("15.99"), "Socks", 3),
+        Item(ITEM_ID, listed_at=datetime(2019, 5, 24, 15, 20, tzinfo=timezone(timedelta(hours=2)))),
+    ],
+)
+def test_roundtrip(item: Item) -> None:
+    assert serializing.from_json(json.loads(serializing.to_json(item)), Item) == item
+
+
+def test_serializes_falsy_values_as_none() -> None:
+    assert json.loads(serializing.to_json(Item(ITEM_ID, title="", quantity=0))) == {
+        "item_id": str(ITEM_ID),
+        "color": None,
+        "listed_at": None,
+        "price": None,
+        "title": None,
+        "quantity": None,
+    }
+
+
+@pytest.mark.parametrize(
+    "raw_dt, expected",
+    [
+        ("2019-05-24T15:20:00.000012", datetime(2019, 5, 24, 15, 20, 0, 12)),
+        ("2019-05-24T15:20:00.000000+0200", datetime(2019, 5, 24, 15, 20, tzinfo=timezone(timedelta(hours=2)))),
+        ("2019-05-24T15:20:00.000000+02:00", datetime(2019, 5, 24, 15, 20, tzinfo=timezone(timedelta(hours=2)))),
+        (
+            "2019-05-24T15:20:00.000000-0530",
+            datetime(2019, 5, 24, 15, 20, tzinfo=timezone(-timedelta(hours=5, minutes=30))),
+        ),
+    ],
+)
+def test_deserializes_datetimes(raw_dt: str, expected: datetime) -> None:
+    assert serializing.deserializers[datetime](raw_dt) == expected
+
+
+class NoStrptimeDatetime(datetime):
+    @classmethod
+    def strptime(cls, *args: Any) -> datetime:  # type: ignore
+        raise AssertionError("strptime is the slow path")
+
+
+@pytest.mark.parametrize(
+    "dt", [datetime(2019, 5, 24, 15, 20), datetime(2019, 5, 24, 15, 20, 0, 12, tzinfo=timezone(timedelta(hours=-2)))]
+)
+def test_deserializes_what_it_serializes_without_strptime(monkeypatch: pytest.MonkeyPatch, dt: datetime) -> None:
+    monkeypatch.setattr(serializing, "datetime", NoStrptimeDatetime)
+
+    assert serializing._deserialize_dt(serializing._serialize_dt(dt)) == dt
+
+
+@pytest.mark.parametrize(
+    "dt", [datetime(2019, 5, 24, 15, 20), datetime(2019, 5, 24, 15, 20, 0, 12, tzinfo=timezone.utc)]
+)
+def test_serializes_datetimes_in_the_same_format_regardless_of_microseconds(dt: datetime) -> None:
+    assert serializing.serializers[datetime](dt) == dt.strftime("%Y-%m-%dT%H:%M:%S.%f%z")
+
+
+def test_rejects_unsupported_field_types() -> None:
+    with pytest.raises(Exception):
+        serializing.to_json(Unsupported(b"irrelevant"))
+
+
+def test_batch_variants() -> None:
+    items = [Item(ITEM_ID, title="Socks"), Item(ITEM_ID, Color.RED, quantity=2)]
+
+    serialized = list(serializing.to_json_many(items))
+
+    assert serialized == [serializing.to_json(item) for item in items]
+    assert list(serializing.from_json_iter((json.loads(json_repr) for json_repr in serialized), Item)) == items
@@ -1,5 +1,7 @@
 from decimal import Decimal
 import operator
+import pickle
+import time
 from typing import Any, Callable
 
 import pytest
@@ -19,7 +21,22 @@ def test_invalid_inputs(currency: object, amount: object) -> None:
         Money(currency, amount)  # type: ignore
 
 
-@pytest.mark.parametrize("currency, amount", [(USD, "9.99"), (BTC, "1.00000020")])
+@pytest.mark.parametrize(
+    "amount", ["NaN", "Infinity", "1e16", "1e100000", "1e1000000", "-1e1000000", "10000000000000000"]
+)
+def test_rejects_amounts_too_big_or_not_finite_quickly(amount: str) -> None:
+    start = time.perf_counter()
+
+    with pytest.raises(ValueError, match="is not a valid amount"):
+        Money(USD, amount)
+
+    assert time.perf_counter() - start < 0.1
+
+
+@pytest.mark.parametrize(
+    "currency, amount",
+    [(USD, "9.99"), (BTC, "1.00000020"), (USD, "9999999999999999.99"), (USD, "0e1000000")],
+)
 def test_valid_inputs(currency: object, amount: object) -> None:
     assert Money(currency, amount)  # type: ignore
 
@@ -97,3 +114,23 @@ def test_supports_basic_math_operators_if_the_same_currency(
 )
 def test_normalizes_whenever_it_can(arg: Any, expected_result: Money) -> None:
     assert Money(USD, arg) == expected_result
+
+
+@pytest.mark.parametrize(
+    "money_instance, expected_minor_units", [(Money(USD, "12.49"), 1249), (Money(BTC, "0.00004212"), 4212)]
+)
+def test_keeps_amount_as_minor_units(money_instance: Money, expected_minor_units: int) -> None:
+    assert money_instance.minor_units == expected_minor_units
+
+
+def test_subtracting_more_than_available_is_not_allowed() -> None:
+    with pytest.raises(ValueError):
+        Money(USD, "1") - Money(USD, "1.01")
+
+
+def test_equal_instances_have_equal_hashes() -> None:
+    assert hash(Money(USD, "5")) == hash(Money(USD, "5.00"))
+
+
+def test_survives_pickling() -> None:
+    assert pickle.loads(pickle.dumps(Money(USD, "18.59"))) == Money(USD, "18.59")
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from foundation.value_objects import Currency, Money
+from foundation.value_objects.currency import USD
+from foundation.value_objects.money_vector import MoneyVector
+
+
+class EUR(Currency):
+    iso_code = "EUR"
+    symbol = "€"
+
+
+@pytest.fixture()
+def vector() -> MoneyVector:
+    return MoneyVector(USD, [1099, 50, 2000, 0])
+
+
+def test_aggregates_return_money(vector: MoneyVector) -> None:
+    assert vector.sum() == Money(USD, "31.49")
+    assert vector.min() == Money(USD, "0")
+    assert vector.max() == Money(USD, "20")
+    assert (vector.argmin(), vector.argmax()) == (3, 2)
+
+
+@pytest.mark.parametrize("minor_units, expected_mean", [([1, 2], "0.02"), ([1, 1, 2], "0.01"), ([1099], "10.99")])
+def test_mean_is_rounded_half_up(minor_units: list, expected_mean: str) -> None:
+    assert MoneyVector(USD, minor_units).mean() == Money(USD, expected_mean)
+
+
+def test_comparison_gives_mask_usable_as_index(vector: MoneyVector) -> None:
+    mask = vector > Money(USD, "10")
+
+    assert mask.tolist() == [True, False, True, False]
+    assert list(vector[mask]) == [Money(USD, "10.99"), Money(USD, "20")]
+
+
+def test_elementwise_arithmetic(vector: MoneyVector) -> None:
+    assert list(vector + Money(USD, "0.01")) == [
+        Money(USD, "11"),
+        Money(USD, "0.51"),
+        Money(USD, "20.01"),
+        Money(USD, "0.01"),
+    ]
+    assert (vector - vector).sum() == Money(USD, "0")
+
+
+def test_rejects_negative_amounts(vector: MoneyVector) -> None:
+    with pytest.raises(ValueError):
+        MoneyVector(USD, [1, -1])
+    with pytest.raises(ValueError):
+        vector - Money(USD, "1")
+
+
+def test_rejects_different_currencies(vector: MoneyVector) -> None:
+    with pytest.raises(TypeError):
+        vector > Money(EUR, "1")
+    with pytest.raises(TypeError):
+        vector + MoneyVector(EUR, [1, 2, 3, 4])
+    with pytest.raises(TypeError):
+        MoneyVector.from_money(USD, [Money(USD, "1"), Money(EUR, "1")])
+
+
+def test_builds_from_rows_and_money() -> None:
+    assert MoneyVector.from_rows(USD, [(7, 1099), (8, 50)], column=1).minor_units.tolist() == [1099, 50]
+    assert MoneyVector.from_money(USD, [Money(USD, "10.99")]).minor_units.tolist() == [1099]
+    assert MoneyVector.from_rows(USD, []).minor_units.dtype == np.int64
+
+
+def test_minor_units_are_read_only(vector: MoneyVector) -> None:
+    with pytest.raises(ValueError):
+        vector.minor_units[0] = 1
+
+
+def test_sums_beyond_int64_exactly() -> None:
+    largest = 10 ** 18 - 1
+    vector = MoneyVector(USD, [largest] * 10)
+
+    assert 10 * largest > np.iinfo(np.int64).max
+    assert vector.sum().minor_units == 10 * largest
+    assert vector.mean().minor_units == largest
+    assert MoneyVector.from_rows(USD, [(largest,)] * 3).sum().minor_units == 3 * largest
+
+
+@pytest.mark.parametrize("minor_units", [10 ** 18, np.iinfo(np.int64).max, 2 ** 64])
+def test_rejects_amounts_beyond_money_limit(minor_units: int) -> None:
+    with pytest.raises(ValueError):
+        MoneyVector(USD, [1, minor_units])
+    with pytest.raises(ValueError):
+        MoneyVector.from_rows(USD, [(1,), (minor_units,)])
+
+
+def test_adding_beyond_money_limit_is_not_allowed() -> None:
+    vector = MoneyVector(USD, [10 ** 18 - 1])
+
+    with pytest.raises(ValueError):
+        vector + vector
+    with pytest.raises(ValueError):
+        vector + Money(USD, "1")
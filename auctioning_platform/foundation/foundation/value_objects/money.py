@@ -1,32 +1,57 @@
-from decimal import Decimal, DecimalException
-from functools import total_ordering
-import inspect
-from typing import Any, Type
+from decimal import MAX_EMAX, MAX_PREC, MIN_EMIN, Context, Decimal, DecimalException
+from typing import Any, Optional, Type
 
 from foundation.value_objects.currency import Currency
 
+# scaling by currency precision has to be exact, whatever the amount
+_EXACT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+# amounts are limited to fewer minor units than that many digits, which keeps them within int64 (see MoneyVector)
+# and spares scaling huge exponents exactly, which takes time quadratic in the exponent
+MAX_DIGITS = 18
+
 
-@total_ordering
 class Money:
+    """Non-negative amount of money in given currency.
+
+    Internally it is an integer number of minor units (e.g. cents), so comparisons and arithmetic
+    are done on ints. `amount` is converted back to normalized Decimal on first access.
+    Amounts of 10 ** MAX_DIGITS minor units or more are rejected.
+    """
+
+    __slots__ = ("_currency", "_minor_units", "_amount")
+
     def __init__(self, currency: Type[Currency], amount: Any) -> None:
-        if not inspect.isclass(currency) or not issubclass(currency, Currency):
+        if not isinstance(currency, type) or not issubclass(currency, Currency):
             raise ValueError(f"{currency} is not a subclass of Currency!")
         try:
-            decimal_amount = Decimal(amount).normalize()
-        except DecimalException:
+            value = Decimal(amount)
+            if not value.is_finite() or (value and value.adjusted() + currency.decimal_precision >= MAX_DIGITS):
+                raise ValueError
+            scaled = value.scaleb(currency.decimal_precision, _EXACT)
+            minor_units = int(scaled)
+        except (DecimalException, ValueError, OverflowError):
             raise ValueError(f'"{amount}" is not a valid amount!')
-        else:
-            decimal_tuple = decimal_amount.as_tuple()
-            if decimal_tuple.sign:
-                raise ValueError("amount must not be negative!")
-            elif -decimal_tuple.exponent > currency.decimal_precision:
-                raise ValueError(
-                    f"given amount has invalid precision! It should have "
-                    f"no more than {currency.decimal_precision} decimal places!"
-                )
-
-            self._currency = currency
-            self._amount = decimal_amount
+
+        if scaled.is_signed():
+            raise ValueError("amount must not be negative!")
+        elif minor_units != scaled:
+            raise ValueError(
+                f"given amount has invalid precision! It should have "
+                f"no more than {currency.decimal_precision} decimal places!"
+            )
+
+        self._currency = currency
+        self._minor_units = minor_units
+        self._amount: Optional[Decimal] = None
+
+    @classmethod
+    def _from_minor_units(cls, currency: Type[Currency], minor_units: int) -> "Money":
+        """Trusted constructor, skipping validation. Arguments must already be a Currency and a non-negative int."""
+        money = object.__new__(cls)
+        money._currency = currency
+        money._minor_units = minor_units
+        money._amount = None
+        return money
 
     @property
     def currency(self) -> Type[Currency]:
@@ -34,36 +59,66 @@ class Money:
 
     @property
     def amount(self) -> Decimal:
+        if self._amount is None:
+            self._amount = Decimal(self._minor_units).scaleb(-self._currency.decimal_precision).normalize()
         return self._amount
 
+    @property
+    def minor_units(self) -> int:
+        return self._minor_units
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Money):
             raise TypeError
-        return self.currency == other.currency and self.amount == other.amount
+        return self._currency is other._currency and self._minor_units == other._minor_units
 
-    def __lt__(self, other: "Money") -> bool:
+    def _check_comparable(self, other: object, operator: str) -> None:
         if not isinstance(other, Money):
-            raise TypeError(f"'<' not supported between instances of 'Money' and '{other.__class__.__name__}'")
-        elif self.currency != other.currency:
+            raise TypeError(f"'{operator}' not supported between instances of 'Money' and '{other.__class__.__name__}'")
+        elif self._currency is not other._currency:
             raise TypeError("Can not compare money in different currencies!")
-        else:
-            return self.amount < other.amount
+
+    def __lt__(self, other: "Money") -> bool:
+        self._check_comparable(other, "<")
+        return self._minor_units < other._minor_units
+
+    def __le__(self, other: "Money") -> bool:
+        self._check_comparable(other, "<=")
+        return self._minor_units <= other._minor_units
+
+    def __gt__(self, other: "Money") -> bool:
+        self._check_comparable(other, ">")
+        return self._minor_units > other._minor_units
+
+    def __ge__(self, other: "Money") -> bool:
+        self._check_comparable(other, ">=")
+        return self._minor_units >= other._minor_units
 
     def __add__(self, other: "Money") -> "Money":
-        if not isinstance(other, Money) or not self.currency == other.currency:
+        if not isinstance(other, Money) or self._currency is not other._currency:
             raise TypeError
-        return Money(self.currency, self.amount + other.amount)
+        return Money._from_minor_units(self._currency, self._minor_units + other._minor_units)
 
     def __sub__(self, other: "Money") -> "Money":
-        if not isinstance(other, Money) or not self.currency == other.currency:
+        if not isinstance(other, Money) or self._currency is not other._currency:
             raise TypeError
-        return Money(self.currency, self.amount - other.amount)
+        minor_units = self._minor_units - other._minor_units
+        if minor_units < 0:
+            raise ValueError("amount must not be negative!")
+        return Money._from_minor_units(self._currency, minor_units)
 
     def __repr__(self) -> str:
-        return f"Money({self._currency.__name__}, {repr(self._amount)})"
+        return f"Money({self._currency.__name__}, {repr(self.amount)})"
 
     def __str__(self) -> str:
-        return f"{self._amount} {self._currency.symbol}"
+        return f"{self.amount} {self._currency.symbol}"
 
     def __hash__(self) -> int:
-        return hash((self.amount, self.currency))
+        return hash((self._minor_units, self._currency))
+
+    def __reduce__(self) -> tuple:
+        return Money._from_minor_units, (self._currency, self._minor_units)
+
+    def __setstate__(self, state: dict) -> None:
+        # instances pickled before Money kept minor units, e.g. in jobs still waiting in queues
+        self.__init__(state["_currency"], state["_amount"])  # type: ignore
@@ -0,0 +1,182 @@
+from typing import Any, Iterable, Iterator, Sequence, Type, Union
+
+import numpy as np
+
+from foundation.value_objects.currency import Currency
+from foundation.value_objects.money import MAX_DIGITS, Money
+
+# same limit as Money's, which leaves room in int64 for adding two vectors
+_MAX_MINOR_UNITS = 10 ** MAX_DIGITS - 1
+_INT64_MAX = int(np.iinfo(np.int64).max)
+
+
+class MoneyVector:
+    """Many amounts of money in the same currency, for aggregates like reports and settlements.
+
+    Amounts are kept as NumPy int64 array of minor units, so sums, minimums or comparisons
+    are computed without creating Money for every amount. Results are plain Money again.
+    Amounts are limited as Money's are, sums are exact however many amounts there are.
+    Build it from integer minor units fetched from the database, e.g. selecting
+    `db_infrastructure.minor_units(bids.c.amount, USD)`:
+
+        MoneyVector.from_rows(USD, connection.execute(query))
+
+    Not imported in `foundation.value_objects` to keep NumPy out of regular startup.
+    """
+
+    __slots__ = ("_currency", "_minor_units")
+
+    def __init__(self, currency: Type[Currency], minor_units: Union[np.ndarray, Sequence[int]]) -> None:
+        if not isinstance(currency, type) or not issubclass(currency, Currency):
+            raise ValueError(f"{currency} is not a subclass of Currency!")
+        try:
+            array = np.asarray(minor_units, dtype=np.int64)
+        except OverflowError:
+            raise ValueError("amounts are too big!")
+        if array.ndim != 1:
+            raise ValueError("minor units must be one-dimensional!")
+        elif array.size and array.min() < 0:
+            raise ValueError("amounts must not be negative!")
+        elif array.size and array.max() > _MAX_MINOR_UNITS:
+            raise ValueError("amounts are too big!")
+        self._currency = currency
+        self._minor_units = array
+
+    @classmethod
+    def _from_array(cls, currency: Type[Currency], array: np.ndarray) -> "MoneyVector":
+        vector = object.__new__(cls)
+        vector._currency = currency
+        vector._minor_units = array
+        return vector
+
+    @classmethod
+    def from_rows(cls, currency: Type[Currency], rows: Iterable[Sequence[Any]], column: int = 0) -> "MoneyVector":
+        """Reads integer minor units from given column of result rows, without objects per row."""
+        try:
+            minor_units = np.fromiter((row[column] for row in rows), dtype=np.int64)
+        except OverflowError:
+            raise ValueError("amounts are too big!")
+        return cls(currency, minor_units)
+
+    @classmethod
+    def from_money(cls, currency: Type[Currency], amounts: Iterable[Money]) -> "MoneyVector":
+        def minor_units() -> Iterator[int]:
+            for money in amounts:
+                if money.currency is not currency:
+                    raise TypeError(f"Can not put {money.currency.iso_code} into {currency.iso_code} vector!")
+                yield money.minor_units
+
+        try:
+            array = np.fromiter(minor_units(), dtype=np.int64)
+        except OverflowError:
+            raise ValueError("amounts are too big!")
+        return cls(currency, array)  # sums of Money may exceed the limit
+
+    @property
+    def currency(self) -> Type[Currency]:
+        return self._currency
+
+    @property
+    def minor_units(self) -> np.ndarray:
+        view = self._minor_units.view()
+        view.flags.writeable = False
+        return view
+
+    def _money(self, minor_units: Any) -> Money:
+        return Money._from_minor_units(self._currency, int(minor_units))
+
+    def __len__(self) -> int:
+        return len(self._minor_units)
+
+    def __iter__(self) -> Iterator[Money]:
+        for minor_units in self._minor_units.tolist():
+            yield Money._from_minor_units(self._currency, minor_units)
+
+    def __getitem__(self, key: Any) -> Any:
+        """Integer index gives Money, slice or boolean mask (e.g. result of comparison) give MoneyVector."""
+        selected = self._minor_units[key]
+        if isinstance(selected, np.ndarray):
+            return MoneyVector._from_array(self._currency, selected)
+        return self._money(selected)
+
+    def __repr__(self) -> str:
+        return f"MoneyVector({self._currency.__name__}, {len(self)} amounts)"
+
+    def sum(self) -> Money:
+        return self._money(self._exact_sum())
+
+    def mean(self) -> Money:
+        """Average rounded half up to the nearest minor unit."""
+        if not len(self):
+            raise ValueError("mean of empty MoneyVector")
+        quotient, remainder = divmod(self._exact_sum(), len(self))
+        return self._money(quotient + (2 * remainder >= len(self)))
+
+    def _exact_sum(self) -> int:
+        # int64 sum wraps around silently, so it is used only if it can not overflow. Otherwise, as amounts
+        # are below 2 ** 60, sums of their upper and lower 32 bits fit in int64 for up to 2 ** 31 amounts.
+        if not len(self) or int(self._minor_units.max()) <= _INT64_MAX // len(self):
+            return int(self._minor_units.sum())
+        upper = int((self._minor_units >> 32).sum())
+        lower = int((self._minor_units & 0xFFFFFFFF).sum())
+        return (upper << 32) + lower
+
+    def min(self) -> Money:
+        return self._money(self._minor_units.min())
+
+    def max(self) -> Money:
+        return self._money(self._minor_units.max())
+
+    def argmin(self) -> int:
+        return int(self._minor_units.argmin())
+
+    def argmax(self) -> int:
+        return int(self._minor_units.argmax())
+
+    def _other_minor_units(self, other: object) -> Union[np.ndarray, int]:
+        if isinstance(other, MoneyVector):
+            if other._currency is not self._currency:
+                raise TypeError("Can not combine money in different currencies!")
+            return other._minor_units
+        elif isinstance(other, Money):
+            if other.currency is not self._currency:
+                raise TypeError("Can not combine money in different currencies!")
+            return other.minor_units
+        raise TypeError(f"Unsupported operand type: '{other.__class__.__name__}'")
+
+    # comparisons with Money or MoneyVector of the same length give boolean masks, usable as index
+    def __eq__(self, other: object) -> np.ndarray:  # type: ignore
+        return self._minor_units == self._other_minor_units(other)
+
+    def __ne__(self, other: object) -> np.ndarray:  # type: ignore
+        return self._minor_units != self._other_minor_units(other)
+
+    def __lt__(self, other: Union[Money, "MoneyVector"]) -> np.ndarray:
+        return self._minor_units < self._other_minor_units(other)
+
+    def __le__(self, other: Union[Money, "MoneyVector"]) -> np.ndarray:
+        return self._minor_units <= self._other_minor_units(other)
+
+    def __gt__(self, other: Union[Money, "MoneyVector"]) -> np.ndarray:
+        return self._minor_units > self._other_minor_units(other)
+
+    def __ge__(self, other: Union[Money, "MoneyVector"]) -> np.ndarray:
+        return self._minor_units >= self._other_minor_units(other)
+
+    __hash__ = None  # type: ignore
+
+    def __add__(self, other: Union[Money, "MoneyVector"]) -> "MoneyVector":
+        other_minor_units = self._other_minor_units(other)
+        if isinstance(other_minor_units, int) and other_minor_units > _MAX_MINOR_UNITS:
+            raise ValueError("amounts are too big!")
+        # both are within the limit, so the result fits in int64
+        result = self._minor_units + other_minor_units
+        if result.size and result.max() > _MAX_MINOR_UNITS:
+            raise ValueError("amounts are too big!")
+        return MoneyVector._from_array(self._currency, result)
+
+    def __sub__(self, other: Union[Money, "MoneyVector"]) -> "MoneyVector":
+        result = self._minor_units - self._other_minor_units(other)
+        if result.size and result.min() < 0:
+            raise ValueError("amounts must not be negative!")
+        return MoneyVector._from_array(self._currency, result)
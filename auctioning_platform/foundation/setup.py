@@ -4,6 +4,6 @@ setup(
     name="foundation",
     version="0.0.0",
     packages=find_packages(),
-    install_requires=["injector"],
+    install_requires=["injector", "numpy", "msgpack"],
     extras_require={"dev": ["pytest"]},
 )
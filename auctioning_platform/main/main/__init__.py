@@ -4,21 +4,35 @@ import os
 import dotenv
 import injector
 from sqlalchemy import event as sa_event
-from sqlalchemy.engine import Connection, Engine, create_engine
+from sqlalchemy.engine import Connection
 
-from auctions import Auctions
+from auctions import Auctions, GetActiveAuctions, GetSingleAuction, PlacingBid
 from auctions_infrastructure import AuctionsInfrastructure
 from customer_relationship import CustomerRelationship, CustomerRelationshipFacade
-from db_infrastructure import metadata
-from main.modules import Configs, Db, EventBusMod, RedisMod, Rq
+from db_infrastructure import Base
+from main.di import PlanningInjector, ProfilingInjector, plan_types
+from main.modules import (
+    AuctionVersionsMod,
+    Configs,
+    Db,
+    EventBusMod,
+    EventStoreMod,
+    LivePricesMod,
+    LocksMod,
+    MetricsMod,
+    RedisMod,
+    Rq,
+)
 from payments import Payments
 from processes import Processes
 from shipping import Shipping
 from shipping_infrastructure import ShippingInfrastructure
-from web_app_models import User
 
 __all__ = ["bootstrap_app"]
 
+# resolved on (almost) every request, so worth resolving with precomputed plans, see main.di
+PLANNED_TYPES = (PlacingBid, GetActiveAuctions, GetSingleAuction)
+
 
 @dataclass
 class AppContext:
@@ -28,7 +42,9 @@ class AppContext:
 def bootstrap_app() -> AppContext:
     """This is bootstrap function independent from the context.
 
-    This should be used for Web, CLI, or worker context."""
+    This should be used for Web, CLI, or worker context.
+    It neither touches DB schema (see main.migrate) nor imports implementations that modules
+    provide lazily, so it stays cheap for short-lived processes."""
     config_path = os.environ.get(
         "CONFIG_PATH", os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, ".env_file")
     )
@@ -42,25 +58,46 @@ def bootstrap_app() -> AppContext:
         "email.password": os.environ["EMAIL_PASSWORD"],
         "email.from.name": os.environ["EMAIL_FROM_NAME"],
         "email.from.address": os.environ["EMAIL_FROM_ADDRESS"],
+        "db.dsn": os.environ["DB_DSN"],
+        "db.pool": os.environ.get("DB_POOL", "default"),
+        "db.pool_size": int(os.environ.get("DB_POOL_SIZE", "5")),
+        "db.max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", "10")),
+        "db.pool_timeout": float(os.environ.get("DB_POOL_TIMEOUT", "30")),
+        "db.pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", "-1")),
+        "db.pool_pre_ping": _flag(os.environ.get("DB_POOL_PRE_PING", "false")),
+        "db.pgbouncer": _flag(os.environ.get("DB_PGBOUNCER", "false")),
+        "db.replica_dsn": os.environ.get("DB_REPLICA_DSN") or None,
+        "db.read_your_writes_window": float(os.environ.get("DB_READ_YOUR_WRITES_WINDOW", "5")),
         "redis.host": os.environ["REDIS_HOST"],
+        "locks.backend": os.environ.get("LOCKS_BACKEND", "redis"),
+        "locks.wait_timeout": float(os.environ.get("LOCK_WAIT_TIMEOUT", "5")),
+        "metrics.enabled": _flag(os.environ.get("METRICS_ENABLED", "false")),
+        "di.profile": _flag(os.environ.get("DI_PROFILE", "false")),
     }
 
-    engine = create_engine(os.environ["DB_DSN"])
-    dependency_injector = _setup_dependency_injection(settings, engine)
+    dependency_injector = _setup_dependency_injection(settings)
     _setup_orm_events(dependency_injector)
 
-    _create_db_schema(engine)  # TEMPORARY
-
     return AppContext(dependency_injector)
 
 
-def _setup_dependency_injection(settings: dict, engine: Engine) -> injector.Injector:
-    return injector.Injector(
+def _flag(value: str) -> bool:
+    return value.lower() in ("1", "true", "yes")
+
+
+def _setup_dependency_injection(settings: dict) -> injector.Injector:
+    injector_cls = ProfilingInjector if settings["di.profile"] else PlanningInjector
+    dependency_injector = injector_cls(
         [
-            Db(engine),
+            Db(settings["db.dsn"], settings["db.replica_dsn"], settings["db.read_your_writes_window"]),
             RedisMod(settings["redis.host"]),
+            LocksMod(settings["locks.backend"], settings["locks.wait_timeout"]),
             Rq(),
             EventBusMod(),
+            EventStoreMod(),
+            AuctionVersionsMod(),
+            LivePricesMod(),
+            MetricsMod(settings["metrics.enabled"]),
             Configs(settings),
             Auctions(),
             AuctionsInfrastructure(),
@@ -72,23 +109,24 @@ def _setup_dependency_injection(settings: dict, engine: Engine) -> injector.Inje
         ],
         auto_bind=False,
     )
+    if isinstance(dependency_injector, PlanningInjector):
+        plan_types(dependency_injector, PLANNED_TYPES)
+    return dependency_injector
 
 
 def _setup_orm_events(dependency_injector: injector.Injector) -> None:
-    @sa_event.listens_for(User, "after_insert")
-    def insert_cb(_mapper, _connection: Connection, user: User) -> None:  # type: ignore
-        dependency_injector.get(CustomerRelationshipFacade).create_customer(user.id, user.email)
-
-    @sa_event.listens_for(User, "after_update")
-    def update_cb(_mapper, _connection: Connection, user: User) -> None:  # type: ignore
-        dependency_injector.get(CustomerRelationshipFacade).update_customer(user.id, user.email)
+    # Listening on Base instead of User spares importing web_app_models (and Flask-Security) outside web app.
+    # User is imported in callbacks only, when some model has already been saved, so it is loaded anyway.
+    @sa_event.listens_for(Base, "after_insert", propagate=True)
+    def insert_cb(_mapper, _connection: Connection, target: Base) -> None:  # type: ignore
+        from web_app_models import User
 
+        if isinstance(target, User):
+            dependency_injector.get(CustomerRelationshipFacade).create_customer(target.id, target.email)
 
-def _create_db_schema(engine: Engine) -> None:
-    # Models has to be imported for metadata.create_all to discover them
-    from auctions_infrastructure import auctions, bids  # noqa
-    from customer_relationship.models import customers  # noqa
-    from web_app_models import Role, RolesUsers, User  # noqa
+    @sa_event.listens_for(Base, "after_update", propagate=True)
+    def update_cb(_mapper, _connection: Connection, target: Base) -> None:  # type: ignore
+        from web_app_models import User
 
-    # TODO: Use migrations for that
-    metadata.create_all(engine)
+        if isinstance(target, User):
+            dependency_injector.get(CustomerRelationshipFacade).update_customer(target.id, target.email)
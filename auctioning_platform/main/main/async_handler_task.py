@@ -1,22 +1,186 @@
+from datetime import datetime, timedelta, timezone
+import functools
+import importlib
+import logging
+import pickle
+import time
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Union
+
+from redis import Redis
+from rq import Queue, get_current_job
+from rq.job import Job, JobStatus
 from sqlalchemy.engine import Connection
 
+from foundation import event_codec
+from foundation.metrics import Metrics
+from foundation.retries import DEFAULT_RETRY_POLICY
+
+if TYPE_CHECKING:
+    from main import AppContext
+
+logger = logging.getLogger(__name__)
+
+HandlerCall = Tuple[type, tuple, dict]
+EncodedHandlerCall = Union[bytes, HandlerCall]
+
+DEAD_LETTER_QUEUE = "dead_letters"
+
+
+class AsyncHandlersFailed(Exception):
+    pass
+
+
+_app_context: Optional["AppContext"] = None
+
+
+def app_context() -> "AppContext":
+    """Application context of the current process, bootstrapped on the first call.
+
+    Jobs share it, so the engine with its connection pool, Redis client and the injector
+    are created once per worker process instead of once per job. Everything that must not
+    outlive a job (e.g. DB connection) is request scoped - see async_handlers_batch_task.
+    """
+    global _app_context
+    if _app_context is None:
+        from main import bootstrap_app
+
+        _app_context = bootstrap_app()
+    return _app_context
+
 
 def async_handler_generic_task(cls, *args, **kwargs):  # type: ignore
     """
     This function is meant to be used for running asynchronous event handlers.
 
-    It bootstraps application context and wraps task with DB transaction.
+    It runs in the application context of the process and wraps task with DB transaction.
     """
-    from main import bootstrap_app
+    async_handlers_batch_task([(cls, args, kwargs)])
+
+
+def encode_call(call: HandlerCall) -> bytes:
+    """Encodes handler call for the outbox and RQ jobs.
+
+    Calls with a single event registered in foundation.event_codec are stored as handler's import path
+    followed by the compact event encoding. Anything else is pickled.
+    """
+    handler_cls, args, kwargs = call
+    if len(args) == 1 and not kwargs and event_codec.is_registered(type(args[0])):
+        handler_path = f"{handler_cls.__module__}:{handler_cls.__qualname__}\n".encode()
+        return handler_path + event_codec.encode(args[0])
+    return pickle.dumps(call)
+
+
+def decode_call(payload: EncodedHandlerCall) -> HandlerCall:
+    if isinstance(payload, tuple):  # enqueued as is, e.g. by async_handler_generic_task
+        return payload
+    elif payload[:1] == b"\x80":  # pickle protocol 2+
+        return pickle.loads(payload)  # type: ignore
+    handler_path, _, encoded_event = payload.partition(b"\n")
+    return _import_handler(handler_path.decode()), (event_codec.decode(encoded_event),), {}
+
+
+@functools.lru_cache(maxsize=None)
+def _import_handler(path: str) -> type:
+    module_name, qualname = path.split(":")
+    handler: Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        handler = getattr(handler, name)
+    return handler  # type: ignore
+
+
+def async_handlers_batch_task(calls: List[EncodedHandlerCall]) -> None:
+    """Runs all asynchronous event handlers collected during a single transaction.
+
+    Calls come encoded with `encode_call`; plain HandlerCall tuples are accepted as well.
+
+    Application context is bootstrapped once per process (see `app_context`) and every job enters
+    a fresh RequestScope, closed when the job is done. Every handler gets its own DB transaction,
+    so a failing handler neither rolls back nor stops the others.
+    Failed calls are retried according to handler's RETRY_POLICY, each in a separate job scheduled
+    with RQ's scheduler, so waiting for the retry does not occupy a worker. Calls that run out
+    of attempts go to DEAD_LETTER_QUEUE, see main.dead_letters.
+
+    With metrics enabled, time spent in the queue, handlers' durations and failures
+    are recorded and added to workers' totals in Redis.
+    """
+    from main.di import create_object
+    from main.metrics import flush_to_redis
     from main.modules import RequestScope
 
-    app = bootstrap_app()
+    app = app_context()
+    job: Any = get_current_job()
+    registry = app.injector.get(Metrics)
+    metrics = registry if registry.enabled else None
+    if metrics is not None and job is not None and job.enqueued_at is not None:
+        lag = (datetime.utcnow() - job.enqueued_at).total_seconds()
+        metrics.observe("async_job_lag_seconds", {"queue": job.origin}, lag)
+
     scope = app.injector.get(RequestScope)
+    failures: List[Tuple[EncodedHandlerCall, Optional[type], Exception]] = []
     scope.enter()
-    connection = app.injector.get(Connection)
     try:
-        with connection.begin():
-            instance = app.injector.create_object(cls)
-            instance(*args, **kwargs)
+        connection = app.injector.get(Connection)
+        for payload in calls:
+            start = time.perf_counter()
+            handler_cls: Optional[type] = None
+            handler_name = "<undecodable>"
+            try:
+                handler_cls, args, kwargs = decode_call(payload)
+                handler_name = handler_cls.__name__
+                with connection.begin():
+                    instance = create_object(app.injector, handler_cls)
+                    instance(*args, **kwargs)
+            except Exception as exc:
+                logger.exception("Async handler %s failed", handler_name)
+                failures.append((payload, handler_cls, exc))
+                if metrics is not None:
+                    metrics.inc("async_handler_failures_total", {"handler": handler_name})
+            finally:
+                if metrics is not None:
+                    duration = time.perf_counter() - start
+                    metrics.observe("async_handler_duration_seconds", {"handler": handler_name}, duration)
+        if failures and job is not None:
+            _retry_or_dead_letter(job, failures, metrics)
     finally:
         scope.exit()
+        if metrics is not None:
+            flush_to_redis(metrics, app.injector.get(Redis))
+
+    if failures and job is None:
+        failed_names = ", ".join(getattr(handler_cls, "__name__", "<undecodable>") for _, handler_cls, _ in failures)
+        raise AsyncHandlersFailed(f"{len(failures)} of {len(calls)} async handlers failed: {failed_names}")
+
+
+def _retry_or_dead_letter(
+    job: Job, failures: List[Tuple[EncodedHandlerCall, Optional[type], Exception]], metrics: Optional[Metrics]
+) -> None:
+    attempt = job.meta.get("attempt", 1)
+    queue = Queue(job.origin, connection=job.connection)
+    dead_letters = Queue(DEAD_LETTER_QUEUE, connection=job.connection)
+    with job.connection.pipeline() as pipe:
+        for payload, handler_cls, exception in failures:
+            handler_name = getattr(handler_cls, "__name__", "<undecodable>")
+            policy = getattr(handler_cls, "RETRY_POLICY", DEFAULT_RETRY_POLICY)
+            if handler_cls is not None and policy.should_retry(attempt, exception):
+                retry_at = datetime.now(timezone.utc) + timedelta(seconds=policy.delay(attempt))
+                retry = queue.create_job(
+                    async_handlers_batch_task,
+                    args=([payload],),
+                    meta={"attempt": attempt + 1},
+                    status=JobStatus.SCHEDULED,
+                )
+                queue.schedule_job(retry, retry_at, pipeline=pipe)
+                logger.info("Async handler %s will be retried at %s", handler_name, retry_at)
+                metric = "async_handler_retries_total"
+            else:
+                dead_letter = dead_letters.create_job(
+                    async_handlers_batch_task,
+                    args=([payload],),
+                    meta={"attempt": attempt, "origin": job.origin, "error": repr(exception)},
+                )
+                dead_letters.enqueue_job(dead_letter, pipeline=pipe)
+                logger.error("Async handler %s gave up after %d attempt(s)", handler_name, attempt)
+                metric = "async_handler_dead_letters_total"
+            if metrics is not None:
+                metrics.inc(metric, {"handler": handler_name})
+        pipe.execute()
@@ -0,0 +1,100 @@
+"""Change counters of auctions, which web app derives ETags of auction endpoints from.
+
+Every auction has a version in Redis, bumped whenever an event changing what the endpoints return is posted:
+WinningBidPlaced (current price), AuctionBegan and AuctionEnded. The list of auctions has its own version,
+bumped together with any auction's. So answering a conditional request needs a single Redis round-trip
+and no query to the auctions table.
+
+Versions are bumped when RequestScope of the request or job which posted the event exits, and only if
+the transaction the event was posted in has committed (see db_infrastructure.after_commit). Web app reads
+them before querying the database. A response is never
+sent with a version newer than its data, at worst with an older one, which only costs one more full response.
+
+A random epoch is stored next to the counters and is part of every ETag. If Redis loses the counters,
+the epoch changes as well and ETags issued before are not mistaken for current ones. Counters must not be
+evicted, so Redis should run with a noeviction or volatile-* policy. Withdrawing bids posts no event
+and leaves versions as they are.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import logging
+import time
+from typing import Iterable, List, Optional, Union
+import uuid
+
+import injector
+from redis import Redis, RedisError
+from sqlalchemy.engine import Connection
+
+from auctions import AuctionBegan, AuctionEnded, WinningBidPlaced
+from db_infrastructure.after_commit import AfterCommit
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AuctionVersion:
+    epoch: str
+    version: int
+    modified_at: Optional[datetime]
+
+
+class AuctionVersions:
+    KEY_PREFIX = "auction-versions"
+    EPOCH_KEY = f"{KEY_PREFIX}:epoch"
+    LIST_KEY = f"{KEY_PREFIX}:list"
+
+    def __init__(self, redis: Redis) -> None:
+        self._redis = redis
+
+    def get(self, auction_id: Optional[int] = None) -> Optional[AuctionVersion]:
+        """Version of the auction or, without `auction_id`, of the list. None if Redis is unavailable."""
+        key = self.LIST_KEY if auction_id is None else f"{self.KEY_PREFIX}:{auction_id}"
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            pipeline.get(self.EPOCH_KEY)
+            pipeline.hmget(key, "version", "modified_at")
+            epoch, (version, modified_at) = pipeline.execute()
+            if epoch is None:
+                self._redis.set(self.EPOCH_KEY, uuid.uuid4().hex[:12], nx=True)
+                epoch = self._redis.get(self.EPOCH_KEY)
+        except RedisError as exc:
+            logger.warning("Auction versions are unavailable, responding unconditionally: %s", exc)
+            return None
+
+        return AuctionVersion(
+            epoch=epoch.decode(),
+            version=int(version or 0),
+            modified_at=datetime.fromtimestamp(int(modified_at), timezone.utc) if modified_at else None,
+        )
+
+    def bump(self, auction_ids: Iterable[int]) -> None:
+        modified_at = int(time.time())
+        pipeline = self._redis.pipeline(transaction=False)
+        for key in [f"{self.KEY_PREFIX}:{auction_id}" for auction_id in auction_ids] + [self.LIST_KEY]:
+            pipeline.hincrby(key, "version", 1)
+            pipeline.hset(key, "modified_at", modified_at)
+        pipeline.execute()
+
+
+class PendingVersionBumps(AfterCommit[int]):
+    """Request scoped auctions whose versions are bumped once the scope exits, if their changes committed."""
+
+    def __init__(self, connection: Connection, versions: AuctionVersions) -> None:
+        super().__init__(connection)
+        self._versions = versions
+
+    def _flush(self, auction_ids: List[int]) -> None:
+        try:
+            self._versions.bump(sorted(set(auction_ids)))
+        except RedisError:
+            logger.exception("Bumping versions of auctions %s failed", sorted(set(auction_ids)))
+
+
+class BumpAuctionVersions:
+    @injector.inject
+    def __init__(self, pending: PendingVersionBumps) -> None:
+        self._pending = pending
+
+    def __call__(self, event: Union[WinningBidPlaced, AuctionBegan, AuctionEnded]) -> None:
+        self._pending.add(event.auction_id)
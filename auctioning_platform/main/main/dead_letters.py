@@ -0,0 +1,79 @@
+"""Inspects and re-drives async handlers' calls that ran out of retry attempts.
+
+    python -m main.dead_letters list [--limit 100]
+    python -m main.dead_letters redrive [--limit N]
+"""
+import argparse
+from typing import Iterator, Optional
+
+from redis import Redis
+from rq import Queue
+from rq.job import Job
+
+from foundation.events import DEFAULT_QUEUE
+
+from main.async_handler_task import DEAD_LETTER_QUEUE, async_handlers_batch_task, decode_call
+
+
+def dead_letters(redis: Redis, limit: Optional[int] = None) -> Iterator[Job]:
+    queue = Queue(DEAD_LETTER_QUEUE, connection=redis)
+    yield from queue.get_jobs(0, -1 if limit is None else limit)
+
+
+def redrive(redis: Redis, limit: Optional[int] = None, batch_size: int = 500) -> int:
+    """Moves dead letters back to queues they came from, giving them a fresh set of attempts.
+
+    Jobs are moved in batches, every batch in a single Redis pipeline.
+    """
+    dead_letters_queue = Queue(DEAD_LETTER_QUEUE, connection=redis)
+    queues = {}
+    redriven = 0
+    while limit is None or redriven < limit:
+        size = batch_size if limit is None else min(batch_size, limit - redriven)
+        jobs = dead_letters_queue.get_jobs(0, size)
+        if not jobs:
+            break
+
+        with redis.pipeline() as pipe:
+            for job in jobs:
+                origin = job.meta.get("origin", DEFAULT_QUEUE)
+                queue = queues.setdefault(origin, Queue(origin, connection=redis))
+                queue.enqueue_job(
+                    queue.create_job(async_handlers_batch_task, args=job.args, meta={"attempt": 1}), pipeline=pipe
+                )
+                job.delete(pipeline=pipe)
+            pipe.execute()
+        redriven += len(jobs)
+    return redriven
+
+
+def describe(job: Job) -> str:
+    """Dead letter as listed. One that cannot be decoded (e.g. its handler was renamed since) is listed too."""
+    try:
+        handlers = ", ".join(decode_call(payload)[0].__name__ for payload in job.args[0])
+    except Exception:
+        handlers = "<undecodable>"
+    return (
+        f"{job.id} {job.created_at:%Y-%m-%d %H:%M:%S} {job.meta.get('origin')} {handlers}\n"
+        f"    after {job.meta.get('attempt')} attempt(s): {job.meta.get('error')}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["list", "redrive"])
+    parser.add_argument("--limit", type=int)
+    args = parser.parse_args()
+
+    from main import bootstrap_app
+
+    redis = bootstrap_app().injector.get(Redis)
+    if args.command == "list":
+        for job in dead_letters(redis, args.limit or 100):
+            print(describe(job))
+    else:
+        print(f"Re-drove {redrive(redis, args.limit)} dead letter(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Publishing price changes of auctions to Redis, which web nodes stream to watching clients (see web_app.live_prices).
+
+Every auction has its own channel. WinningBidPlaced and AuctionEnded are published there, encoded with
+`foundation.event_codec`, when RequestScope of the request or job which posted them exits, and only if
+the transaction they were posted in has committed (see db_infrastructure.after_commit) - a watcher is never
+told about a price which was rolled back. That matters even more as stale updates are told apart by price
+alone (see PriceUpdate.merge), so a price which never was would hide the real ones.
+Pub/sub delivers at most once, subscribers must not rely on getting every message.
+"""
+from dataclasses import dataclass
+import logging
+from typing import List, Optional, Union
+
+import injector
+from redis import Redis, RedisError
+from sqlalchemy.engine import Connection
+
+from foundation import event_codec
+from foundation.value_objects import Money
+
+from auctions import AuctionEnded, WinningBidPlaced
+from db_infrastructure.after_commit import AfterCommit
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "auction-prices:"
+
+PriceEvent = Union[WinningBidPlaced, AuctionEnded]
+
+
+def channel(auction_id: int) -> str:
+    return f"{CHANNEL_PREFIX}{auction_id}"
+
+
+@dataclass(frozen=True)
+class PriceUpdate:
+    auction_id: int
+    current_price: Money
+    ended: bool = False
+
+    @classmethod
+    def from_event(cls, event: PriceEvent) -> "PriceUpdate":
+        if isinstance(event, AuctionEnded):
+            return cls(event.auction_id, event.winning_bid, ended=True)
+        return cls(event.auction_id, event.bid_amount)
+
+    def merge(self, newer: "PriceUpdate") -> "PriceUpdate":
+        """Publishers race, so an update may arrive after one it preceded. Prices of running auctions only
+        go up and an ended auction stays ended, which is enough to tell a stale update apart."""
+        if self.ended:
+            return self
+        if newer.ended or newer.current_price > self.current_price:
+            return newer
+        return self
+
+
+def decode(payload: bytes) -> Optional[PriceUpdate]:
+    try:
+        event = event_codec.decode(payload)
+    except (ValueError, event_codec.UnknownEventType, event_codec.UnsupportedEventVersion):
+        logger.exception("Skipping undecodable price update")
+        return None
+    return PriceUpdate.from_event(event) if isinstance(event, (WinningBidPlaced, AuctionEnded)) else None
+
+
+class PendingPriceUpdates(AfterCommit[PriceEvent]):
+    """Request scoped events published once the scope exits, if their transactions committed."""
+
+    def __init__(self, connection: Connection, redis: Redis) -> None:
+        super().__init__(connection)
+        self._redis = redis
+
+    def _flush(self, events: List[PriceEvent]) -> None:
+        pipeline = self._redis.pipeline(transaction=False)
+        for event in events:
+            pipeline.publish(channel(event.auction_id), event_codec.encode(event))
+        try:
+            pipeline.execute()
+        except RedisError:
+            logger.exception("Publishing price updates of auctions %s failed", [e.auction_id for e in events])
+
+
+class PublishPriceUpdate:
+    @injector.inject
+    def __init__(self, pending: PendingPriceUpdates) -> None:
+        self._pending = pending
+
+    def __call__(self, event: PriceEvent) -> None:
+        self._pending.add(event)
@@ -0,0 +1,58 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+from typing import Any
+
+from redis import Redis
+
+from foundation.metrics import CONTENT_TYPE, Metrics, render
+
+WORKERS_SAMPLES_KEY = "metrics:workers:samples"
+WORKERS_TYPES_KEY = "metrics:workers:types"
+
+
+def flush_to_redis(metrics: Metrics, redis: Redis) -> None:
+    """Adds samples gathered by a short-lived process (e.g. RQ work horse) to totals kept in Redis."""
+    samples, types = metrics.collect(reset=True)
+    if not samples:
+        return
+
+    pipe = redis.pipeline(transaction=False)
+    for key, value in samples.items():
+        pipe.hincrbyfloat(WORKERS_SAMPLES_KEY, key, value)
+    pipe.hset(WORKERS_TYPES_KEY, mapping=types)
+    pipe.execute()
+
+
+def render_from_redis(redis: Redis) -> str:
+    samples = {key.decode(): float(value) for key, value in redis.hgetall(WORKERS_SAMPLES_KEY).items()}
+    types = {key.decode(): value.decode() for key, value in redis.hgetall(WORKERS_TYPES_KEY).items()}
+    return render(samples, types)
+
+
+def serve_workers_metrics(redis: Redis, port: int) -> None:
+    """Exposes metrics of all workers and outbox relays at http://0.0.0.0:<port>/metrics."""
+
+    class MetricsRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+
+            body = render_from_redis(redis).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    ThreadingHTTPServer(("", port), MetricsRequestHandler).serve_forever()
+
+
+if __name__ == "__main__":
+    from main import bootstrap_app
+
+    app = bootstrap_app()
+    serve_workers_metrics(app.injector.get(Redis), int(os.environ.get("METRICS_PORT", "9100")))
@@ -0,0 +1,61 @@
+"""Creates tables and indexes that do not exist yet in the database.
+
+    python -m main.migrate
+
+Schema is not touched when the application starts, so run it before starting web app or workers
+on a fresh database and after deploying code that adds tables, columns or indexes. Changes of existing
+columns are not applied.
+"""
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn
+
+from db_infrastructure import metadata
+
+
+def create_db_schema(engine: Engine) -> None:
+    # Models has to be imported for metadata.create_all to discover them
+    from auctions_infrastructure import auctions, bids  # noqa
+    from customer_relationship.models import customers  # noqa
+    from db_infrastructure.event_store import event_store_checkpoints, events  # noqa
+    from main.outbox import outbox  # noqa
+    from shipping_infrastructure import packages  # noqa
+    from web_app_models import Role, RolesUsers, User  # noqa
+
+    # TODO: Use migrations for that
+    metadata.create_all(engine)
+    _add_missing_columns(engine)
+    _create_missing_indexes(engine)
+
+
+def _add_missing_columns(engine: Engine) -> None:
+    # create_all skips tables that exist, together with columns added to them since (e.g. auctions.version),
+    # which therefore need a server default or to be nullable
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+    for table in metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                engine.execute(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {column_ddl}")
+
+
+def _create_missing_indexes(engine: Engine) -> None:
+    # create_all skips tables that exist, together with indexes added to them since
+    inspector = inspect(engine)
+    for table in metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(engine)
+
+
+def main() -> None:
+    from main import bootstrap_app
+
+    create_db_schema(bootstrap_app().injector.get(Engine))
+
+
+if __name__ == "__main__":
+    main()
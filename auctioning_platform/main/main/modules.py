@@ -1,39 +1,119 @@
-import threading
-from typing import Type
+from contextvars import ContextVar, Token
+import logging
+from typing import Any, Dict, Optional, Type
+import weakref
 
 import injector
 from injector import Provider, T
 from redis import Redis
 from rq import Queue
-from sqlalchemy import event as sqlalchemy_event
 from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session
 
-from foundation.events import EventBus, InjectorEventBus, RunAsyncHandler
-from foundation.locks import Lock, LockFactory
-
+from foundation.events import (
+    Event,
+    EventBus,
+    EventDispatchTable,
+    EventHandlerProvider,
+    Handler,
+    InjectorEventBus,
+    RunAsyncHandler,
+)
+from foundation.locks import Lock, LockFactory, StripedLockFactory
+from foundation.metrics import Metrics
+
+from auctions import AuctionBegan, AuctionEnded, WinningBidPlaced
 from customer_relationship import CustomerRelationshipConfig
-from main.async_handler_task import async_handler_generic_task
-from main.redis import RedisLock
+from db_infrastructure.aio import AsyncDatabase, AsyncReadDatabase, create_async_database
+from db_infrastructure.event_store import EventStore, StoreEventHandler
+from db_infrastructure.pool import PoolConfig, checkout, create_pooled_engine
+from db_infrastructure.replica import ReadConnection, ReadPreference, RecentWrites, ReplicaEngine
+from main.auction_versions import AuctionVersions, BumpAuctionVersions, PendingVersionBumps
+from main.di import PlanningBinder, ProfilingInjector
+from main.live_prices import PendingPriceUpdates, PublishPriceUpdate
+from main.outbox import Outbox
+from main.redis import RedisLock, RedisRecentWrites
 from payments import PaymentsConfig
 
+logger = logging.getLogger(__name__)
+
+
+class _Registry:
+    """Instances of a single request, in the order they were created."""
+
+    def __init__(self, outer: Optional["_Registry"]) -> None:
+        self.providers: Dict[Any, Provider] = {}
+        self.outer = outer  # of the scope this one was entered within
+        self.token: Optional[Token] = None
+        self._finalizer = weakref.finalize(self, _close_leaked, self.providers)
+
+    def close(self) -> None:
+        self._finalizer.detach()
+        _close(self.providers)
+
+
+def _close(providers: Dict[Any, Provider]) -> None:
+    # in reverse, so instances are closed before what they were built from (e.g. session before connection)
+    errors = []
+    for key, provider in reversed(list(providers.items())):
+        try:
+            provider.get(None).close()  # type: ignore
+        except Exception as exc:
+            logger.exception("Closing request scoped %r failed", key)
+            errors.append(exc)
+    providers.clear()
+    if errors:
+        raise errors[0]
+
+
+def _close_leaked(providers: Dict[Any, Provider]) -> None:
+    if providers:
+        logger.warning(
+            "RequestScope was not exited, closing %d leaked instance(s): %s",
+            len(providers),
+            ", ".join(getattr(key, "__name__", repr(key)) for key in providers),
+        )
+        try:
+            _close(providers)
+        except Exception:
+            pass  # already logged, leaked instances must not break anything else
+
 
 class RequestScope(injector.Scope):
-    REGISTRY_KEY = "RequestScopeRegistry"
+    """Scope of a single request or job, kept in a context variable.
+
+    Context variables are local to a thread, a greenlet (greenlet >= 1.0) or an asyncio task,
+    so every request running concurrently in any of them gets its own instances. Tasks created
+    within a request inherit its scope.
+
+    Scopes nest: one entered within another (e.g. a job run inline during a request) gets its own
+    instances and the outer scope's ones are back once it exits.
+
+    On exit instances are closed in reverse order of creation. A scope which is never exited is
+    reported and closed once garbage collected.
+    """
 
     def configure(self) -> None:
-        self._locals = threading.local()
+        self._registry: ContextVar[Optional[_Registry]] = ContextVar(f"request_scope_{id(self)}", default=None)
 
     def enter(self) -> None:
-        assert not hasattr(self._locals, self.REGISTRY_KEY)
-        setattr(self._locals, self.REGISTRY_KEY, {})
+        registry = _Registry(outer=self._registry.get())
+        registry.token = self._registry.set(registry)
 
     def exit(self) -> None:
-        for key, provider in getattr(self._locals, self.REGISTRY_KEY).items():
-            provider.get(self.injector).close()
-            delattr(self._locals, repr(key))
+        registry = self._registry.get()
+        if registry is None:
+            raise Exception("RequestScope exited, but not entered!")
+        try:
+            self._registry.reset(registry.token)  # type: ignore
+        except ValueError:  # entered in a different context, e.g. by a task's parent
+            self._registry.set(registry.outer)
 
-        delattr(self._locals, self.REGISTRY_KEY)
+        try:
+            registry.close()
+        finally:
+            if isinstance(self.injector, ProfilingInjector):
+                self.injector.report()
 
     def __enter__(self) -> None:
         self.enter()
@@ -42,30 +122,82 @@ class RequestScope(injector.Scope):
         self.exit()
 
     def get(self, key: Type[T], provider: Provider[T]) -> Provider[T]:
+        registry = self._registry.get()
+        if registry is None:
+            raise Exception(f"{key} is request scoped, but no RequestScope entered!")
         try:
-            return getattr(self._locals, repr(key))  # type: ignore
-        except AttributeError:
-            provider = injector.InstanceProvider(provider.get(self.injector))
-            setattr(self._locals, repr(key), provider)
-            try:
-                registry = getattr(self._locals, self.REGISTRY_KEY)
-            except AttributeError:
-                raise Exception(f"{key} is request scoped, but no RequestScope entered!")
-            registry[key] = provider
-            return provider
+            return registry.providers[key]
+        except KeyError:
+            instance_provider = injector.InstanceProvider(provider.get(self.injector))
+            registry.providers[key] = instance_provider
+            return instance_provider
 
 
 request = injector.ScopeDecorator(RequestScope)
 
 
 class Db(injector.Module):
-    def __init__(self, engine: Engine) -> None:
-        self._engine = engine
+    """Binds engines of the primary and optional read replica, and request's connections to them.
+
+    See db_infrastructure.replica for how reads are routed. Sessions which wrote within
+    `read_your_writes_window` seconds keep reading from the primary. AsyncDatabase and AsyncReadDatabase
+    are the same databases for the async read path, see db_infrastructure.aio.
+    """
+
+    def __init__(self, dsn: str, replica_dsn: Optional[str] = None, read_your_writes_window: float = 5.0) -> None:
+        self._dsn = dsn
+        self._replica_dsn = replica_dsn
+        self._read_your_writes_window = read_your_writes_window
+
+    @injector.singleton
+    @injector.provider
+    def engine(self, config: PoolConfig, metrics: Metrics) -> Engine:
+        return create_pooled_engine(self._dsn, config, metrics if metrics.enabled else None)
+
+    @injector.singleton
+    @injector.provider
+    def replica_engine(self, inj: injector.Injector, config: PoolConfig, metrics: Metrics) -> ReplicaEngine:
+        if self._replica_dsn is None:
+            return ReplicaEngine(inj.get(Engine))
+        return ReplicaEngine(
+            create_pooled_engine(self._replica_dsn, config, metrics if metrics.enabled else None, "replica")
+        )
 
     @request
     @injector.provider
-    def connection(self) -> Connection:
-        return self._engine.connect()
+    def connection(self, engine: Engine, metrics: Metrics) -> Connection:
+        return checkout(engine, metrics if metrics.enabled else None)
+
+    @injector.singleton
+    @injector.provider
+    def recent_writes(self, redis: Redis) -> RecentWrites:
+        return RedisRecentWrites(redis, self._read_your_writes_window)
+
+    @request
+    @injector.provider
+    def read_preference(self, inj: injector.Injector) -> ReadPreference:
+        if self._replica_dsn is None:
+            return ReadPreference(None)
+        return ReadPreference(inj.get(RecentWrites))
+
+    @request
+    @injector.provider
+    def read_connection(self, inj: injector.Injector, preference: ReadPreference, metrics: Metrics) -> ReadConnection:
+        if not preference.replica_allowed:
+            return ReadConnection(inj.get(Connection))
+        return ReadConnection(checkout(inj.get(ReplicaEngine), metrics if metrics.enabled else None, "replica"))
+
+    @injector.singleton
+    @injector.provider
+    def async_database(self, engine: Engine, config: PoolConfig) -> AsyncDatabase:
+        return create_async_database(self._dsn, engine, config)
+
+    @injector.singleton
+    @injector.provider
+    def async_read_database(self, inj: injector.Injector, config: PoolConfig) -> AsyncReadDatabase:
+        if self._replica_dsn is None:
+            return AsyncReadDatabase(inj.get(AsyncDatabase))
+        return AsyncReadDatabase(create_async_database(self._replica_dsn, inj.get(ReplicaEngine), config))
 
     @request
     @injector.provider
@@ -80,10 +212,32 @@ class RedisMod(injector.Module):
     def configure(self, binder: injector.Binder) -> None:
         binder.bind(Redis, Redis(host=self._redis_host))
 
+
+class LocksMod(injector.Module):
+    """Binds LockFactory to Redis locks, shared by all workers, or to in-process "memory" locks.
+
+    The latter are only correct if all workers and web processes run as threads of a single process.
+    """
+
+    def __init__(self, backend: str = "redis", wait_timeout: float = 0.0) -> None:
+        if backend not in ("redis", "memory"):
+            raise ValueError(f"Unknown locks backend: {backend}")
+        self._backend = backend
+        self._wait_timeout = wait_timeout
+
+    @injector.singleton
     @injector.provider
-    def lock(self, redis: Redis) -> LockFactory:
+    def lock(self, inj: injector.Injector, metrics: Metrics) -> LockFactory:
+        if self._backend == "memory":
+            return StripedLockFactory(wait_timeout=self._wait_timeout)
+
+        redis = inj.get(Redis)
+        enabled_metrics = metrics if metrics.enabled else None
+
         def create_lock(name: str, timeout: int = 30) -> Lock:
-            return RedisLock(redis, name, timeout)
+            return RedisLock(
+                redis, name, timeout, wait_timeout=self._wait_timeout, auto_renew=True, metrics=enabled_metrics
+            )
 
         return create_lock
 
@@ -95,20 +249,80 @@ class Rq(injector.Module):
         queue = Queue(connection=redis)
         return queue
 
+    @request
     @injector.provider
-    def run_async_handler(self, queue: Queue, connection: Connection) -> RunAsyncHandler:
-        def enqueue_after_commit(handler_cls, *args, **kwargs):  # type: ignore
-            sqlalchemy_event.listens_for(connection, "commit")(
-                lambda _conn: queue.enqueue(async_handler_generic_task, handler_cls, *args, **kwargs)
-            )
+    def outbox(self, connection: Connection) -> Outbox:
+        return Outbox(connection)
 
-        return enqueue_after_commit
+    @injector.provider
+    def run_async_handler(self, outbox: Outbox) -> RunAsyncHandler:
+        return outbox.add
 
 
 class EventBusMod(injector.Module):
+    @injector.singleton
     @injector.provider
-    def event_bus(self, inj: injector.Injector, run_async_handler: RunAsyncHandler) -> EventBus:
-        return InjectorEventBus(inj, run_async_handler)
+    def dispatch_table(self, inj: injector.Injector) -> EventDispatchTable:
+        # rebuilt when modules installed later (e.g. by FlaskInjector) bind more handlers
+        binder = inj.binder
+        bindings_version = (lambda: binder.version) if isinstance(binder, PlanningBinder) else None
+        return EventDispatchTable(inj, bindings_version)
+
+    @injector.provider
+    def event_bus(
+        self,
+        inj: injector.Injector,
+        run_async_handler: RunAsyncHandler,
+        dispatch_table: EventDispatchTable,
+        metrics: Metrics,
+    ) -> EventBus:
+        return InjectorEventBus(inj, run_async_handler, dispatch_table, metrics if metrics.enabled else None)
+
+
+class EventStoreMod(injector.Module):
+    @injector.provider
+    def event_store(self, connection: Connection) -> EventStore:
+        return EventStore(connection)
+
+    def configure(self, binder: injector.Binder) -> None:
+        binder.multibind(Handler[Event], to=EventHandlerProvider(StoreEventHandler))
+
+
+class AuctionVersionsMod(injector.Module):
+    @injector.singleton
+    @injector.provider
+    def auction_versions(self, redis: Redis) -> AuctionVersions:
+        return AuctionVersions(redis)
+
+    @request
+    @injector.provider
+    def pending_version_bumps(self, connection: Connection, versions: AuctionVersions) -> PendingVersionBumps:
+        return PendingVersionBumps(connection, versions)
+
+    def configure(self, binder: injector.Binder) -> None:
+        for event_cls in (WinningBidPlaced, AuctionBegan, AuctionEnded):
+            binder.multibind(Handler[event_cls], to=EventHandlerProvider(BumpAuctionVersions))
+
+
+class LivePricesMod(injector.Module):
+    @request
+    @injector.provider
+    def pending_price_updates(self, connection: Connection, redis: Redis) -> PendingPriceUpdates:
+        return PendingPriceUpdates(connection, redis)
+
+    def configure(self, binder: injector.Binder) -> None:
+        for event_cls in (WinningBidPlaced, AuctionEnded):
+            binder.multibind(Handler[event_cls], to=EventHandlerProvider(PublishPriceUpdate))
+
+
+class MetricsMod(injector.Module):
+    def __init__(self, enabled: bool) -> None:
+        self._enabled = enabled
+
+    @injector.singleton
+    @injector.provider
+    def metrics(self) -> Metrics:
+        return Metrics(enabled=self._enabled)
 
 
 class Configs(injector.Module):
@@ -130,3 +344,16 @@ class Configs(injector.Module):
     @injector.provider
     def payments_config(self) -> PaymentsConfig:
         return PaymentsConfig(username=self._settings["payments.login"], password=self._settings["payments.password"])
+
+    @injector.singleton
+    @injector.provider
+    def pool_config(self) -> PoolConfig:
+        return PoolConfig(
+            pool=self._settings["db.pool"],
+            size=self._settings["db.pool_size"],
+            max_overflow=self._settings["db.max_overflow"],
+            timeout=self._settings["db.pool_timeout"],
+            recycle=self._settings["db.pool_recycle"],
+            pre_ping=self._settings["db.pool_pre_ping"],
+            pgbouncer=self._settings["db.pgbouncer"],
+        )
@@ -0,0 +1,138 @@
+from collections import defaultdict
+from datetime import datetime
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import uuid
+
+from redis import Redis
+from rq import Queue
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String, Table, event as sqlalchemy_event, select
+from sqlalchemy.engine import Connection, Engine
+
+from foundation.events import DEFAULT_QUEUE
+from foundation.metrics import Metrics
+
+from db_infrastructure import metadata
+from main.async_handler_task import async_handlers_batch_task, encode_call
+from main.metrics import flush_to_redis
+
+logger = logging.getLogger(__name__)
+
+
+outbox = Table(
+    "outbox",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("batch_id", String(32), nullable=False),
+    Column("queue", String(64), nullable=False, default=DEFAULT_QUEUE),
+    Column("payload", LargeBinary, nullable=False),
+    Column("created_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+
+class Outbox:
+    """Stores async handlers' calls in the outbox table, using the same transaction that caused them.
+
+    Rows written within one transaction share a batch_id, so OutboxRelay
+    can publish them as a single job per queue.
+    """
+
+    def __init__(self, connection: Connection) -> None:
+        self._connection = connection
+        self._batch_id = uuid.uuid4().hex
+        sqlalchemy_event.listen(connection, "commit", self._start_new_batch)
+        sqlalchemy_event.listen(connection, "rollback", self._start_new_batch)
+
+    def add(self, handler_cls: type, *args: Any, queue: str = DEFAULT_QUEUE, **kwargs: Any) -> None:
+        payload = encode_call((handler_cls, args, kwargs))
+        self._connection.execute(outbox.insert(values={"batch_id": self._batch_id, "queue": queue, "payload": payload}))
+
+    def close(self) -> None:
+        sqlalchemy_event.remove(self._connection, "commit", self._start_new_batch)
+        sqlalchemy_event.remove(self._connection, "rollback", self._start_new_batch)
+
+    def _start_new_batch(self, _conn: Connection) -> None:
+        self._batch_id = uuid.uuid4().hex
+
+
+class OutboxRelay:
+    """Moves pending outbox rows to RQ.
+
+    Rows are read in batches of `batch_size` and published through a single Redis pipeline,
+    one job per original transaction and queue. Rows are deleted in the same DB transaction
+    they were read in, after the pipeline has been executed, so delivery is at-least-once.
+
+    On PostgreSQL rows are claimed with FOR UPDATE SKIP LOCKED, so many relays can run in parallel.
+    Other databases (e.g. SQLite) have no row locks - run a single relay there.
+
+    With metrics, time rows spent in the outbox is recorded and added to workers' totals in Redis.
+    """
+
+    def __init__(self, engine: Engine, redis: Redis, batch_size: int = 500, metrics: Optional[Metrics] = None) -> None:
+        self._engine = engine
+        self._redis = redis
+        self._batch_size = batch_size
+        self._metrics = metrics
+        self._queues: Dict[str, Queue] = {}
+
+    def relay_pending(self) -> int:
+        with self._engine.begin() as connection:
+            query = select([outbox.c.id, outbox.c.batch_id, outbox.c.queue, outbox.c.payload, outbox.c.created_at])
+            query = query.order_by(outbox.c.id).limit(self._batch_size)
+            if connection.dialect.name == "postgresql":
+                query = query.with_for_update(skip_locked=True)
+            rows = connection.execute(query).fetchall()
+            if not rows:
+                return 0
+
+            calls_by_batch: Dict[Tuple[str, str], List[bytes]] = defaultdict(list)
+            for row in rows:
+                calls_by_batch[(row.batch_id, row.queue)].append(row.payload)
+
+            with self._redis.pipeline() as pipe:
+                for (_batch_id, queue_name), calls in calls_by_batch.items():
+                    queue = self._get_queue(queue_name)
+                    job = queue.create_job(async_handlers_batch_task, args=(calls,))
+                    queue.enqueue_job(job, pipeline=pipe)
+                pipe.execute()
+
+            connection.execute(outbox.delete().where(outbox.c.id.in_([row.id for row in rows])))
+
+        if self._metrics is not None:
+            now = datetime.utcnow()
+            for row in rows:
+                self._metrics.observe("outbox_lag_seconds", {}, (now - row.created_at).total_seconds())
+            flush_to_redis(self._metrics, self._redis)
+        return len(rows)
+
+    def _get_queue(self, name: str) -> Queue:
+        try:
+            return self._queues[name]
+        except KeyError:
+            queue = self._queues[name] = Queue(name, connection=self._redis)
+            return queue
+
+    def run(self, poll_interval: float = 0.5) -> None:
+        while True:
+            try:
+                relayed = self.relay_pending()
+            except Exception:
+                logger.exception("Relaying outbox failed")
+                relayed = 0
+
+            if relayed < self._batch_size:
+                time.sleep(poll_interval)
+
+
+def run_relay() -> None:
+    from main import bootstrap_app
+
+    app = bootstrap_app()
+    metrics = app.injector.get(Metrics)
+    relay = OutboxRelay(app.injector.get(Engine), app.injector.get(Redis), metrics=metrics if metrics.enabled else None)
+    relay.run()
+
+
+if __name__ == "__main__":
+    run_relay()
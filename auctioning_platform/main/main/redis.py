@@ -1,27 +1,138 @@
+import logging
+import random
+import threading
+import time
 from types import TracebackType
-from typing import Optional, Type
+from typing import Hashable, Optional, Type
+import uuid
 
 from redis import StrictRedis
 from typing_extensions import Literal
 
 from foundation.locks import AlreadyLocked, Lock
+from foundation.metrics import Metrics
+
+from db_infrastructure.replica import RecentWrites
+
+logger = logging.getLogger(__name__)
+
+# both scripts act only if the lock still holds our token - it might have expired and been taken by someone else
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
 
 
 class RedisLock(Lock):
-    LOCK_VALUE = "LOCKED"
+    """Lock owned by a random token stored under lock's name, which expires after `timeout` seconds.
+
+    If the lock is taken, `__enter__` keeps retrying with jittered exponential backoff for up to
+    `wait_timeout` seconds before raising AlreadyLocked. With `auto_renew`, expiration is pushed back
+    every third of the timeout while the lock is held, so long steps do not lose it halfway.
+    Only the owner can release or renew the lock.
+    """
 
-    def __init__(self, redis: StrictRedis, name: str, timeout: int = 30) -> None:
+    MIN_BACKOFF = 0.005
+    MAX_BACKOFF = 0.25
+
+    def __init__(
+        self,
+        redis: StrictRedis,
+        name: str,
+        timeout: int = 30,
+        wait_timeout: float = 0.0,
+        auto_renew: bool = False,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
         self._redis = redis
         self._lock_name = name
         self._timeout = timeout
+        self._wait_timeout = wait_timeout
+        self._auto_renew = auto_renew
+        self._metrics = metrics
+        self._release = redis.register_script(RELEASE_SCRIPT)
+        self._renew = redis.register_script(RENEW_SCRIPT)
+        self._token: Optional[str] = None
+        self._stop_renewing = threading.Event()
+        self._renewer: Optional[threading.Thread] = None
 
     def __enter__(self) -> None:
-        if not self._redis.set(self._lock_name, self.LOCK_VALUE, nx=True, ex=self._timeout):
-            raise AlreadyLocked
+        token = uuid.uuid4().hex
+        start = time.monotonic()
+        deadline = start + self._wait_timeout
+        backoff = self.MIN_BACKOFF
+        contended = False
+        while not self._redis.set(self._lock_name, token, nx=True, ex=self._timeout):
+            if not contended:
+                contended = True
+                self._inc("lock_contentions_total")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._observe_wait(start, "timeout")
+                raise AlreadyLocked
+            time.sleep(min(remaining, random.uniform(self.MIN_BACKOFF, backoff)))
+            backoff = min(self.MAX_BACKOFF, backoff * 2)
+
+        self._observe_wait(start, "acquired")
+        self._token = token
+        if self._auto_renew:
+            self._stop_renewing.clear()
+            self._renewer = threading.Thread(target=self._keep_renewing, name=f"renew-{self._lock_name}", daemon=True)
+            self._renewer.start()
 
     def __exit__(
         self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]
     ) -> Literal[False]:
-        if exc_type != AlreadyLocked:
-            self._redis.delete(self._lock_name)
+        if self._token is None:
+            return False
+        if self._renewer is not None:
+            self._stop_renewing.set()
+            self._renewer.join()
+            self._renewer = None
+        if not self._release(keys=[self._lock_name], args=[self._token]):
+            logger.warning("Lock %s expired before it was released", self._lock_name)
+        self._token = None
         return False
+
+    def _keep_renewing(self) -> None:
+        while not self._stop_renewing.wait(self._timeout / 3):
+            try:
+                renewed = self._renew(keys=[self._lock_name], args=[self._token, self._timeout * 1000])
+            except Exception:
+                logger.exception("Failed to renew lock %s", self._lock_name)
+                continue
+            if not renewed:
+                logger.warning("Lock %s was lost before renewal", self._lock_name)
+                return
+
+    def _inc(self, name: str) -> None:
+        if self._metrics is not None:
+            self._metrics.inc(name, {})
+
+    def _observe_wait(self, start: float, outcome: str) -> None:
+        if self._metrics is not None:
+            self._metrics.observe("lock_wait_seconds", {"outcome": outcome}, time.monotonic() - start)
+
+
+class RedisRecentWrites(RecentWrites):
+    """Marks are keys expiring after `window` seconds, shared by all web processes."""
+
+    KEY_PREFIX = "recent-write:"
+
+    def __init__(self, redis: StrictRedis, window: float) -> None:
+        self._redis = redis
+        self._window_ms = int(window * 1000)
+
+    def mark(self, session: Hashable) -> None:
+        self._redis.set(f"{self.KEY_PREFIX}{session}", 1, px=self._window_ms)
+
+    def wrote_recently(self, session: Hashable) -> bool:
+        return bool(self._redis.exists(f"{self.KEY_PREFIX}{session}"))
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+import random
+from typing import List
+
+from fakeredis import FakeRedis
+import pytest
+from rq import Queue
+from rq.job import Job
+
+from foundation.retries import RetryPolicy
+
+from main.async_handler_task import _retry_or_dead_letter, async_handlers_batch_task, decode_call, encode_call
+from main.dead_letters import dead_letters, describe, redrive
+
+
+class Flaky:
+    RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=10.0)
+
+    def __call__(self, number: int) -> None:
+        pass
+
+
+@pytest.fixture()
+def redis() -> FakeRedis:
+    return FakeRedis()
+
+
+@pytest.fixture(autouse=True)
+def longest_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(random, "uniform", lambda _low, high: high)
+
+
+def failed_job(redis: FakeRedis, payloads: List[bytes], attempt: int) -> Job:
+    queue = Queue("default", connection=redis)
+    return queue.enqueue_call(async_handlers_batch_task, args=(payloads,), meta={"attempt": attempt})
+
+
+@pytest.mark.parametrize("attempt, delay", [(1, 10), (2, 20)])
+def test_schedules_retry_with_backoff(redis: FakeRedis, attempt: int, delay: int) -> None:
+    payload = encode_call((Flaky, (1,), {}))
+    job = failed_job(redis, [payload], attempt)
+
+    before = datetime.now(timezone.utc).replace(microsecond=0)
+    _retry_or_dead_letter(job, [(payload, Flaky, ValueError())], None)
+
+    registry = Queue("default", connection=redis).scheduled_job_registry
+    [retry_id] = registry.get_job_ids()
+    retry = Job.fetch(retry_id, connection=redis)
+    assert retry.args == ([payload],)
+    assert retry.meta == {"attempt": attempt + 1}
+    assert (
+        before + timedelta(seconds=delay)
+        <= registry.get_scheduled_time(retry_id)
+        <= before + timedelta(seconds=delay + 1)
+    )
+    assert list(dead_letters(redis)) == []
+
+
+def test_moves_call_to_dead_letters_after_max_attempts(redis: FakeRedis) -> None:
+    payload = encode_call((Flaky, (1,), {}))
+    job = failed_job(redis, [payload], 3)
+
+    _retry_or_dead_letter(job, [(payload, Flaky, ValueError("still failing"))], None)
+
+    [dead_letter] = dead_letters(redis)
+    assert dead_letter.args == ([payload],)
+    assert dead_letter.meta == {"attempt": 3, "origin": "default", "error": "ValueError('still failing')"}
+    assert Queue("default", connection=redis).scheduled_job_registry.get_job_ids() == []
+
+
+def test_undecodable_call_goes_to_dead_letters_at_once(redis: FakeRedis) -> None:
+    job = failed_job(redis, [b"missing.module:Handler\n"], 1)
+
+    _retry_or_dead_letter(job, [(b"missing.module:Handler\n", None, ImportError())], None)
+
+    assert len(list(dead_letters(redis))) == 1
+
+
+def test_redrive_enqueues_dead_letters_to_their_queues_with_fresh_attempts(redis: FakeRedis) -> None:
+    payloads = [encode_call((Flaky, (number,), {})) for number in range(3)]
+    for payload in payloads:
+        _retry_or_dead_letter(failed_job(redis, [payload], 3), [(payload, Flaky, ValueError())], None)
+    Queue("default", connection=redis).empty()
+
+    assert redrive(redis, batch_size=2) == 3
+
+    redriven = Queue("default", connection=redis).get_jobs()
+    assert [job.args for job in redriven] == [([payload],) for payload in payloads]
+    assert all(job.meta == {"attempt": 1} for job in redriven)
+    assert decode_call(redriven[0].args[0][0]) == (Flaky, (0,), {})
+    assert list(dead_letters(redis)) == []
+
+
+def test_redrive_respects_limit(redis: FakeRedis) -> None:
+    for number in range(3):
+        payload = encode_call((Flaky, (number,), {}))
+        _retry_or_dead_letter(failed_job(redis, [payload], 3), [(payload, Flaky, ValueError())], None)
+
+    assert len(list(dead_letters(redis, limit=2))) == 2
+    assert redrive(redis, limit=2) == 2
+
+    assert len(list(dead_letters(redis))) == 1
+    assert len(Queue("default", connection=redis).get_jobs()) == 3 + 2
+
+
+def test_describes_undecodable_dead_letter(redis: FakeRedis) -> None:
+    payload = b"missing.module:Handler\n"
+    _retry_or_dead_letter(failed_job(redis, [payload], 1), [(payload, None, ImportError())], None)
+    payload = encode_call((Flaky, (1,), {}))
+    _retry_or_dead_letter(failed_job(redis, [payload], 3), [(payload, Flaky, ValueError())], None)
+
+    undecodable, decodable = [describe(job) for job in dead_letters(redis)]
+
+    assert "default <undecodable>\n    after 1 attempt(s): ImportError()" in undecodable
+    assert "default Flaky\n    after 3 attempt(s): ValueError()" in decodable
@@ -0,0 +1,178 @@
+from dataclasses import dataclass
+import gc
+import logging
+from typing import List, Type
+from unittest.mock import Mock
+import weakref
+
+import injector
+import pytest
+
+from foundation.events import Event, EventBus, EventHandlerProvider, Handler as EventHandler, RunAsyncHandler
+from foundation.metrics import Metrics
+
+from main.di import PlannedProvider, PlanningInjector, ProfilingInjector, create_object, plan_types
+from main.modules import EventBusMod
+
+
+class Settings:
+    pass
+
+
+class Clock:
+    pass
+
+
+class Repository:
+    def __init__(self, settings: Settings, clock: Clock) -> None:
+        self.settings = settings
+        self.clock = clock
+
+
+class OtherRepository(Repository):
+    @injector.inject
+    def __init__(self, settings: Settings, clock: Clock) -> None:
+        super().__init__(settings, clock)
+
+
+class UseCase:
+    @injector.inject
+    def __init__(self, repo: Repository, clock: Clock) -> None:
+        self.repo = repo
+        self.clock = clock
+
+
+class Handler:
+    @injector.inject
+    def __init__(self, use_case: UseCase, inj: injector.Injector) -> None:
+        self.use_case = use_case
+        self.injector = inj
+
+
+class Module(injector.Module):
+    def configure(self, binder: injector.Binder) -> None:
+        binder.bind(Settings, to=Settings())
+        binder.bind(Clock, scope=injector.singleton)
+        binder.bind(UseCase)
+
+    @injector.provider
+    def repository(self, settings: Settings, clock: Clock) -> Repository:
+        return Repository(settings, clock)
+
+
+class Cyclic:
+    @injector.inject
+    def __init__(self, other: "Cyclic") -> None:
+        pass
+
+
+@pytest.fixture()
+def container() -> PlanningInjector:
+    return PlanningInjector([Module()], auto_bind=False)
+
+
+def assert_same_objects(planned: Handler, created: Handler) -> None:
+    assert type(planned) is type(created)
+    assert type(planned.use_case.repo) is type(created.use_case.repo)
+    assert planned.use_case is not created.use_case
+    assert planned.use_case.repo is not created.use_case.repo
+    assert planned.use_case.repo.settings is created.use_case.repo.settings
+    assert planned.use_case.clock is created.use_case.clock is created.use_case.repo.clock
+    assert planned.injector is created.injector
+
+
+def test_plan_creates_same_objects_as_injector(container: PlanningInjector) -> None:
+    assert_same_objects(create_object(container, Handler), container.create_object(Handler))
+    assert_same_objects(create_object(container, Handler), container.create_object(Handler))
+
+
+def test_planned_type_resolves_same_objects_as_injector(container: PlanningInjector) -> None:
+    unplanned = container.get(UseCase)
+
+    plan_types(container, [UseCase])
+    planned = container.get(UseCase)
+
+    assert isinstance(container.binder.get_binding(UseCase)[0].provider, PlannedProvider)
+    assert type(planned.repo) is type(unplanned.repo)
+    assert planned.repo is not unplanned.repo
+    assert planned.clock is unplanned.clock
+
+
+def test_plan_is_recompiled_when_binding_is_replaced(container: PlanningInjector) -> None:
+    create_object(container, Handler)
+
+    container.binder.bind(Repository, to=OtherRepository)
+
+    assert type(create_object(container, Handler).use_case.repo) is OtherRepository
+    assert type(container.create_object(Handler).use_case.repo) is OtherRepository
+
+
+def test_plan_is_recompiled_when_binding_is_added() -> None:
+    container = PlanningInjector([], auto_bind=False)
+    with pytest.raises(injector.UnsatisfiedRequirement):
+        create_object(container, UseCase)
+
+    container.binder.install(Module())
+
+    assert isinstance(create_object(container, UseCase), UseCase)
+
+
+def test_detects_circular_dependency() -> None:
+    container = PlanningInjector([lambda binder: binder.bind(Cyclic)], auto_bind=False)
+
+    with pytest.raises(injector.CircularDependency):
+        create_object(container, Cyclic)
+
+
+def test_plans_do_not_outlive_injector() -> None:
+    container = PlanningInjector([Module()], auto_bind=False)
+    plan_types(container, [UseCase])
+    create_object(container, Handler)
+    collected = weakref.ref(container)
+
+    del container
+    gc.collect()
+
+    assert collected() is None
+
+
+def test_profiling_injector_reports_resolutions_of_current_context(caplog: pytest.LogCaptureFixture) -> None:
+    container = ProfilingInjector([Module()], auto_bind=False)
+    create_object(container, Handler)
+
+    with caplog.at_level(logging.INFO, logger="main.di"):
+        container.report()
+        container.report()
+
+    assert len(caplog.records) == 1
+    assert "Handler: 1x" in caplog.text
+    assert "Repository: 1x" in caplog.text
+
+
+@dataclass(frozen=True)
+class Pinged(Event):
+    pass
+
+
+PINGS: List[Pinged] = []
+
+
+class RecordPing:
+    def __call__(self, event: Pinged) -> None:
+        PINGS.append(event)
+
+
+@pytest.mark.parametrize("injector_cls", [PlanningInjector, ProfilingInjector])
+def test_event_bus_calls_handlers_bound_by_modules_installed_later(injector_cls: Type[injector.Injector]) -> None:
+    def configure(binder: injector.Binder) -> None:
+        binder.bind(Metrics, to=Metrics(enabled=False))
+        binder.bind(RunAsyncHandler, to=injector.InstanceProvider(Mock()))
+
+    container = injector_cls([configure, EventBusMod()], auto_bind=False)
+    PINGS.clear()
+    container.get(EventBus).post(Pinged())
+
+    container.binder.install(lambda binder: binder.multibind(EventHandler[Pinged], to=EventHandlerProvider(RecordPing)))
+    container.get(EventBus).post(Pinged())
+
+    assert PINGS == [Pinged()]
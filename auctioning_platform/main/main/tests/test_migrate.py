@@ -0,0 +1,21 @@
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+from main.migrate import create_db_schema
+
+
+def test_adds_columns_missing_in_existing_tables() -> None:
+    engine: Engine = create_engine("sqlite://", poolclass=StaticPool)
+    engine.execute(
+        "CREATE TABLE auctions (id INTEGER PRIMARY KEY, title VARCHAR(50), starting_price NUMERIC, "
+        "current_price NUMERIC, ends_at TIMESTAMP, ended BOOLEAN NOT NULL)"
+    )
+    engine.execute("INSERT INTO auctions VALUES (1, 'Socks', 1, 1, '2030-01-01 00:00:00', 0)")
+
+    create_db_schema(engine)
+    create_db_schema(engine)  # nothing left to add
+
+    assert "version" in {column["name"] for column in inspect(engine).get_columns("auctions")}
+    assert engine.execute("SELECT version FROM auctions").scalar() == 1
+    assert "ix_auctions_ends_at_id" in {index["name"] for index in inspect(engine).get_indexes("auctions")}
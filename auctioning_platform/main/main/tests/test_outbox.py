@@ -0,0 +1,160 @@
+from dataclasses import dataclass
+from typing import Iterator
+
+from fakeredis import FakeRedis, FakeServer
+import injector
+import pytest
+from redis import ConnectionError, Redis
+from rq import Queue
+from sqlalchemy import create_engine, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import StaticPool
+
+from foundation.events import AsyncEventHandlerProvider, AsyncHandler, Event, EventBus
+from foundation.metrics import Metrics
+
+from main.async_handler_task import async_handlers_batch_task, decode_call
+from main.modules import EventBusMod, RequestScope, Rq, request
+from main.outbox import Outbox, OutboxRelay, outbox
+
+
+class Handler:
+    def __call__(self, number: int) -> None:
+        pass
+
+
+@dataclass(frozen=True)
+class Ticked(Event):
+    number: int
+
+
+class OnTicked:
+    def __call__(self, event: Ticked) -> None:
+        pass
+
+
+class AlsoOnTicked(OnTicked):
+    pass
+
+
+@pytest.fixture()
+def engine() -> Iterator[Engine]:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    outbox.create(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def connection(engine: Engine) -> Iterator[Connection]:
+    connection = engine.connect()
+    yield connection
+    connection.close()
+
+
+@pytest.fixture()
+def server() -> FakeServer:
+    return FakeServer()
+
+
+def batch_ids(connection: Connection) -> list:
+    return [row.batch_id for row in connection.execute(select([outbox.c.batch_id]).order_by(outbox.c.id))]
+
+
+def test_rows_of_one_transaction_share_batch_and_next_transaction_starts_new_one(connection: Connection) -> None:
+    box = Outbox(connection)
+    with connection.begin():
+        box.add(Handler, 1)
+        box.add(Handler, 2)
+    with connection.begin():
+        box.add(Handler, 3)
+    box.close()
+
+    first, second, third = batch_ids(connection)
+    assert first == second != third
+
+
+def test_rows_of_rolled_back_transaction_are_discarded_and_batch_rotated(connection: Connection) -> None:
+    box = Outbox(connection)
+    transaction = connection.begin()
+    box.add(Handler, 1)
+    transaction.rollback()
+    with connection.begin():
+        box.add(Handler, 2)
+    box.close()
+
+    assert len(batch_ids(connection)) == 1
+    payload = connection.execute(select([outbox.c.payload])).scalar()
+    assert decode_call(payload) == (Handler, (2,), {})
+
+
+def test_relay_enqueues_job_per_batch_and_queue_and_deletes_rows(
+    engine: Engine, connection: Connection, server: FakeServer
+) -> None:
+    box = Outbox(connection)
+    with connection.begin():
+        box.add(Handler, 1)
+        box.add(Handler, 2)
+        box.add(Handler, 3, queue="other")
+    with connection.begin():
+        box.add(Handler, 4)
+    box.close()
+    redis = FakeRedis(server=server)
+
+    assert OutboxRelay(engine, redis).relay_pending() == 4
+
+    default_jobs = Queue(connection=redis).jobs
+    other_jobs = Queue("other", connection=redis).jobs
+    assert sorted(len(job.args[0]) for job in default_jobs) == [1, 2]
+    assert [len(job.args[0]) for job in other_jobs] == [1]
+    assert all(job.func is async_handlers_batch_task for job in default_jobs + other_jobs)
+    assert batch_ids(connection) == []
+    assert OutboxRelay(engine, redis).relay_pending() == 0
+
+
+def test_relay_keeps_rows_if_publishing_fails(engine: Engine, connection: Connection, server: FakeServer) -> None:
+    box = Outbox(connection)
+    with connection.begin():
+        box.add(Handler, 1)
+    box.close()
+    server.connected = False
+
+    with pytest.raises(ConnectionError):
+        OutboxRelay(engine, FakeRedis(server=server)).relay_pending()
+
+    assert len(batch_ids(connection)) == 1
+    server.connected = True
+    assert OutboxRelay(engine, FakeRedis(server=server)).relay_pending() == 1
+    assert batch_ids(connection) == []
+
+
+def test_async_handlers_posted_within_one_request_are_enqueued_as_one_job(engine: Engine, server: FakeServer) -> None:
+    redis = FakeRedis(server=server)
+
+    def configure(binder: injector.Binder) -> None:
+        binder.bind(Redis, to=redis)
+        binder.bind(Metrics, to=Metrics(enabled=False))
+        binder.bind(Connection, to=injector.CallableProvider(engine.connect), scope=request)
+        binder.multibind(AsyncHandler[Ticked], to=AsyncEventHandlerProvider(OnTicked))
+        binder.multibind(AsyncHandler[Ticked], to=AsyncEventHandlerProvider(AlsoOnTicked))
+
+    container = injector.Injector([configure, Rq(), EventBusMod()], auto_bind=False)
+    scope = container.get(RequestScope)
+    for numbers in ((1, 2), (3,)):
+        with scope:
+            with container.get(Connection).begin():
+                for number in numbers:
+                    container.get(EventBus).post(Ticked(number))
+
+    assert OutboxRelay(engine, redis).relay_pending() == 6
+
+    jobs = sorted(Queue(connection=redis).jobs, key=lambda job: len(job.args[0]))
+    assert [[decode_call(payload) for payload in job.args[0]] for job in jobs] == [
+        [(OnTicked, (Ticked(3),), {}), (AlsoOnTicked, (Ticked(3),), {})],
+        [
+            (OnTicked, (Ticked(1),), {}),
+            (AlsoOnTicked, (Ticked(1),), {}),
+            (OnTicked, (Ticked(2),), {}),
+            (AlsoOnTicked, (Ticked(2),), {}),
+        ],
+    ]
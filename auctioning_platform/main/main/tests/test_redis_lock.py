@@ -0,0 +1,69 @@
+import time
+
+from fakeredis import FakeRedis
+import pytest
+
+from foundation.locks import AlreadyLocked
+
+from main.redis import RedisLock
+
+
+@pytest.fixture()
+def redis() -> FakeRedis:
+    return FakeRedis()
+
+
+def test_lock_is_released_on_exit(redis: FakeRedis) -> None:
+    with RedisLock(redis, "lock"):
+        assert redis.get("lock") is not None
+
+    assert redis.get("lock") is None
+
+
+def test_lock_of_another_owner_is_not_released(redis: FakeRedis) -> None:
+    lock = RedisLock(redis, "lock", timeout=1)
+    lock.__enter__()
+    redis.set("lock", "someone else's token")  # ours expired and another owner took the lock
+
+    lock.__exit__(None, None, None)
+
+    assert redis.get("lock") == b"someone else's token"
+
+
+def test_waits_for_lock_up_to_wait_timeout(redis: FakeRedis) -> None:
+    redis.set("lock", "someone else's token")
+    lock = RedisLock(redis, "lock", wait_timeout=0.05)
+
+    start = time.monotonic()
+    with pytest.raises(AlreadyLocked):
+        lock.__enter__()
+
+    assert 0.05 <= time.monotonic() - start < 1
+
+
+def test_gets_lock_released_while_waiting(redis: FakeRedis) -> None:
+    redis.set("lock", "someone else's token", px=30)
+
+    with RedisLock(redis, "lock", wait_timeout=1):
+        pass
+
+
+def test_renewal_extends_expiration_until_released(redis: FakeRedis) -> None:
+    lock = RedisLock(redis, "lock", timeout=1, auto_renew=True)
+    with lock:
+        time.sleep(0.4)  # renewed after a third of the timeout
+        assert redis.pttl("lock") > 900
+        renewer = lock._renewer
+
+    assert renewer is not None and not renewer.is_alive()
+    assert redis.get("lock") is None
+
+
+def test_renewal_stops_once_lock_is_lost(redis: FakeRedis) -> None:
+    lock = RedisLock(redis, "lock", timeout=1, auto_renew=True)
+    with lock:
+        renewer = lock._renewer
+        redis.set("lock", "someone else's token")
+        renewer.join(1)  # type: ignore
+        assert not renewer.is_alive()  # type: ignore
+        assert redis.ttl("lock") == -1  # not renewed with our timeout
@@ -0,0 +1,96 @@
+from typing import Iterator, List, Tuple
+
+from fakeredis import FakeRedis
+import injector
+import pytest
+from redis import Redis
+from rq import Queue, SimpleWorker
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import StaticPool
+
+from foundation.metrics import Metrics
+
+import main
+from main import AppContext, async_handler_task
+from main.async_handler_task import app_context, async_handlers_batch_task
+from main.modules import RequestScope, request
+
+
+class JobResource:
+    """Request scoped, to tell jobs' scopes apart."""
+
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+RUNS: List[Tuple[AppContext, JobResource]] = []
+
+
+class RecordRun:
+    @injector.inject
+    def __init__(self, resource: JobResource) -> None:
+        self._resource = resource
+
+    def __call__(self, job_number: int) -> None:
+        assert not self._resource.closed
+        RUNS.append((app_context(), self._resource))
+
+
+class WorkerMod(injector.Module):
+    def __init__(self, engine: Engine, redis: Redis) -> None:
+        self._engine = engine
+        self._redis = redis
+
+    def configure(self, binder: injector.Binder) -> None:
+        binder.bind(Redis, to=self._redis)
+        binder.bind(Metrics, to=Metrics(enabled=False))
+        binder.bind(JobResource, to=JobResource, scope=request)
+
+    @request
+    @injector.provider
+    def connection(self) -> Connection:
+        return self._engine.connect()
+
+
+@pytest.fixture()
+def redis() -> FakeRedis:
+    return FakeRedis()
+
+
+@pytest.fixture()
+def bootstraps(monkeypatch: pytest.MonkeyPatch, redis: FakeRedis) -> Iterator[List[AppContext]]:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    bootstrapped: List[AppContext] = []
+
+    def bootstrap_app() -> AppContext:
+        bootstrapped.append(AppContext(injector.Injector([WorkerMod(engine, redis)])))
+        return bootstrapped[-1]
+
+    monkeypatch.setattr(main, "bootstrap_app", bootstrap_app)
+    monkeypatch.setattr(async_handler_task, "_app_context", None)
+    RUNS.clear()
+    yield bootstrapped
+    RUNS.clear()
+    engine.dispose()
+
+
+def test_jobs_reuse_bootstrapped_app_with_fresh_request_scope_each(
+    redis: FakeRedis, bootstraps: List[AppContext]
+) -> None:
+    queue = Queue("default", connection=redis)
+    for job_number in (1, 2):
+        queue.enqueue(async_handlers_batch_task, [(RecordRun, (job_number,), {})])
+
+    SimpleWorker([queue], connection=redis).work(burst=True)
+
+    [app] = bootstraps
+    [(first_app, first_resource), (second_app, second_resource)] = RUNS
+    assert first_app is second_app is app
+    assert first_resource is not second_resource
+    assert first_resource.closed and second_resource.closed
+    with pytest.raises(Exception, match="no RequestScope entered"):
+        app.injector.get(RequestScope).get(JobResource, injector.ClassProvider(JobResource))
@@ -0,0 +1,33 @@
+"""Runs RQ worker for async handlers.
+
+    python -m main.worker [queue ...]
+
+Without arguments, worker listens on all ASYNC_HANDLERS_QUEUES and always takes the next job
+from the highest-priority queue that is not empty. Pass queue names to run dedicated workers,
+e.g. `python -m main.worker high` keeps capacity reserved for sagas and payments.
+
+Worker is warm: application is bootstrapped once, when the worker starts, and jobs run in the worker
+process itself instead of a forked work horse, so they reuse the engine's connection pool, Redis
+client and the injector. Each job gets a fresh RequestScope. Run several workers to use more cores.
+
+Workers run RQ's scheduler, which enqueues retries of failed handlers when their time comes.
+"""
+import sys
+from typing import Sequence
+
+from redis import Redis
+from rq import Queue, SimpleWorker
+
+from foundation.events import ASYNC_HANDLERS_QUEUES
+
+from main.async_handler_task import app_context
+
+
+def run_worker(queue_names: Sequence[str] = ASYNC_HANDLERS_QUEUES) -> None:
+    redis = app_context().injector.get(Redis)
+    worker = SimpleWorker([Queue(name, connection=redis) for name in queue_names], connection=redis)
+    worker.work(with_scheduler=True)
+
+
+if __name__ == "__main__":
+    run_worker(sys.argv[1:] or ASYNC_HANDLERS_QUEUES)
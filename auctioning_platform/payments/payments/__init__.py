@@ -1,8 +1,9 @@
 import injector
 from sqlalchemy.engine import Connection
 
-from foundation.events import AsyncEventHandlerProvider, AsyncHandler, EventBus
+from foundation.events import HIGH_PRIORITY_QUEUE, AsyncEventHandlerProvider, AsyncHandler, EventBus
 
+from payments.api import ApiConsumer
 from payments.config import PaymentsConfig
 from payments.events import PaymentCaptured, PaymentCharged, PaymentFailed, PaymentStarted
 from payments.facade import PaymentsFacade
@@ -22,12 +23,21 @@ __all__ = [
 
 
 class Payments(injector.Module):
+    @injector.singleton
     @injector.provider
-    def facade(self, config: PaymentsConfig, connection: Connection, event_bus: EventBus) -> PaymentsFacade:
-        return PaymentsFacade(config, connection, event_bus)
+    def api_consumer(self, config: PaymentsConfig) -> ApiConsumer:
+        return ApiConsumer(config.username, config.password)
+
+    @injector.provider
+    def facade(
+        self, config: PaymentsConfig, connection: Connection, event_bus: EventBus, api_consumer: ApiConsumer
+    ) -> PaymentsFacade:
+        return PaymentsFacade(config, connection, event_bus, api_consumer)
 
     def configure(self, binder: injector.Binder) -> None:
-        binder.multibind(AsyncHandler[PaymentCharged], to=AsyncEventHandlerProvider(PaymentChargedHandler))
+        binder.multibind(
+            AsyncHandler[PaymentCharged], to=AsyncEventHandlerProvider(PaymentChargedHandler, queue=HIGH_PRIORITY_QUEUE)
+        )
 
 
 class PaymentChargedHandler:
@@ -1,7 +1,5 @@
 from typing import Tuple, Type, TypeVar
 
-import requests
-
 from foundation.value_objects import Money
 
 from payments.api.exceptions import PaymentFailedError
@@ -26,6 +24,8 @@ class ApiConsumer:
         self._execute_request(request, CaptureResponse)
 
     def _execute_request(self, request: Request, response_cls: Type[ResponseCls]) -> ResponseCls:
+        import requests  # imported on first request, it is slow to import and not needed by most processes
+
         response = requests.post(request.url, auth=self.auth, data=request.to_params())
         if not response.ok:
             raise PaymentFailedError
@@ -1,28 +1,45 @@
 from dataclasses import dataclass
 from uuid import UUID
 
+from foundation import event_codec
 from foundation.events import Event
 
 
+@event_codec.register(type_id=21)
 @dataclass(frozen=True)
 class PaymentStarted(Event):
+    AGGREGATE_TYPE = "payment"
+    AGGREGATE_ID_FIELD = "payment_uuid"
+
     payment_uuid: UUID
     customer_id: int
 
 
+@event_codec.register(type_id=22)
 @dataclass(frozen=True)
 class PaymentCharged(Event):
+    AGGREGATE_TYPE = "payment"
+    AGGREGATE_ID_FIELD = "payment_uuid"
+
     payment_uuid: UUID
     customer_id: int
 
 
+@event_codec.register(type_id=23)
 @dataclass(frozen=True)
 class PaymentCaptured(Event):
+    AGGREGATE_TYPE = "payment"
+    AGGREGATE_ID_FIELD = "payment_uuid"
+
     payment_uuid: UUID
     customer_id: int
 
 
+@event_codec.register(type_id=24)
 @dataclass(frozen=True)
 class PaymentFailed(Event):
+    AGGREGATE_TYPE = "payment"
+    AGGREGATE_ID_FIELD = "payment_uuid"
+
     payment_uuid: UUID
     customer_id: int
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from sqlalchemy.engine import Connection
@@ -13,8 +13,14 @@ from payments.events import PaymentCaptured, PaymentCharged, PaymentFailed, Paym
 
 
 class PaymentsFacade:
-    def __init__(self, config: PaymentsConfig, connection: Connection, event_bus: EventBus) -> None:
-        self._api_consumer = ApiConsumer(config.username, config.password)
+    def __init__(
+        self,
+        config: PaymentsConfig,
+        connection: Connection,
+        event_bus: EventBus,
+        api_consumer: Optional[ApiConsumer] = None,
+    ) -> None:
+        self._api_consumer = api_consumer or ApiConsumer(config.username, config.password)
         self._connection = connection
         self._event_bus = event_bus
 
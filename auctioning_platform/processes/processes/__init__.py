@@ -4,7 +4,7 @@ import injector
 from sqlalchemy.engine import Connection
 from typing_extensions import Protocol
 
-from foundation.events import AsyncEventHandlerProvider, AsyncHandler, Event
+from foundation.events import HIGH_PRIORITY_QUEUE, AsyncEventHandlerProvider, AsyncHandler, Event
 
 from customer_relationship import CustomerRelationshipFacade
 from payments import PaymentsFacade
@@ -44,9 +44,12 @@ class Processes(injector.Module):
         return ProcessManagerDataRepo(connection)
 
     def configure(self, binder: injector.Binder) -> None:
+        # Sagas drive payments and shipping, so they must not wait behind notifications
         for pm, handler_cls in self.PM_HANDLERS:
             handled_events = [event for event in pm.handle.registry.keys() if issubclass(event, Event)]
             for event in handled_events:
-                binder.multibind(AsyncHandler[event], to=AsyncEventHandlerProvider(handler_cls))
+                binder.multibind(
+                    AsyncHandler[event], to=AsyncEventHandlerProvider(handler_cls, queue=HIGH_PRIORITY_QUEUE)
+                )
 
         return None
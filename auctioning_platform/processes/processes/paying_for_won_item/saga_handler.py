@@ -5,6 +5,7 @@ import injector
 from foundation.events import Event
 from foundation.locks import LockFactory
 from foundation.method_dispatch import method_dispatch
+from foundation.retries import RetryPolicy
 
 from auctions import AuctionEnded
 from payments import PaymentCaptured
@@ -14,6 +15,9 @@ from processes.repository import ProcessManagerDataRepo
 
 class PayingForWonItemHandler:
     LOCK_TIMEOUT = 30
+    # lock factory waits a while for the lock, AlreadyLocked means another event of the same process
+    # is still being handled - just try a bit later
+    RETRY_POLICY = RetryPolicy(max_attempts=10, base_delay=0.5, max_delay=LOCK_TIMEOUT)
 
     @injector.inject
     def __init__(
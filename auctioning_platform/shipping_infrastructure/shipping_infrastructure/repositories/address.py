@@ -1,15 +1,26 @@
+import functools
+from typing import TYPE_CHECKING
 import uuid
 
-import faker
-
 from shipping import AddressRepository
 from shipping.domain.entities import Address
 from shipping.domain.value_objects import ConsigneeId
 
+if TYPE_CHECKING:
+    from faker import Faker
+
+
+@functools.lru_cache(maxsize=None)
+def _faker() -> "Faker":
+    # faker takes longer to import than most of the app, so it is loaded when the first address is needed
+    import faker
+
+    return faker.Faker()
+
 
 class FakeAddressRepository(AddressRepository):
     def get(self, consignee_id: ConsigneeId) -> Address:
-        fake = faker.Faker()
+        fake = _faker()
         return Address(
             uuid=uuid.uuid4(),
             street=fake.street_name(),
@@ -1,16 +1,60 @@
+import hashlib
 from typing import Optional
 
-from flask import Flask, Response, request
+from flask import Flask, Response, current_app, g, has_request_context, request, session
 from flask_injector import FlaskInjector
-from sqlalchemy.engine import Connection
-from sqlalchemy.orm import Session
+import injector
+from sqlalchemy.engine import Connection, Engine
 
+from foundation.metrics import Metrics
+
+from db_infrastructure.pool import checkout
+from db_infrastructure.replica import ReadPreference
 from main import bootstrap_app
-from main.modules import RequestScope
-from web_app.blueprints.auctions import AuctionsWeb, auctions_blueprint
+from main.modules import RequestScope, request as request_scope
+from web_app.blueprints.auctions import REQUEST_DTOS, AuctionsWeb, auctions_blueprint
+from web_app.blueprints.metrics import metrics_blueprint
 from web_app.blueprints.shipping import shipping_blueprint
 from web_app.json_encoder import JSONEncoder
 from web_app.security import setup as security_setup
+from web_app.serialization import dto
+
+
+class WebDb(injector.Module):
+    """Checks out a connection and begins request's transaction only when the request needs DB.
+
+    Outside of requests connection is handed over as is, like in other processes.
+    """
+
+    @request_scope
+    @injector.provider
+    def connection(self, engine: Engine, metrics: Metrics) -> Connection:
+        connection = checkout(engine, metrics if metrics.enabled else None)
+        if has_request_context():
+            g.transaction = connection.begin()
+        return connection
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# added to every response, by web_app.asgi as well
+CORS_HEADERS = (("Access-Control-Allow-Origin", "*"), ("Access-Control-Allow-Headers", "*"))
+
+
+def read_your_writes_session() -> Optional[str]:
+    """Identifies the client without loading the user - by user id from session cookie or by auth token."""
+    return client_session(session.get("_user_id"), request.headers.get(token_header(current_app)))
+
+
+def client_session(user_id: Optional[str], token: Optional[str]) -> Optional[str]:
+    if user_id is not None:
+        return f"user:{user_id}"
+    if token:
+        return f"token:{hashlib.sha256(token.encode()).hexdigest()}"
+    return None
+
+
+def token_header(app: Flask) -> str:
+    return app.config.get("SECURITY_TOKEN_AUTHENTICATION_HEADER", "Authentication-Token")  # type: ignore
 
 
 def create_app(settings_override: Optional[dict] = None) -> Flask:
@@ -23,6 +67,8 @@ def create_app(settings_override: Optional[dict] = None) -> Flask:
 
     app.register_blueprint(auctions_blueprint, url_prefix="/auctions")
     app.register_blueprint(shipping_blueprint, url_prefix="/shipping")
+    app.register_blueprint(metrics_blueprint)
+    dto.prepare(*REQUEST_DTOS)
 
     # TODO: move this config
     app.config["SECRET_KEY"] = "super-secret"
@@ -35,32 +81,38 @@ def create_app(settings_override: Optional[dict] = None) -> Flask:
         app.config[key] = value
 
     app_context = bootstrap_app()
-    FlaskInjector(app, modules=[AuctionsWeb()], injector=app_context.injector)
+    FlaskInjector(app, modules=[AuctionsWeb(), WebDb()], injector=app_context.injector)
     app.injector = app_context.injector
 
     @app.before_request
     def transaction_start() -> None:
         app_context.injector.get(RequestScope).enter()
 
-        request.connection = app_context.injector.get(Connection)  # type: ignore
-        request.tx = request.connection.begin()  # type: ignore
-        request.session = app_context.injector.get(Session)  # type: ignore
+        # safe requests may read from the replica, unless the same client wrote something a moment ago
+        preference = app_context.injector.get(ReadPreference)
+        preference.use_replica = request.method in SAFE_METHODS
+        preference.session = read_your_writes_session()
 
     @app.after_request
     def transaction_commit(response: Response) -> Response:
-        scope = app_context.injector.get(RequestScope)
-        try:
-            if hasattr(request, "tx") and response.status_code < 400:
-                request.tx.commit()  # type: ignore
-        finally:
-            scope.exit()
-
+        transaction = g.pop("transaction", None)
+        if transaction is not None and response.status_code < 400:
+            transaction.commit()
+            if request.method not in SAFE_METHODS:
+                preference = app_context.injector.get(ReadPreference)
+                preference.session = read_your_writes_session()  # user might have logged in meanwhile
+                preference.wrote()
         return response
 
+    @app.teardown_request
+    def request_scope_exit(_exc: Optional[BaseException]) -> None:
+        # runs after unhandled exceptions too, which skip after_request; uncommitted transaction is rolled back
+        app_context.injector.get(RequestScope).exit()
+
     @app.after_request
     def add_cors_headers(response: Response) -> Response:
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Headers"] = "*"
+        for name, value in CORS_HEADERS:
+            response.headers[name] = value
         return response
 
     # has to be done after DB-hooks, because it relies on DB
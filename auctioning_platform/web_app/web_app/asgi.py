@@ -0,0 +1,320 @@
+"""ASGI entry point - auction browsing served asynchronously, everything else by the Flask app.
+
+    uvicorn --factory web_app.asgi:create_asgi_app  (or any ASGI server supporting app factories)
+
+GET /auctions/ and /auctions/<id> are answered with AsyncGetActiveAuctions/AsyncGetSingleAuction on the event
+loop, so a single worker process keeps serving browse requests while they wait for the database. Other requests,
+e.g. placing bids, are handed over to the same Flask app as under WSGI, run in a thread pool with their request
+scope and transaction. Both share the injector and its modules. Requests are routed by the Flask app's URL map
+and browse endpoints are the views of web_app.blueprints.auctions, only with async queries - both paths answer
+the same, conditional requests included (see web_app.etags).
+
+GET /auctions/<id>/prices streams the auction's price as server-sent events, from the current one until the auction
+ends, with updates fanned out by web_app.live_prices. It is served by this entry point only - under WSGI every
+watcher would hold a thread.
+
+Async reads go to the replica if there is one. A client which wrote recently is handed over to Flask too,
+which reads from the primary for it (see db_infrastructure.replica).
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import io
+import json
+import re
+import sys
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import Flask
+import injector
+from itsdangerous import BadSignature
+from redis import Redis
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import parse_cookie, parse_date, parse_etags
+from werkzeug.urls import url_decode
+
+from auctions import AsyncGetActiveAuctions, AsyncGetSingleAuction, InvalidCursor
+from db_infrastructure.aio import AsyncDatabase, AsyncReadDatabase
+from db_infrastructure.replica import RecentWrites
+from main.auction_versions import AuctionVersion, AuctionVersions
+from main.live_prices import PriceUpdate
+from web_app.app import CORS_HEADERS, client_session, create_app, token_header
+from web_app.blueprints.auctions import (
+    ViewResponse,
+    active_auctions_criteria,
+    auctions_blueprint,
+    auctions_list,
+    auctions_list_not_modified,
+    auctions_list_response,
+    bad_request,
+    invalid_cursor,
+    single_auction,
+    single_auction_not_modified,
+    single_auction_response,
+)
+from web_app.json_encoder import JSONEncoder
+from web_app.live_prices import LivePricesUnavailable, PriceFeed
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+Headers = List[Tuple[bytes, bytes]]
+
+# served by this entry point only, so not in the Flask app's URL map
+LIVE_PRICES_PATH = re.compile(r"^/auctions/(\d+)/prices$")
+
+
+def encode_headers(headers: Iterable[Tuple[str, str]]) -> Headers:
+    return [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+
+
+CORS: Headers = encode_headers(CORS_HEADERS)
+EVENT_STREAM_HEADERS: Headers = [
+    (b"content-type", b"text/event-stream"),
+    (b"cache-control", b"no-cache"),
+    (b"x-accel-buffering", b"no"),  # keeps nginx from buffering the stream
+    *CORS,
+]
+# keeps proxies from timing out idle streams
+HEARTBEAT = b": heartbeat\n\n"
+HEARTBEAT_INTERVAL = 15.0
+
+
+def create_asgi_app(flask_app: Optional[Flask] = None, wsgi_threads: int = 10) -> "AsgiApp":
+    return AsgiApp(flask_app or create_app(), wsgi_threads)
+
+
+class AsgiApp:
+    def __init__(self, flask_app: Flask, wsgi_threads: int) -> None:
+        self._flask_app = flask_app
+        self._injector: injector.Injector = flask_app.injector  # type: ignore
+        self._wsgi_executor = ThreadPoolExecutor(wsgi_threads, thread_name_prefix="wsgi")
+        self._read_db = self._injector.get(AsyncReadDatabase)
+        self._db = self._injector.get(AsyncDatabase)
+        self._recent_writes = self._injector.get(RecentWrites) if self._read_db is not self._db else None
+        self._auction_versions = self._injector.get(AuctionVersions)
+        self._price_feed = PriceFeed(self._injector.get(Redis), self._current_price)
+        self._urls = flask_app.url_map.bind("localhost")
+        self._async_views: Dict[str, Callable[..., Awaitable[None]]] = {
+            f"{auctions_blueprint.name}.{auctions_list.__name__}": self._auctions_list,
+            f"{auctions_blueprint.name}.{single_auction.__name__}": self._single_auction,
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] != "http":
+            raise NotImplementedError(f"Unsupported ASGI scope type: {scope['type']}")
+        elif scope["method"] == "GET" and LIVE_PRICES_PATH.match(scope["path"]):
+            auction_id = int(LIVE_PRICES_PATH.match(scope["path"]).group(1))  # type: ignore
+            await self._live_prices(scope, receive, send, auction_id)
+        elif scope["method"] not in ("GET", "HEAD") or await self._wrote_recently(scope):
+            await self._wsgi(scope, receive, send)
+        else:
+            endpoint, view_args = self._match(scope)
+            view = self._async_views.get(endpoint) if endpoint is not None else None
+            if view is not None:
+                await view(scope, send, **view_args)
+            else:
+                await self._wsgi(scope, receive, send)
+
+    def _match(self, scope: Scope) -> Tuple[Optional[str], Dict[str, Any]]:
+        try:
+            return self._urls.match(scope["path"], scope["method"])  # type: ignore
+        except HTTPException:  # not found, redirect to the trailing slash etc. - Flask answers those
+            return None, {}
+
+    async def _auctions_list(self, scope: Scope, send: Send) -> None:
+        """Async auctions_list view of web_app.blueprints.auctions."""
+        args = url_decode(scope["query_string"])
+        try:
+            criteria = active_auctions_criteria(args)
+        except ValueError as exc:
+            await self._render(scope, send, bad_request(str(exc)))
+            return
+
+        # read before the query, see main.auction_versions
+        version = await self._auction_version(None)
+        unchanged = auctions_list_not_modified(version, parse_etags(_header(scope, b"if-none-match")))
+        if unchanged is not None:
+            await self._render(scope, send, unchanged)
+            return
+
+        try:
+            page = await self._injector.get(AsyncGetActiveAuctions).query(criteria)
+        except InvalidCursor as exc:
+            await self._render(scope, send, invalid_cursor(exc))
+            return
+        await self._render(scope, send, auctions_list_response(scope["path"], args, version, page))
+
+    async def _single_auction(self, scope: Scope, send: Send, auction_id: int) -> None:
+        """Async single_auction view of web_app.blueprints.auctions."""
+        version = await self._auction_version(auction_id)
+        unchanged = single_auction_not_modified(
+            version,
+            parse_etags(_header(scope, b"if-none-match")),
+            parse_date(_header(scope, b"if-modified-since")),
+        )
+        if unchanged is not None:
+            await self._render(scope, send, unchanged)
+            return
+        auction = await self._injector.get(AsyncGetSingleAuction).query(auction_id)
+        await self._render(scope, send, single_auction_response(auction, version))
+
+    async def _live_prices(self, scope: Scope, receive: Receive, send: Send, auction_id: int) -> None:
+        try:
+            async with self._price_feed.watch(auction_id) as watcher:
+                frame = watcher.latest
+                if frame is None:
+                    await self._render(scope, send, ViewResponse(404, {"message": "Not found"}))
+                    return
+                if frame.update.ended:  # tells EventSource not to reconnect
+                    await send({"type": "http.response.start", "status": 204, "headers": CORS})
+                    await send({"type": "http.response.body", "body": b""})
+                    return
+
+                await send({"type": "http.response.start", "status": 200, "headers": EVENT_STREAM_HEADERS})
+                disconnected = asyncio.ensure_future(_disconnected(receive))
+                disconnected.add_done_callback(lambda _: watcher.close())
+                try:
+                    while not watcher.closed:
+                        body = frame.data if frame is not None else HEARTBEAT
+                        await send({"type": "http.response.body", "body": body, "more_body": True})
+                        if frame is not None and frame.update.ended:
+                            break
+                        frame = await watcher.next(HEARTBEAT_INTERVAL)
+                    if not watcher.closed:
+                        await send({"type": "http.response.body", "body": b""})
+                finally:
+                    disconnected.cancel()
+        except LivePricesUnavailable as exc:
+            await self._render(scope, send, ViewResponse(503, {"message": str(exc)}))
+
+    async def _current_price(self, auction_id: int) -> Optional[PriceUpdate]:
+        auction = await self._injector.get(AsyncGetSingleAuction).query(auction_id)
+        if auction is None:
+            return None
+        ends_at = auction.ends_at.replace(tzinfo=auction.ends_at.tzinfo or timezone.utc)
+        return PriceUpdate(auction.id, auction.current_price, ended=ends_at <= datetime.now(timezone.utc))
+
+    def _auction_version(self, auction_id: Optional[int]) -> Awaitable[Optional[AuctionVersion]]:
+        return asyncio.get_running_loop().run_in_executor(None, self._auction_versions.get, auction_id)
+
+    async def _render(self, scope: Scope, send: Send, view_response: ViewResponse) -> None:
+        """ASGI counterpart of web_app.blueprints.auctions.render."""
+        headers = encode_headers(view_response.headers) + CORS
+        body = b""
+        if view_response.status != 304:
+            body = json.dumps(view_response.payload, cls=JSONEncoder).encode()
+            headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())] + headers
+        await send({"type": "http.response.start", "status": view_response.status, "headers": headers})
+        await send({"type": "http.response.body", "body": body if scope["method"] != "HEAD" else b""})
+
+    async def _wrote_recently(self, scope: Scope) -> bool:
+        if self._recent_writes is None:
+            return False
+        session = self._client_session(scope)
+        if session is None:
+            return False
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._recent_writes.wrote_recently, session)
+
+    def _client_session(self, scope: Scope) -> Optional[str]:
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        user_id = None
+        cookie = parse_cookie(headers.get("cookie", "")).get(self._flask_app.session_cookie_name)
+        serializer = self._flask_app.session_interface.get_signing_serializer(self._flask_app)  # type: ignore
+        if cookie and serializer is not None:
+            max_age = int(self._flask_app.permanent_session_lifetime.total_seconds())
+            try:
+                user_id = serializer.loads(cookie, max_age=max_age).get("_user_id")
+            except BadSignature:
+                pass
+        return client_session(user_id, headers.get(token_header(self._flask_app).lower()))
+
+    async def _wsgi(self, scope: Scope, receive: Receive, send: Send) -> None:
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        loop = asyncio.get_running_loop()
+        status, headers, chunks = await loop.run_in_executor(
+            self._wsgi_executor, _call_wsgi, self._flask_app, _wsgi_environ(scope, body)
+        )
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b"".join(chunks)})
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await asyncio.get_running_loop().run_in_executor(None, self._price_feed.close)
+                await self._read_db.close()
+                await self._db.close()
+                self._wsgi_executor.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+async def _disconnected(receive: Receive) -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for header_name, value in scope["headers"]:
+        if header_name == name:
+            return value.decode("latin-1")  # type: ignore
+    return None
+
+
+def _wsgi_environ(scope: Scope, body: bytes) -> Dict[str, Any]:
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin-1"),
+        "PATH_INFO": scope["path"].encode().decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": (scope.get("client") or ("", 0))[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope["headers"]:
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        key = name if name in ("CONTENT_TYPE", "CONTENT_LENGTH") else f"HTTP_{name}"
+        value = raw_value.decode("latin-1")
+        if key in environ:
+            # HTTP/2 servers may split cookies into several headers, which are joined like a single Cookie header
+            value = f"{environ[key]}{'; ' if key == 'HTTP_COOKIE' else ','}{value}"
+        environ[key] = value
+    return environ
+
+
+def _call_wsgi(app: Flask, environ: Dict[str, Any]) -> Tuple[int, Headers, Iterable[bytes]]:
+    response: Dict[str, Any] = {}
+
+    def start_response(status: str, headers: List[Tuple[str, str]], _exc_info: Any = None) -> None:
+        response["status"] = int(status.split(" ", 1)[0])
+        response["headers"] = encode_headers(headers)
+
+    result = app(environ, start_response)
+    try:
+        chunks = list(result)
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    return response["status"], response["headers"], chunks
@@ -1,21 +1,42 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+
 from flask import Blueprint, Response, abort, jsonify, make_response, request
 import flask_injector
 from flask_login import current_user
 import injector
+from werkzeug.datastructures import ETags
+from werkzeug.http import http_date, quote_etag
+
+from foundation.value_objects.factories import get_dollars
 
 from auctions import (
+    ActiveAuctionsCriteria,
+    AuctionDto,
     AuctionId,
+    AuctionModifiedConcurrently,
+    AuctionsPage,
+    AuctionsSort,
     GetActiveAuctions,
     GetSingleAuction,
+    InvalidCursor,
     PlacingBid,
     PlacingBidInputDto,
     PlacingBidOutputBoundary,
     PlacingBidOutputDto,
 )
+from main.auction_versions import AuctionVersion, AuctionVersions
+from web_app import etags
 from web_app.serialization.dto import get_dto
 
 auctions_blueprint = Blueprint("auctions_blueprint", __name__)
 
+SORTS = [sort.value for sort in AuctionsSort]
+# codecs of these are prepared when the app is created, see web_app.serialization.dto
+REQUEST_DTOS = (PlacingBidInputDto,)
+
 
 class AuctionsWeb(injector.Module):
     @injector.provider
@@ -24,14 +45,131 @@ class AuctionsWeb(injector.Module):
         return PlacingBidPresenter()
 
 
+@dataclass(frozen=True)
+class ViewResponse:
+    """Response of the browse views, shared by the Flask views below and web_app.asgi which render it."""
+
+    status: int
+    payload: Any = None
+    headers: List[Tuple[str, str]] = field(default_factory=list)
+
+
 @auctions_blueprint.route("/")
-def auctions_list(query: GetActiveAuctions) -> Response:
-    return make_response(jsonify(query.query()))
+def auctions_list(versions: AuctionVersions, query: injector.ProviderOf[GetActiveAuctions]) -> Response:
+    """Page of active auctions, the next one is linked from the Link header.
+
+    Query string takes `sort` (ending_soonest, current_price or newest), `limit`, `min_price`, `max_price`
+    and `cursor` of the next page.
+    """
+    try:
+        criteria = active_auctions_criteria(request.args)
+    except ValueError as exc:
+        return render(bad_request(str(exc)))
+
+    # read before the query, see main.auction_versions
+    version = versions.get()
+    unchanged = auctions_list_not_modified(version, request.if_none_match)
+    if unchanged is not None:
+        return render(unchanged)
+
+    try:
+        page = query.get().query(criteria)
+    except InvalidCursor as exc:
+        return render(invalid_cursor(exc))
+    return render(auctions_list_response(request.path, request.args, version, page))
+
+
+def active_auctions_criteria(args: Mapping[str, str]) -> ActiveAuctionsCriteria:
+    """Parses query string of auctions list, raises ValueError with a message for the client."""
+    sort = args.get("sort", AuctionsSort.ENDING_SOONEST.value)
+    if sort not in SORTS:
+        raise ValueError(f"Unknown sort: {sort}, expected one of {', '.join(SORTS)}")
+    try:
+        limit = int(args.get("limit", ActiveAuctionsCriteria.limit))
+    except ValueError:
+        raise ValueError("Limit must be a number")
+    return ActiveAuctionsCriteria(
+        sort=AuctionsSort(sort),
+        limit=limit,
+        cursor=args.get("cursor") or None,
+        min_price=get_dollars(args["min_price"]) if args.get("min_price") else None,
+        max_price=get_dollars(args["max_price"]) if args.get("max_price") else None,
+    )
+
+
+def auctions_list_not_modified(version: Optional[AuctionVersion], if_none_match: ETags) -> Optional[ViewResponse]:
+    fresh_etag = etags.fresh_auctions_list_etag(version, if_none_match) if version is not None else None
+    return not_modified(fresh_etag) if fresh_etag is not None else None
+
+
+def auctions_list_response(
+    path: str, args: Mapping[str, str], version: Optional[AuctionVersion], page: AuctionsPage
+) -> ViewResponse:
+    headers = []
+    if page.next_cursor is not None:
+        headers.append(("Link", next_page_link(path, args, page.next_cursor)))
+    if version is not None:
+        headers += validator_headers(etags.auctions_list_etag(version, page.auctions))
+    return ViewResponse(200, page.auctions, headers)
+
+
+def next_page_link(path: str, args: Mapping[str, str], cursor: str) -> str:
+    return f'<{path}?{urlencode({**args, "cursor": cursor})}>; rel="next"'
 
 
 @auctions_blueprint.route("/<int:auction_id>")
-def single_auction(auction_id: int, query: GetSingleAuction) -> Response:
-    return make_response(jsonify(query.query(auction_id)))
+def single_auction(
+    auction_id: int, versions: AuctionVersions, query: injector.ProviderOf[GetSingleAuction]
+) -> Response:
+    version = versions.get(auction_id)
+    unchanged = single_auction_not_modified(version, request.if_none_match, request.if_modified_since)
+    if unchanged is not None:
+        return render(unchanged)
+    return render(single_auction_response(query.get().query(auction_id), version))
+
+
+def single_auction_not_modified(
+    version: Optional[AuctionVersion], if_none_match: ETags, if_modified_since: Optional[datetime]
+) -> Optional[ViewResponse]:
+    if version is not None and etags.auction_is_fresh(version, if_none_match, if_modified_since):
+        return not_modified(etags.auction_etag(version), version.modified_at)
+    return None
+
+
+def single_auction_response(auction: Optional[AuctionDto], version: Optional[AuctionVersion]) -> ViewResponse:
+    if auction is None:
+        return ViewResponse(404, {"message": "Not found"})
+    if version is None:
+        return ViewResponse(200, auction)
+    return ViewResponse(200, auction, validator_headers(etags.auction_etag(version), version.modified_at))
+
+
+def bad_request(message: str) -> ViewResponse:
+    return ViewResponse(400, {"message": message})
+
+
+def invalid_cursor(exc: InvalidCursor) -> ViewResponse:
+    return bad_request(f"Invalid cursor: {exc}")
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> ViewResponse:
+    return ViewResponse(304, headers=validator_headers(etag, last_modified))
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> List[Tuple[str, str]]:
+    headers = [("ETag", quote_etag(etag)), ("Cache-Control", "no-cache")]
+    if last_modified is not None:
+        headers.append(("Last-Modified", http_date(last_modified)))
+    return headers
+
+
+def render(view_response: ViewResponse) -> Response:
+    if view_response.status == 304:
+        response = Response(status=304)
+    else:
+        response = make_response(jsonify(view_response.payload), view_response.status)
+    response.headers.extend(view_response.headers)
+    return response
 
 
 @auctions_blueprint.route("/<int:auction_id>/bids", methods=["POST"])
@@ -41,7 +179,10 @@ def place_bid(auction_id: AuctionId, placing_bid_uc: PlacingBid, presenter: Plac
 
     dto = get_dto(request, PlacingBidInputDto, context={"auction_id": auction_id, "bidder_id": current_user.id})
 
-    placing_bid_uc.execute(dto)
+    try:
+        placing_bid_uc.execute(dto)
+    except AuctionModifiedConcurrently:
+        abort(make_response(jsonify({"message": "Auction is too busy right now, please try again"}), 409))
     return presenter.response  # type: ignore
 
 
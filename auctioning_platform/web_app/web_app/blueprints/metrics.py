@@ -0,0 +1,12 @@
+from flask import Blueprint, Response, abort
+
+from foundation.metrics import CONTENT_TYPE, Metrics
+
+metrics_blueprint = Blueprint("metrics_blueprint", __name__)
+
+
+@metrics_blueprint.route("/metrics")
+def metrics(registry: Metrics) -> Response:
+    if not registry.enabled:
+        abort(404)
+    return Response(registry.render(), content_type=CONTENT_TYPE)
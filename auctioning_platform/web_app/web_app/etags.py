@@ -0,0 +1,55 @@
+"""ETags of auction endpoints, derived from versions kept in Redis (see main.auction_versions).
+
+The list of active auctions changes not only with events, but also as auctions run past `ends_at`.
+So its ETag also carries the moment when the earliest of the listed auctions ends, and stops matching
+from then on. Single auctions also get Last-Modified, as long as they have been modified since versions
+are tracked. It has a resolution of a second, so it misses a second change within the same second - clients
+polling prices should send If-None-Match, which takes precedence.
+"""
+from datetime import datetime, timezone
+import time
+from typing import List, Optional
+
+from werkzeug.datastructures import ETags
+
+from auctions import AuctionDto
+from main.auction_versions import AuctionVersion
+
+NEVER = "never"
+
+
+def auction_etag(version: AuctionVersion) -> str:
+    return f"{version.epoch}.{version.version}"
+
+
+def auction_is_fresh(version: AuctionVersion, if_none_match: ETags, if_modified_since: Optional[datetime]) -> bool:
+    if if_none_match:  # takes precedence over If-Modified-Since
+        return if_none_match.contains(auction_etag(version))
+    if if_modified_since is None or version.modified_at is None:
+        return False
+    return version.modified_at <= if_modified_since.replace(tzinfo=if_modified_since.tzinfo or timezone.utc)
+
+
+def auctions_list_etag(version: AuctionVersion, auctions: List[AuctionDto]) -> str:
+    if not auctions:
+        return f"{version.epoch}.{version.version}.{NEVER}"
+    earliest_end = min(_timestamp(auction.ends_at) for auction in auctions)
+    return f"{version.epoch}.{version.version}.{earliest_end}"
+
+
+def fresh_auctions_list_etag(
+    version: AuctionVersion, if_none_match: ETags, now: Optional[float] = None
+) -> Optional[str]:
+    """One of client's ETags which still matches the list, if any."""
+    now = time.time() if now is None else now
+    prefix = f"{version.epoch}.{version.version}."
+    for etag in if_none_match:
+        earliest_end = etag.rpartition(".")[2]
+        if etag.startswith(prefix) and (earliest_end == NEVER or (earliest_end.isdigit() and now < int(earliest_end))):
+            return etag  # type: ignore
+    return None
+
+
+def _timestamp(moment: datetime) -> int:
+    # naive datetimes are in UTC, as database's now() the active auctions are selected with
+    return int(moment.replace(tzinfo=moment.tzinfo or timezone.utc).timestamp())
@@ -0,0 +1,225 @@
+"""Fan-out of auctions' price updates to clients watching them, see main.live_prices for the publishing side.
+
+Each process keeps a single Redis pub/sub connection, pattern-subscribed to channels of all auctions and read
+by one thread. Updates are handed over to the event loop and fanned out in-process to watchers of the auction,
+so the number of watchers costs neither Redis subscriptions nor database queries: the current price is queried
+once, when the first local watcher of an auction arrives, and kept up to date by updates afterwards. Every update
+is rendered as a server-sent event once, not once per watcher.
+
+A watcher only gets the latest price - a slow client skips intermediate ones instead of queuing them up.
+Updates published while the connection to Redis is down are lost, so once it is back, prices of watched auctions
+are queried again.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+import json
+import logging
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, NamedTuple, Optional, Set
+
+from redis import Redis, RedisError
+
+from main.live_prices import CHANNEL_PREFIX, PriceUpdate, decode
+from web_app.json_encoder import JSONEncoder
+
+logger = logging.getLogger(__name__)
+
+CurrentPrice = Callable[[int], Awaitable[Optional[PriceUpdate]]]
+
+
+class LivePricesUnavailable(Exception):
+    pass
+
+
+class Frame(NamedTuple):
+    update: PriceUpdate
+    data: bytes
+
+
+def render(update: PriceUpdate) -> Frame:
+    payload = {"auction_id": update.auction_id, "current_price": update.current_price, "ended": update.ended}
+    return Frame(update, f"event: price\ndata: {json.dumps(payload, cls=JSONEncoder)}\n\n".encode())
+
+
+class Watcher:
+    def __init__(self) -> None:
+        self.latest: Optional[Frame] = None
+        self.closed = False
+        self._changed = asyncio.Event()
+
+    def put(self, frame: Frame) -> None:
+        self.latest = frame
+        self._changed.set()
+
+    def start(self, frame: Optional[Frame]) -> None:
+        """Sets the current frame without signalling it, so next() waits for a newer one."""
+        self.latest = frame
+        self._changed.clear()
+
+    def close(self) -> None:
+        self.closed = True
+        self._changed.set()
+
+    async def next(self, timeout: float) -> Optional[Frame]:
+        """The latest frame not returned yet. None if there was none within `timeout` or the watcher got closed."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._changed.clear()
+        return None if self.closed else self.latest
+
+
+class _Channel:
+    def __init__(self) -> None:
+        self.watchers: Set[Watcher] = set()
+        self.latest: Optional[Frame] = None
+        self.querying: Optional["asyncio.Future[None]"] = None
+
+
+class PriceFeed:
+    PATTERN = f"{CHANNEL_PREFIX}*"
+
+    def __init__(
+        self,
+        redis: Redis,
+        current_price: CurrentPrice,
+        subscribe_timeout: float = 5.0,
+        poll_interval: float = 1.0,
+        retry_interval: float = 1.0,
+    ) -> None:
+        self._redis = redis
+        self._current_price = current_price
+        self._subscribe_timeout = subscribe_timeout
+        self._poll_interval = poll_interval
+        self._retry_interval = retry_interval
+        self._channels: Dict[int, _Channel] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribed = False  # written by the listener thread only
+        self._ready: Optional[asyncio.Event] = None
+        self._listener: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    @asynccontextmanager
+    async def watch(self, auction_id: int) -> AsyncIterator[Watcher]:
+        """Watcher of the auction, with the current price as `latest` - None if there is no such auction.
+
+        Raises LivePricesUnavailable if Redis does not confirm the subscription in time.
+        """
+        ready = self._start()
+        try:
+            await asyncio.wait_for(ready.wait(), self._subscribe_timeout)
+        except asyncio.TimeoutError:
+            raise LivePricesUnavailable("Not subscribed to price updates")
+
+        channel = self._channels.setdefault(auction_id, _Channel())
+        watcher = Watcher()
+        channel.watchers.add(watcher)
+        try:
+            if channel.latest is None:
+                await self._query(auction_id, channel)
+            watcher.start(channel.latest)
+            yield watcher
+        finally:
+            channel.watchers.discard(watcher)
+            if not channel.watchers and self._channels.get(auction_id) is channel:
+                del self._channels[auction_id]
+
+    def close(self) -> None:
+        """Stops the listener thread, blocks until it is done."""
+        self._stopping.set()
+        if self._listener is not None:
+            self._listener.join()
+            self._listener = None
+
+    @property
+    def watched_auctions(self) -> int:
+        return len(self._channels)
+
+    def _start(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._channels:
+                raise RuntimeError("PriceFeed is already used by another event loop")
+            self._loop = loop
+            self._ready = asyncio.Event()
+            if self._subscribed:
+                self._ready.set()
+        if self._listener is None:
+            self._stopping.clear()
+            self._listener = threading.Thread(target=self._listen, name="live-prices", daemon=True)
+            self._listener.start()
+        return self._ready  # type: ignore
+
+    async def _query(self, auction_id: int, channel: _Channel) -> None:
+        # watchers arriving while the price is being queried wait for the same query
+        if channel.querying is None:
+            channel.querying = asyncio.ensure_future(self._query_current_price(auction_id, channel))
+        await asyncio.shield(channel.querying)
+
+    async def _query_current_price(self, auction_id: int, channel: _Channel) -> None:
+        try:
+            update = await self._current_price(auction_id)
+        finally:
+            channel.querying = None
+        if update is not None:
+            self._put(channel, update)
+
+    def _put(self, channel: _Channel, update: PriceUpdate) -> None:
+        if channel.latest is not None:
+            merged = channel.latest.update.merge(update)
+            if merged is channel.latest.update:
+                return
+            update = merged
+        channel.latest = render(update)
+        for watcher in channel.watchers:
+            watcher.put(channel.latest)
+
+    def _on_update(self, update: PriceUpdate) -> None:
+        channel = self._channels.get(update.auction_id)
+        if channel is not None:
+            self._put(channel, update)
+
+    def _on_subscribed(self) -> None:
+        self._ready.set()  # type: ignore
+        for auction_id, channel in list(self._channels.items()):
+            if channel.latest is not None:  # possibly missed updates while (re)subscribing
+                asyncio.ensure_future(self._query(auction_id, channel))
+
+    def _on_unsubscribed(self) -> None:
+        self._ready.clear()  # type: ignore
+
+    def _call_in_loop(self, callback: Callable[..., None], *args: Any) -> None:
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)  # type: ignore
+        except RuntimeError:  # loop closed, e.g. at shutdown
+            pass
+
+    def _listen(self) -> None:
+        pubsub = self._redis.pubsub()
+        try:
+            while not self._stopping.is_set():
+                try:
+                    if not pubsub.patterns:
+                        pubsub.psubscribe(self.PATTERN)
+                    # redis-py subscribes again by itself after reconnecting
+                    message = pubsub.get_message(timeout=self._poll_interval)
+                except RedisError as exc:
+                    if self._subscribed:
+                        logger.warning("Lost subscription to price updates: %s", exc)
+                        self._subscribed = False
+                        self._call_in_loop(self._on_unsubscribed)
+                    self._stopping.wait(self._retry_interval)
+                    continue
+                if message is None:
+                    continue
+                if message["type"] == "psubscribe":
+                    self._subscribed = True
+                    self._call_in_loop(self._on_subscribed)
+                elif message["type"] == "pmessage":
+                    update = decode(message["data"])
+                    if update is not None:
+                        self._call_in_loop(self._on_update, update)
+        finally:
+            self._subscribed = False
+            pubsub.close()
@@ -1,6 +1,6 @@
 from typing import Any, Optional
 
-from flask import Flask, request
+from flask import Flask, current_app
 from flask_security import Security
 from flask_security.datastore import UserDatastore
 from sqlalchemy.orm import Session
@@ -37,7 +37,7 @@ class SaUserDatastore(UserDatastore):
 
     @property
     def session(self) -> Session:
-        return request.session  # type: ignore
+        return current_app.injector.get(Session)  # type: ignore
 
 
 def setup(app: Flask) -> None:
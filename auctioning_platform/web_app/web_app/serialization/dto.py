@@ -1,10 +1,25 @@
-from typing import Type, TypeVar, cast
+"""Loading request DTOs from JSON bodies.
+
+Every DTO class gets a codec once - web_app.app.create_app prepares codecs of DTOs the views load, so that no
+request pays for generating and instantiating a marshmallow schema. Schemas are not mutated by loading,
+so a single instance serves all threads.
+
+Flat DTOs whose fields are all of FAST_TYPES, without defaults, e.g. PlacingBidInputDto, also get a generated
+loader which validates and converts a well-formed body without marshmallow. Anything it is not sure about -
+missing or unknown keys, values of other types, invalid amounts - is loaded by the schema instead, so errors
+and lenient conversions (e.g. numeric strings as ints) stay exactly the schema's.
+"""
+import dataclasses
+import functools
+import typing
+from typing import Any, Callable, Dict, NamedTuple, Optional, Type, TypeVar, cast
 
 from flask import Request, abort, jsonify, make_response
 from marshmallow import Schema, exceptions
 from marshmallow_dataclass import class_schema
 
 from foundation.value_objects import Money
+from foundation.value_objects.factories import get_dollars
 
 from web_app.serialization.fields import Dollars
 
@@ -15,10 +30,95 @@ class BaseSchema(Schema):
     TYPE_MAPPING = {Money: Dollars}
 
 
+def _dollars(value: Any) -> Optional[Money]:
+    if type(value) is not str:
+        return None
+    try:
+        return get_dollars(value)
+    except ValueError:
+        return None
+
+
+# field type -> expression accepting `v_<name>`, which also converts it with `c_<name>` from FAST_CONVERTERS
+# if the type has a converter there, returning None for values it rejects
+FAST_TYPES: Dict[type, Callable[[str], str]] = {
+    int: lambda name: f"type(v_{name}) is int",  # excludes bools, which the schema rejects
+    str: lambda name: f"type(v_{name}) is str",
+    Money: lambda name: f"(v_{name} := c_{name}(v_{name})) is not None",
+}
+FAST_CONVERTERS: Dict[type, Callable[[Any], Any]] = {Money: _dollars}
+
+
+class DtoCodec(NamedTuple):
+    schema: Schema
+    load: Callable[[dict], Any]
+
+
+def prepare(*dto_classes: type) -> None:
+    for dto_cls in dto_classes:
+        dto_codec(dto_cls)
+
+
+@functools.lru_cache(maxsize=None)
+def dto_codec(dto_cls: type) -> DtoCodec:
+    schema = class_schema(dto_cls, base_schema=BaseSchema)()
+    fast_load = _fast_loader(dto_cls, schema.load)
+    return DtoCodec(schema, fast_load or schema.load)
+
+
+def _fast_loader(dto_cls: type, schema_load: Callable[[dict], Any]) -> Optional[Callable[[dict], Any]]:
+    """Generates a loader of a flat DTO or returns None if the DTO has other fields.
+
+    For PlacingBidInputDto the loader looks like this:
+
+        def load(data):
+            if len(data) != 3:
+                return schema_load(data)
+            try:
+                v_bidder_id = data["bidder_id"]
+                ...
+            except KeyError:
+                return schema_load(data)
+            if not (type(v_bidder_id) is int and ... and (v_amount := c_amount(v_amount)) is not None):
+                return schema_load(data)
+            return cls(bidder_id=v_bidder_id, auction_id=v_auction_id, amount=v_amount)
+    """
+    fields = dataclasses.fields(dto_cls)
+    hints = typing.get_type_hints(dto_cls)
+    namespace: Dict[str, Any] = {"cls": dto_cls, "schema_load": schema_load}
+    checks = []
+    for field in fields:
+        field_type = hints[field.name]
+        if field_type not in FAST_TYPES or not field.init or _has_default(field):
+            return None
+        checks.append(FAST_TYPES[field_type](field.name))
+        if field_type in FAST_CONVERTERS:
+            namespace[f"c_{field.name}"] = FAST_CONVERTERS[field_type]
+
+    reads = "".join(f"        v_{field.name} = data[{field.name!r}]\n" for field in fields)
+    arguments = ", ".join(f"{field.name}=v_{field.name}" for field in fields)
+    source = (
+        "def load(data):\n"
+        f"    if len(data) != {len(fields)}:\n"
+        "        return schema_load(data)\n"
+        "    try:\n"
+        f"{reads}"
+        "    except KeyError:\n"
+        "        return schema_load(data)\n"
+        f"    if not ({' and '.join(checks) or 'True'}):\n"
+        "        return schema_load(data)\n"
+        f"    return cls({arguments})\n"
+    )
+    exec(compile(source, f"<dto loader for {dto_cls.__qualname__}>", "exec"), namespace)
+    return namespace["load"]  # type: ignore
+
+
+def _has_default(field: dataclasses.Field) -> bool:
+    return field.default is not dataclasses.MISSING or field.default_factory is not dataclasses.MISSING  # type: ignore
+
+
 def get_dto(request: Request, dto_cls: Type[TDto], context: dict) -> TDto:
-    schema_cls = class_schema(dto_cls, base_schema=BaseSchema)
-    schema = schema_cls()
     try:
-        return cast(TDto, schema.load(dict(context, **request.json)))
+        return cast(TDto, dto_codec(dto_cls).load(dict(context, **request.json)))
     except exceptions.ValidationError as exc:
         abort(make_response(jsonify(exc.messages), 400))
@@ -1,11 +1,17 @@
 import os
 
 from _pytest.tmpdir import TempPathFactory
+import factory
 from flask import Flask, testing
 import injector
 import pytest
-from sqlalchemy.engine import Connection, create_engine
+from sqlalchemy.engine import Connection, Engine, create_engine
 
+from foundation.value_objects.factories import get_dollars
+
+from auctions import BeginningAuction, BeginningAuctionInputDto
+from main.migrate import create_db_schema
+from main.modules import RequestScope
 from web_app.app import create_app
 
 
@@ -41,7 +47,9 @@ def app(config_path: str) -> Flask:
         "SECURITY_HASHING_SCHEMES": ["hex_md5"],
         "SECURITY_DEPRECATED_HASHING_SCHEMES": [],
     }
-    return create_app(settings_to_override)
+    app = create_app(settings_to_override)
+    create_db_schema(app.injector.get(Engine))  # type: ignore
+    return app
 
 
 @pytest.fixture()
@@ -59,3 +67,26 @@ def connection() -> Connection:
     engine = create_engine(os.environ["DB_DSN"])
     yield engine.connect()
     engine.dispose()
+
+
+class BeginningAuctionInputDtoFactory(factory.Factory):
+    class Meta:
+        model = BeginningAuctionInputDto
+
+    auction_id = factory.Sequence(lambda n: n)
+    title = factory.Faker("name")
+    starting_price = get_dollars("0.99")
+    ends_at = factory.Faker("future_datetime", end_date="+7d")
+
+
+@pytest.fixture()
+def example_auction(container: injector.Injector) -> int:
+    """It should rather use a sequence of other API calls, maybe auctions'
+    module use cases specific for creating an auction, not adding directly to the DB.
+    """
+    with container.get(RequestScope):
+        uc = container.get(BeginningAuction)
+        dto = BeginningAuctionInputDtoFactory.build()
+        uc.execute(dto)
+
+    return int(dto.auction_id)
@@ -0,0 +1,105 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Sequence, Tuple
+
+from flask import Flask, testing
+import pytest
+
+from web_app.asgi import AsgiApp, _wsgi_environ, create_asgi_app
+
+
+@pytest.fixture(scope="module")
+def asgi_app(app: Flask) -> AsgiApp:
+    return create_asgi_app(app, wsgi_threads=2)
+
+
+def call(app: AsgiApp, method: str, path: str, body: bytes = b"") -> Tuple[int, bytes]:
+    status, _headers, response_body = respond(app, method, path, body=body)
+    return status, response_body
+
+
+def respond(
+    app: AsgiApp, method: str, path: str, query_string: bytes = b"", body: bytes = b""
+) -> Tuple[int, Dict[str, str], bytes]:
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query_string,
+        "headers": [],
+        "http_version": "1.1",
+    }
+    messages: List[Dict[str, Any]] = []
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": body}
+
+    async def send(message: Dict[str, Any]) -> None:
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in messages[0]["headers"]}
+    return messages[0]["status"], headers, messages[1]["body"]
+
+
+def test_returns_list_of_auctions(asgi_app: AsgiApp, example_auction: int) -> None:
+    status, body = call(asgi_app, "GET", "/auctions/")
+
+    assert status == 200
+    assert f'"id": {example_auction}'.encode() in body
+
+
+def test_returns_single_auction_or_404(asgi_app: AsgiApp, example_auction: int) -> None:
+    assert call(asgi_app, "GET", f"/auctions/{example_auction}")[0] == 200
+    assert call(asgi_app, "GET", "/auctions/999999")[0] == 404
+
+
+def test_hands_over_writes_to_flask(asgi_app: AsgiApp, example_auction: int) -> None:
+    status, _body = call(asgi_app, "POST", f"/auctions/{example_auction}/bids", b'{"amount": "15.99"}')
+
+    assert status == 403  # handled by place_bid view, which requires a user
+
+
+@pytest.mark.parametrize("query_string", ["", "sort=bogus", "limit=1", "cursor=bogus", "min_price=1e200000"])
+def test_answers_auctions_list_same_as_flask(
+    asgi_app: AsgiApp, client: testing.FlaskClient, example_auction: int, query_string: str
+) -> None:
+    assert_same_as_flask(asgi_app, client, "/auctions/", query_string)
+
+
+def test_answers_single_auction_same_as_flask(
+    asgi_app: AsgiApp, client: testing.FlaskClient, example_auction: int
+) -> None:
+    assert_same_as_flask(asgi_app, client, f"/auctions/{example_auction}")
+
+
+def assert_same_as_flask(asgi_app: AsgiApp, client: testing.FlaskClient, path: str, query_string: str = "") -> None:
+    status, headers, body = respond(asgi_app, "GET", path, query_string.encode())
+    flask_response = client.get(path, query_string=query_string)
+
+    assert status == flask_response.status_code
+    assert json.loads(body) == flask_response.get_json()
+    for name in ("Link", "ETag", "Access-Control-Allow-Origin", "Access-Control-Allow-Headers"):
+        assert headers.get(name.lower()) == flask_response.headers.get(name)
+
+
+def test_hands_over_urls_not_matching_async_views_to_flask(asgi_app: AsgiApp) -> None:
+    status, headers, _body = respond(asgi_app, "GET", "/auctions")
+
+    assert status in (301, 308)  # redirected to the trailing slash by Flask's URL map
+    assert headers["location"].endswith("/auctions/")
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ([(b"cookie", b"a=1"), (b"cookie", b"b=2")], {"HTTP_COOKIE": "a=1; b=2"}),
+        ([(b"accept", b"text/html"), (b"accept", b"application/json")], {"HTTP_ACCEPT": "text/html,application/json"}),
+    ],
+)
+def test_joins_repeated_headers_for_wsgi(headers: Sequence[Tuple[bytes, bytes]], expected: Dict[str, str]) -> None:
+    scope = {"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": headers}
+
+    environ = _wsgi_environ(scope, b"")
+
+    assert {key: environ[key] for key in expected} == expected
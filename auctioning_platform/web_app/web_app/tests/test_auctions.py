@@ -1,36 +1,8 @@
-import factory
+import time
+
 from flask.testing import FlaskClient
-import injector
 import pytest
 
-from foundation.value_objects.factories import get_dollars
-
-from auctions import BeginningAuction, BeginningAuctionInputDto
-from main.modules import RequestScope
-
-
-class BeginningAuctionInputDtoFactory(factory.Factory):
-    class Meta:
-        model = BeginningAuctionInputDto
-
-    auction_id = factory.Sequence(lambda n: n)
-    title = factory.Faker("name")
-    starting_price = get_dollars("0.99")
-    ends_at = factory.Faker("future_datetime", end_date="+7d")
-
-
-@pytest.fixture()
-def example_auction(container: injector.Injector) -> int:
-    """It should rather use a sequence of other API calls, maybe auctions'
-    module use cases specific for creating an auction, not adding directly to the DB.
-    """
-    with container.get(RequestScope):
-        uc = container.get(BeginningAuction)
-        dto = BeginningAuctionInputDtoFactory.build()
-        uc.execute(dto)
-
-    return int(dto.auction_id)
-
 
 def test_return_single_auction(client: FlaskClient, example_auction: int) -> None:
     response = client.get(f"/auctions/{example_auction}", headers={"Content-type": "application/json"})
@@ -46,6 +18,37 @@ def test_returns_list_of_auctions(client: FlaskClient) -> None:
     assert type(response.json) == list
 
 
+def test_pages_through_auctions_following_links(client: FlaskClient, example_auction: int) -> None:
+    listed = []
+    url = "/auctions/?sort=newest&limit=1"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert len(response.json) == 1
+        listed.append(response.json[0]["id"])
+        url = response.headers["Link"][1:].partition(">")[0] if "Link" in response.headers else ""
+
+    assert example_auction in listed
+    assert listed == sorted(listed, reverse=True)
+
+
+@pytest.mark.parametrize("query_string", ["sort=oldest", "limit=0", "limit=many", "min_price=-1", "cursor=whatever"])
+def test_rejects_invalid_auctions_query(client: FlaskClient, query_string: str) -> None:
+    response = client.get(f"/auctions/?{query_string}")
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("query_string", ["min_price=1e200000", "max_price=1e200000", "max_price=NaN"])
+def test_rejects_oversized_prices_without_scaling_them(client: FlaskClient, query_string: str) -> None:
+    start = time.perf_counter()
+    response = client.get(f"/auctions/?{query_string}")
+
+    assert response.status_code == 400
+    assert "is not a valid amount" in response.get_json()["message"]
+    assert time.perf_counter() - start < 0.5
+
+
 @pytest.fixture()
 def logged_in_client(client: FlaskClient) -> FlaskClient:
     email, password = "test+bid+1@cleanarchitecture.io", "Dumm123!"
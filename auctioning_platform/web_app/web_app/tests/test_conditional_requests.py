@@ -0,0 +1,101 @@
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, Optional
+
+from flask.testing import FlaskClient
+import injector
+import pytest
+from redis import Redis
+from sqlalchemy.engine import Connection
+
+from foundation.events import EventBus
+from foundation.value_objects.factories import get_dollars
+
+from auctions import WinningBidPlaced
+from main.auction_versions import AuctionVersion, AuctionVersions
+from main.modules import RequestScope
+
+
+class InMemoryAuctionVersions(AuctionVersions):
+    def __init__(self) -> None:
+        self.versions: Dict[Optional[int], int] = {}
+
+    def get(self, auction_id: Optional[int] = None) -> Optional[AuctionVersion]:
+        return AuctionVersion("epoch", self.versions.get(auction_id, 0), datetime(2021, 1, 1, tzinfo=timezone.utc))
+
+    def bump(self, auction_ids: Iterable[int]) -> None:
+        for auction_id in [*auction_ids, None]:
+            self.versions[auction_id] = self.versions.get(auction_id, 0) + 1
+
+
+@pytest.fixture()
+def versions(container: injector.Injector) -> Iterator[InMemoryAuctionVersions]:
+    versions = InMemoryAuctionVersions()
+    container.binder.bind(AuctionVersions, to=versions)
+    yield versions
+    container.binder.bind(AuctionVersions, to=AuctionVersions(container.get(Redis)))
+
+
+def test_unchanged_auction_is_not_modified(
+    client: FlaskClient, versions: InMemoryAuctionVersions, example_auction: int
+) -> None:
+    etag = client.get(f"/auctions/{example_auction}").headers["ETag"]
+
+    response = client.get(f"/auctions/{example_auction}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+def test_auction_is_modified_after_event_changing_it(
+    client: FlaskClient, versions: InMemoryAuctionVersions, example_auction: int
+) -> None:
+    etag = client.get(f"/auctions/{example_auction}").headers["ETag"]
+    list_etag = client.get("/auctions/").headers["ETag"]
+
+    versions.bump([example_auction])
+
+    assert client.get(f"/auctions/{example_auction}", headers={"If-None-Match": etag}).status_code == 200
+    assert client.get("/auctions/", headers={"If-None-Match": list_etag}).status_code == 200
+
+
+def test_beginning_auction_bumps_versions_when_scope_exits(
+    versions: InMemoryAuctionVersions, example_auction: int
+) -> None:
+    assert versions.versions == {example_auction: 1, None: 1}
+
+
+@pytest.mark.parametrize("commit", [True, False])
+def test_bumps_versions_only_if_transaction_commits(
+    container: injector.Injector, versions: InMemoryAuctionVersions, commit: bool
+) -> None:
+    with container.get(RequestScope):
+        transaction = container.get(Connection).begin()
+        container.get(EventBus).post(WinningBidPlaced(1234, 1, get_dollars("5"), "Title"))
+        assert versions.versions == {}
+        if commit:
+            transaction.commit()
+        else:
+            transaction.rollback()
+
+    assert versions.versions == ({1234: 1, None: 1} if commit else {})
+
+
+def test_unchanged_list_is_not_modified_until_earliest_auction_ends(
+    client: FlaskClient, versions: InMemoryAuctionVersions, example_auction: int
+) -> None:
+    list_etag = client.get("/auctions/").headers["ETag"]
+    assert client.get("/auctions/", headers={"If-None-Match": list_etag}).status_code == 304
+
+    earliest_end = list_etag.strip('"').rpartition(".")[2]
+    expired_etag = list_etag.replace(earliest_end, str(int(datetime.now().timestamp()) - 1))
+    assert client.get("/auctions/", headers={"If-None-Match": expired_etag}).status_code == 200
+
+
+def test_auction_is_not_modified_since_last_modification(
+    client: FlaskClient, versions: InMemoryAuctionVersions, example_auction: int
+) -> None:
+    last_modified = client.get(f"/auctions/{example_auction}").headers["Last-Modified"]
+
+    response = client.get(f"/auctions/{example_auction}", headers={"If-Modified-Since": last_modified})
+
+    assert response.status_code == 304
@@ -0,0 +1,53 @@
+from typing import Any, Dict
+
+from marshmallow import exceptions
+import pytest
+
+from foundation.value_objects.factories import get_dollars
+
+from auctions import PlacingBidInputDto
+from web_app.serialization.dto import dto_codec
+
+
+def load_with_schema(data: Dict[str, Any]) -> Any:
+    try:
+        return dto_codec(PlacingBidInputDto).schema.load(data)
+    except exceptions.ValidationError as exc:
+        return exc.messages
+
+
+def load(data: Dict[str, Any]) -> Any:
+    try:
+        return dto_codec(PlacingBidInputDto).load(data)
+    except exceptions.ValidationError as exc:
+        return exc.messages
+
+
+def test_codec_is_built_once() -> None:
+    assert dto_codec(PlacingBidInputDto) is dto_codec(PlacingBidInputDto)
+
+
+def test_loads_well_formed_bid_without_schema() -> None:
+    data = {"bidder_id": 1, "auction_id": 2, "amount": "15.99"}
+
+    assert load(data) == PlacingBidInputDto(bidder_id=1, auction_id=2, amount=get_dollars("15.99"))
+    assert load(data) == load_with_schema(data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"bidder_id": 1, "auction_id": 2},
+        {"bidder_id": 1, "auction_id": 2, "amount": "15.99", "extra": 1},
+        {"bidder_id": 1, "auction_id": 2, "price": "15.99"},
+        {"bidder_id": 1, "auction_id": "2", "amount": "15.99"},
+        {"bidder_id": True, "auction_id": 2, "amount": "15.99"},
+        {"bidder_id": 1, "auction_id": 2, "amount": "-1"},
+        {"bidder_id": 1, "auction_id": 2, "amount": "1.999"},
+        {"bidder_id": 1, "auction_id": 2, "amount": "1e100000"},
+        {"bidder_id": 1, "auction_id": 2, "amount": None},
+        {"bidder_id": 1, "auction_id": 2, "amount": 15},
+    ],
+)
+def test_loads_other_bids_same_as_schema(data: Dict[str, Any]) -> None:
+    assert load(data) == load_with_schema(data)
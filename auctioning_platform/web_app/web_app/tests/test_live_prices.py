@@ -0,0 +1,149 @@
+import asyncio
+from typing import Any, Dict, Iterator, List, Optional
+
+from fakeredis import FakeRedis, FakeServer
+from flask import Flask
+import injector
+import pytest
+from redis import Redis
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection
+
+from foundation.events import EventBus
+from foundation.value_objects.factories import get_dollars
+
+from auctions import AuctionEnded, WinningBidPlaced
+from main.live_prices import PendingPriceUpdates, PriceUpdate
+from main.modules import RequestScope
+from web_app.asgi import create_asgi_app
+from web_app.live_prices import PriceFeed
+
+
+@pytest.fixture()
+def server() -> FakeServer:
+    return FakeServer()
+
+
+def publish(server: FakeServer, *events: Any) -> None:
+    # outside of a transaction, so published right away on close
+    pending = PendingPriceUpdates(create_engine("sqlite://").connect(), FakeRedis(server=server))
+    for event in events:
+        pending.add(event)
+    pending.close()
+
+
+async def wait_until(condition: Any) -> None:
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Condition not met in time")
+
+
+def test_watchers_of_auction_share_query_and_get_its_updates(server: FakeServer) -> None:
+    queried: List[int] = []
+
+    async def current_price(auction_id: int) -> Optional[PriceUpdate]:
+        queried.append(auction_id)
+        return PriceUpdate(auction_id, get_dollars("10")) if auction_id == 1 else None
+
+    async def scenario() -> None:
+        feed = PriceFeed(FakeRedis(server=server), current_price, poll_interval=0.01)
+        try:
+            async with feed.watch(1) as first, feed.watch(1) as second, feed.watch(2) as unknown:
+                assert queried == [1, 2]
+                assert unknown.latest is None
+                assert first.latest is second.latest
+                assert first.latest.update == PriceUpdate(1, get_dollars("10"))  # type: ignore
+
+                publish(
+                    server,
+                    WinningBidPlaced(1, 2, get_dollars("15"), "Title"),
+                    WinningBidPlaced(1, 3, get_dollars("12"), "Title"),  # stale, published late
+                    WinningBidPlaced(3, 3, get_dollars("99"), "Not watched"),
+                )
+                frame = await first.next(1)
+                assert frame is not None and frame.update == PriceUpdate(1, get_dollars("15"))
+                assert b'"amount": "15"' in frame.data
+                assert (await second.next(1)) is frame
+
+                publish(server, AuctionEnded(1, 2, get_dollars("15"), "Title"))
+                frame = await first.next(1)
+                assert frame is not None and frame.update.ended
+                assert await first.next(0.05) is None
+
+            assert feed.watched_auctions == 0
+        finally:
+            feed.close()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("commit", [True, False])
+def test_publishes_price_events_when_scope_exits_if_transaction_commits(
+    container: injector.Injector, server: FakeServer, commit: bool
+) -> None:
+    redis = FakeRedis(server=server)
+    pubsub = redis.pubsub(ignore_subscribe_messages=True)
+    pubsub.psubscribe("auction-prices:*")
+    container.binder.bind(Redis, to=redis)
+    try:
+        with container.get(RequestScope):
+            transaction = container.get(Connection).begin()
+            container.get(EventBus).post(WinningBidPlaced(7, 1, get_dollars("5"), "Title"))
+            if commit:
+                transaction.commit()
+            else:
+                transaction.rollback()
+            assert pubsub.get_message() is None
+    finally:
+        container.binder.bind(Redis, to=Redis(host="localhost"))
+
+    message = pubsub.get_message(timeout=0.1)
+    if commit:
+        assert message is not None and message["channel"] == b"auction-prices:7"
+    else:
+        assert message is None
+
+
+@pytest.fixture()
+def streaming_app(app: Flask, container: injector.Injector, server: FakeServer) -> Iterator[Any]:
+    container.binder.bind(Redis, to=FakeRedis(server=server))
+    try:
+        yield create_asgi_app(app, wsgi_threads=1)
+    finally:
+        container.binder.bind(Redis, to=Redis(host="localhost"))
+
+
+def test_streams_prices_until_auction_ends(streaming_app: Any, server: FakeServer, example_auction: int) -> None:
+    messages: List[Dict[str, Any]] = []
+
+    async def scenario() -> None:
+        disconnect = asyncio.Event()
+
+        async def receive() -> Dict[str, Any]:
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Dict[str, Any]) -> None:
+            messages.append(message)
+
+        path = f"/auctions/{example_auction}/prices"
+        scope = {"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": []}
+        stream = asyncio.ensure_future(streaming_app(scope, receive, send))
+        await wait_until(lambda: len(messages) == 2)
+        publish(server, WinningBidPlaced(example_auction, 1, get_dollars("20.50"), "Title"))
+        await wait_until(lambda: len(messages) == 3)
+        publish(server, AuctionEnded(example_auction, 1, get_dollars("20.50"), "Title"))
+        await asyncio.wait_for(stream, 1)
+        disconnect.set()
+        streaming_app._price_feed.close()
+
+    asyncio.run(scenario())
+
+    assert messages[0]["status"] == 200
+    assert (b"content-type", b"text/event-stream") in messages[0]["headers"]
+    assert messages[1]["body"].startswith(b"event: price\ndata: ")
+    assert b'"amount": "20.5", "currency": "USD"}, "ended": false' in messages[2]["body"]
+    assert b'"ended": true' in messages[3]["body"]
+    assert messages[-1] == {"type": "http.response.body", "body": b""}
@@ -0,0 +1,61 @@
+import asyncio
+import gc
+import logging
+from typing import List
+
+import injector
+from pytest import LogCaptureFixture
+from sqlalchemy.engine import Connection
+
+from main.modules import RequestScope
+
+
+def test_concurrent_asyncio_tasks_get_own_connections_closed_on_exit(container: injector.Injector) -> None:
+    scope = container.get(RequestScope)
+    connections: List[Connection] = []
+
+    async def handle_request() -> None:
+        with scope:
+            connection = container.get(Connection)
+            await asyncio.sleep(0.01)
+            assert container.get(Connection) is connection
+            connections.append(connection)
+
+    async def handle_requests() -> None:
+        await asyncio.gather(*(handle_request() for _ in range(5)))
+
+    asyncio.run(handle_requests())
+
+    assert len(set(map(id, connections))) == 5
+    assert all(connection.closed for connection in connections)
+
+
+def test_nested_scope_gets_own_instances_and_restores_outer_ones(container: injector.Injector) -> None:
+    scope = container.get(RequestScope)
+
+    with scope:
+        outer = container.get(Connection)
+        with scope:
+            inner = container.get(Connection)
+            assert inner is not outer
+        assert inner.closed
+        assert not outer.closed
+        assert container.get(Connection) is outer
+    assert outer.closed
+
+
+def test_scope_left_open_is_closed_once_garbage_collected(
+    container: injector.Injector, caplog: LogCaptureFixture
+) -> None:
+    scope = container.get(RequestScope)
+
+    async def leak() -> Connection:
+        scope.enter()
+        return container.get(Connection)
+
+    with caplog.at_level(logging.WARNING):
+        leaked = asyncio.run(leak())  # the task's context is gone with the task
+        gc.collect()
+
+    assert leaked.closed
+    assert "RequestScope was not exited" in caplog.text
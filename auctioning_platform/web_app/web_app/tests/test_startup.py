@@ -0,0 +1,29 @@
+import json
+import os
+import subprocess
+import sys
+from typing import List
+
+# time of cold start is measured by benchmarks/bench_startup.py, which can check it against a budget
+LAZILY_IMPORTED_MODULES = ("faker", "flask_security", "requests", "smtplib", "web_app_models")
+
+STARTUP_SCRIPT = """
+import json, sys
+from main import bootstrap_app
+bootstrap_app()
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def start_app(config_path: str) -> List[str]:
+    env = {**os.environ, "CONFIG_PATH": config_path}
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)  # type: ignore
+
+
+def test_bootstrap_does_not_import_modules_needed_only_by_some_providers(config_path: str) -> None:
+    modules = start_app(config_path)
+
+    assert not set(LAZILY_IMPORTED_MODULES) & set(modules)